@@ -1,22 +1,55 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, verify_jwt_in_request
 from werkzeug.utils import secure_filename
 import sqlite3
 import os
 import json
+import base64
 import uuid
+import time
 from datetime import datetime, timedelta
 
+import db
+from db import get_db, get_db_path, PoolExhausted, apply_storage_profile, storage_profile_from_env
+from migrate import run_migrations
+from excerpts import make_excerpt
+from events import broker, WaitLimit, WaitLimitReached
+from presence import presence
+import hashing
+from hashing import HashPoolBusy, get_hash_pool, hash_password, needs_rehash, verify_password
+from metrics import route_metrics
+from roles import role_cache
+from recommend import recommender, mentor_recommender, skill_fit
+import tfidf
+import user_stats
+
 app = Flask(__name__)
 app.config['JWT_SECRET_KEY'] = 'your-secret-key-change-in-production'
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['DATABASE'] = get_db_path()
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 8))
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 5))
+# PRAGMAs for every connection (override individually with SQLITE_JOURNAL_MODE, SQLITE_BUSY_TIMEOUT, ...)
+app.config['SQLITE_PROFILE'] = storage_profile_from_env()
+app.config['SQLITE_CHECKPOINT_INTERVAL'] = int(os.environ.get('SQLITE_CHECKPOINT_INTERVAL', 60))  # seconds, 0 disables
+# Built by `python tfidf.py build`; used by /api/projects/recommended?strategy=tfidf
+app.config['TFIDF_INDEX_DIR'] = tfidf.default_index_dir(app.config['DATABASE'])
+app.config['TFIDF_REBUILD_INTERVAL'] = int(os.environ.get('TFIDF_REBUILD_INTERVAL', 900))  # seconds, 0 disables
+# Open SSE streams plus pending long-polls, each holding a thread; keep below GUNICORN_THREADS (0 = no cap)
+app.config['MAX_OPEN_STREAMS'] = int(os.environ.get('MAX_OPEN_STREAMS', 24))
+# Password hashing runs in its own processes; beyond workers + queue in flight, auth answers 503 (hashing.py)
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_QUEUE'] = int(os.environ.get('PASSWORD_HASH_QUEUE', 8))
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+# PASSWORD_HASH_METHOD, or PASSWORD_HASH_PROFILE=default|fast; older hashes are upgraded at login
+app.config['PASSWORD_HASH_METHOD'] = hashing.method_from_env()
 
 jwt = JWTManager(app)
-CORS(app)
+CORS(app, expose_headers=['X-Last-Event-Id'])
+db.init_app(app)
 
 # Create uploads directory if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -24,15 +57,106 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 # Add general request debugging
 @app.before_request
 def log_request_info():
+    g.request_started = time.perf_counter()
     print(f"DEBUG: Incoming request: {request.method} {request.path}")
     print(f"DEBUG: Headers: {dict(request.headers)}")
     if request.method == 'POST':
         print(f"DEBUG: Body: {request.get_data(as_text=True)}")
 
+# Per-route latency for /api/health
+@app.after_request
+def record_route_latency(response):
+    started = g.get('request_started')
+    if started is not None:
+        route = f"{request.method} {request.url_rule.rule if request.url_rule else '<unmatched>'}"
+        route_metrics.observe(route, response.status_code, time.perf_counter() - started, g.get('hash_seconds'))
+    return response
+
+PROJECTS_PAGE_SIZE = 20
+PROJECTS_MAX_PAGE_SIZE = 100
+
+# Opaque keyset cursor for (created_at, id) pagination
+def encode_cursor(created_at, row_id):
+    return base64.urlsafe_b64encode(json.dumps([created_at, row_id]).encode()).decode()
+
+def decode_cursor(value):
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(value.encode()))
+        return str(created_at), int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+# Sparse fieldsets for list endpoints. A field spec maps each response key to
+# the SQL expression that produces it and an optional decoder for the value.
+def json_list(value):
+    return json.loads(value) if value else []
+
+def json_object(value):
+    return json.loads(value) if value else {}
+
+def bool_default_true(value):
+    return bool(value) if value is not None else True
+
+def resolve_fields(spec, default_fields, card_fields):
+    """Response keys for this request: ?fields=a,b, ?view=card, or the full default set."""
+    if request.args.get('fields'):
+        fields = [name.strip() for name in request.args['fields'].split(',') if name.strip()]
+        unknown = [name for name in fields if name not in spec]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(fields))
+    if request.args.get('view') == 'card':
+        return list(card_fields)
+    return list(default_fields)
+
+def select_clause(spec, fields):
+    return ', '.join(spec[name][0] for name in fields)
+
+def row_to_dict(spec, fields, row):
+    item = {}
+    for name, value in zip(fields, row):
+        decode = spec[name][1]
+        item[name] = decode(value) if decode else value
+    return item
+
+# Stay well under SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+# All rows of sql for many ids, one query per chunk. sql has an {ids} slot for
+# the IN list; params are bound ahead of each chunk's ids.
+def fetch_in_chunks(cursor, sql, ids, params=()):
+    ids = list(ids)
+    rows = []
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CHUNK_SIZE]
+        cursor.execute(sql.format(ids=', '.join('?' * len(chunk))), list(params) + chunk)
+        rows.extend(cursor.fetchall())
+    return rows
+
+# User ID for endpoints where login is optional; None for anonymous or bad tokens
+def get_optional_user_id():
+    try:
+        verify_jwt_in_request(optional=True)
+        if get_jwt_identity():
+            return get_user_id_from_jwt()
+    except Exception:
+        pass
+    return None
+
 # Helper function to get user ID from JWT identity
 def get_user_id_from_jwt():
     identity = get_jwt_identity()
-    return int(identity.replace('user_', ''))
+    user_id = int(identity.replace('user_', ''))
+    # Every authenticated request counts as activity for presence
+    presence.touch(user_id)
+    return user_id
+
+# (user_id, role) of the caller; role is None for deleted users. The token's role
+# claim would outlive a deleted account, so the role comes from the role cache,
+# which only queries the database once per user per ROLE_CACHE_TTL_SECONDS.
+def current_user():
+    user_id = get_user_id_from_jwt()
+    return user_id, role_cache.get(get_db().cursor(), user_id)
 
 # Add JWT error handler
 @jwt.invalid_token_loader
@@ -50,403 +174,49 @@ def missing_token_callback(error_string):
     print(f"DEBUG: Missing token error: {error_string}")
     return jsonify({'error': f'Missing token: {error_string}'}), 422
 
-# Database initialization
-def init_db():
-    if os.environ.get("RENDER") == "true":  # Running on Render
-        base_dir = os.environ.get("RENDER_DATA_DIR", ".")
-        db_path = os.path.join(base_dir, "launchpad.db")
-    else:  # Local development
-        db_path = "launchpad.db"
+# Every worker shares a bounded set of connections; tell clients to back off when it runs dry
+@app.errorhandler(PoolExhausted)
+def pool_exhausted_callback(error):
+    return jsonify({'error': 'Server is busy, please retry'}), 503, {'Retry-After': '1'}
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            role TEXT NOT NULL CHECK (role IN ('student', 'alumni')),
-            graduation_year INTEGER,
-            department TEXT,
-            hall TEXT,
-            branch TEXT,
-            bio TEXT,
-            current_company TEXT,
-            current_position TEXT,
-            location TEXT,
-            work_preference TEXT CHECK (work_preference IN ('onsite', 'remote', 'hybrid')),
-            phone TEXT,
-            website TEXT,
-            linkedin TEXT,
-            github TEXT,
-            avatar TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Add new columns if they don't exist (for existing databases)
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN hall TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN branch TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN bio TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN current_company TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN current_position TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN location TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN work_preference TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN phone TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN website TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN linkedin TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN github TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN avatar TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN years_of_experience INTEGER')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN domain TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN tech_skills TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN program TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN cv_pdf TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN joining_year INTEGER')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN institute TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN specialization TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN past_projects TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN is_available BOOLEAN DEFAULT 1')
-    except:
-        pass
-    
-    # Add new columns to project_positions table if they don't exist
-    try:
-        cursor.execute('ALTER TABLE project_positions ADD COLUMN stipend INTEGER')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE project_positions ADD COLUMN duration TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE project_positions ADD COLUMN location TEXT')
-    except:
-        pass
-    
-    # Add new columns to projects table if they don't exist
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN stipend INTEGER')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN duration TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN skills_required TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN location TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN work_type TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN is_recruiting BOOLEAN DEFAULT 1')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN images TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN project_links TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN jd_pdf TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN contact_details TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN team_roles TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN partners TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN funding TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE projects ADD COLUMN highlights TEXT')
-    except:
-        pass
-    
-    # Projects table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT NOT NULL,
-            category TEXT NOT NULL,
-            status TEXT NOT NULL CHECK (status IN ('active', 'completed', 'paused')),
-            team_members TEXT,
-            tags TEXT,
-            stipend INTEGER,
-            duration TEXT,
-            skills_required TEXT,
-            location TEXT,
-            work_type TEXT CHECK (work_type IN ('remote', 'onsite', 'hybrid')),
-            created_by INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (created_by) REFERENCES users (id)
-        )
-    ''')
-    
-    # Blog posts table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS blog_posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            category TEXT,
-            author_id INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (author_id) REFERENCES users (id)
-        )
-    ''')
-    try:
-        cursor.execute('ALTER TABLE blog_posts ADD COLUMN images TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE blog_posts ADD COLUMN pdfs TEXT')
-    except:
-        pass
-    
-    # Conversations table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS conversations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user1_id INTEGER NOT NULL,
-            user2_id INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user1_id) REFERENCES users (id),
-            FOREIGN KEY (user2_id) REFERENCES users (id),
-            UNIQUE(user1_id, user2_id)
-        )
-    ''')
-    
-    # Messages table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            sender_id INTEGER NOT NULL,
-            receiver_id INTEGER NOT NULL,
-            content TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_read INTEGER DEFAULT 0,
-            FOREIGN KEY (sender_id) REFERENCES users (id),
-            FOREIGN KEY (receiver_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # Blog likes table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS blog_likes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            blog_post_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (blog_post_id) REFERENCES blog_posts (id),
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(blog_post_id, user_id)
-        )
-    ''')
-    
-    # Mentorship requests table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS mentorship_requests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER NOT NULL,
-            alumni_id INTEGER NOT NULL,
-            message TEXT,
-            status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'accepted', 'declined')),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (student_id) REFERENCES users (id),
-            FOREIGN KEY (alumni_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # Project positions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_positions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            required_skills TEXT,
-            count INTEGER DEFAULT 1,
-            filled_count INTEGER DEFAULT 0,
-            is_active BOOLEAN DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (project_id) REFERENCES projects (id)
-        )
-    ''')
-    
-    # Project applications table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_applications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER NOT NULL,
-            project_id INTEGER NOT NULL,
-            position_id INTEGER,
-            message TEXT,
-            status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'accepted', 'declined')),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (student_id) REFERENCES users (id),
-            FOREIGN KEY (project_id) REFERENCES projects (id),
-            FOREIGN KEY (position_id) REFERENCES project_positions (id)
-        )
-    ''')
-    
-    # Add position_id column to existing project_applications table
-    try:
-        cursor.execute('ALTER TABLE project_applications ADD COLUMN position_id INTEGER REFERENCES project_positions(id)')
-    except:
-        pass
-    
-    # Add feedback columns to project_applications table
-    try:
-        cursor.execute('ALTER TABLE project_applications ADD COLUMN feedback TEXT')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE project_applications ADD COLUMN completed_at TIMESTAMP')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE project_applications ADD COLUMN is_completed BOOLEAN DEFAULT 0')
-    except:
-        pass
+# Streams and long-polls past MAX_OPEN_STREAMS; clients fall back to plain polling
+@app.errorhandler(WaitLimitReached)
+def wait_limit_callback(error):
+    return jsonify({'error': 'Too many open connections, please retry'}), 503, {'Retry-After': '5'}
 
-    # Add has_team column to project_applications table
+# Same for the password hash pool: shed sign-in bursts fast instead of queueing them
+@app.errorhandler(HashPoolBusy)
+def hash_pool_busy_callback(error):
+    return jsonify({'error': 'Server is busy, please retry'}), 503, {'Retry-After': '1'}
+
+# Database initialization: apply pending schema migrations (a single version lookup when current)
+def init_db():
+    conn = sqlite3.connect(get_db_path())
     try:
-        cursor.execute('ALTER TABLE project_applications ADD COLUMN has_team BOOLEAN DEFAULT 0')
-    except:
-        pass
-    
-    # User skills table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_skills (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            skill_name TEXT NOT NULL,
-            skill_type TEXT DEFAULT 'technical' CHECK (skill_type IN ('technical', 'soft', 'language')),
-            proficiency_level TEXT DEFAULT 'intermediate' CHECK (proficiency_level IN ('beginner', 'intermediate', 'advanced', 'expert')),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # User achievements table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_achievements (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            achievement_type TEXT DEFAULT 'award' CHECK (achievement_type IN ('award', 'certification', 'project', 'publication', 'other')),
-            date_earned DATE,
-            issuer TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # User languages table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_languages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            language_name TEXT NOT NULL,
-            proficiency_level TEXT DEFAULT 'intermediate' CHECK (proficiency_level IN ('beginner', 'intermediate', 'advanced', 'native')),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+        # journal_mode=WAL is persistent, so set it once here before any worker starts
+        apply_storage_profile(conn, storage_profile_from_env())
+        run_migrations(conn)
+    finally:
+        conn.close()
+
+# Re-hash with the configured method after a successful login. Best effort:
+# when hashing or the write fails, the next login tries again.
+def upgrade_password_hash(user_id, old_hash, password):
+    try:
+        new_hash = hash_password(password)
+    except HashPoolBusy:
+        return
+    except Exception as e:  # e.g. BrokenProcessPool after a hash worker died
+        print(f"WARNING: Password hash upgrade for user {user_id} failed: {e!r}")
+        return
+    conn = get_db()
+    try:
+        # Compare-and-set so a concurrent password change is never overwritten
+        conn.execute('UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?',
+                     (new_hash, user_id, old_hash))
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
 
 # Auth routes
 @app.route('/api/auth/register', methods=['POST'])
@@ -468,7 +238,10 @@ def register():
         if not data.get('graduation_year') or not data.get('department'):
             return jsonify({'error': 'Graduation year and department are required for alumni'}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    # Hash password before taking a connection, so none is held while waiting on the hash pool
+    password_hash = hash_password(data['password'])
+    
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -477,9 +250,6 @@ def register():
         if cursor.fetchone():
             return jsonify({'error': 'User already exists'}), 400
         
-        # Hash password
-        password_hash = generate_password_hash(data['password'])
-        
         # Insert user
         cursor.execute('''
             INSERT INTO users (name, email, password_hash, role, graduation_year, department)
@@ -496,7 +266,8 @@ def register():
         user_id = cursor.lastrowid
         
         # Create access token
-        access_token = create_access_token(identity=f"user_{user_id}")
+        access_token = create_access_token(identity=f"user_{user_id}", additional_claims={'role': data['role']})
+        role_cache.invalidate(user_id)
         
         # Get user data
         cursor.execute('SELECT id, name, email, role, graduation_year, department FROM users WHERE id = ?', (user_id,))
@@ -520,19 +291,15 @@ def register():
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/users/<int:student_id>/applied-projects', methods=['GET'])
 @jwt_required()
 def get_user_applied_projects(student_id: int):
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
-        cursor.execute('SELECT role FROM users WHERE id = ?', (student_id,))
-        role_row = cursor.fetchone()
-        if not role_row or role_row[0] != 'student':
+        if role_cache.get(cursor, student_id) != 'student':
             return jsonify({'error': 'Target user is not a student'}), 400
 
         cursor.execute('''
@@ -568,19 +335,15 @@ def get_user_applied_projects(student_id: int):
         return jsonify(results), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/users/<int:student_id>/completed-projects', methods=['GET'])
 @jwt_required()
 def get_user_completed_projects(student_id: int):
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
-        cursor.execute('SELECT role FROM users WHERE id = ?', (student_id,))
-        role_row = cursor.fetchone()
-        if not role_row or role_row[0] != 'student':
+        if role_cache.get(cursor, student_id) != 'student':
             return jsonify({'error': 'Target user is not a student'}), 400
 
         cursor.execute('''
@@ -613,8 +376,6 @@ def get_user_completed_projects(student_id: int):
         return jsonify(completed_projects), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/auth/login', methods=['POST'])
 def login():
@@ -623,7 +384,7 @@ def login():
     if not data.get('email') or not data.get('password'):
         return jsonify({'error': 'Email and password are required'}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -631,11 +392,16 @@ def login():
         cursor.execute('SELECT id, name, email, password_hash, role, graduation_year, department FROM users WHERE email = ?', (data['email'],))
         user_data = cursor.fetchone()
         
-        if not user_data or not check_password_hash(user_data[3], data['password']):
+        # Hand the connection back while waiting on the hash pool
+        db.close_db()
+        if not user_data or not verify_password(user_data[3], data['password']):
             return jsonify({'error': 'Invalid credentials'}), 401
         
+        if needs_rehash(user_data[3], app.config['PASSWORD_HASH_METHOD']):
+            upgrade_password_hash(user_data[0], user_data[3], data['password'])
+        
         # Create access token
-        access_token = create_access_token(identity=f"user_{user_data[0]}")
+        access_token = create_access_token(identity=f"user_{user_data[0]}", additional_claims={'role': user_data[4]})
         
         user = {
             'id': user_data[0],
@@ -651,283 +417,287 @@ def login():
             'user': user
         }), 200
         
+    except HashPoolBusy:
+        raise  # 503 from hash_pool_busy_callback
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+
+# Health check with connection pool, hash pool and per-route latency counters
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    get_db().execute('SELECT 1').fetchone()
+    return jsonify({
+        'status': 'ok',
+        'db_pool': db.get_pool().snapshot(),
+        'password_hashing': get_hash_pool().snapshot(),
+        'open_streams': wait_limit.snapshot(),
+        'routes': route_metrics.snapshot(),
+    }), 200
+
+# Columns the project listing can return; ?fields= / ?view=card pick a subset
+HAS_APPLIED_SQL = 'EXISTS (SELECT 1 FROM project_applications pa WHERE pa.student_id = ? AND pa.project_id = p.id)'
+PROJECT_LIST_FIELDS = {
+    'id': ('p.id', None),
+    'title': ('p.title', None),
+    'description': ('p.description', None),
+    'excerpt': ('p.excerpt', None),
+    'category': ('p.category', None),
+    'status': ('p.status', None),
+    'team_members': ('p.team_members', json_list),
+    'tags': ('p.tags', json_list),
+    'skills_required': ('p.skills_required', json_list),
+    'stipend': ('p.stipend', None),
+    'duration': ('p.duration', None),
+    'location': ('p.location', None),
+    'work_type': ('p.work_type', None),
+    'created_at': ('p.created_at', None),
+    'created_by_name': ('u.name', None),
+    'is_recruiting': ('p.is_recruiting', bool_default_true),
+    'images': ('p.images', json_list),
+    'project_links': ('p.project_links', json_list),
+    'jd_pdf': ('p.jd_pdf', None),
+    'created_by_id': ('p.created_by', None),
+    'contact_details': ('p.contact_details', json_object),
+    'team_roles': ('p.team_roles', json_list),
+    'partners': ('p.partners', json_list),
+    'funding': ('p.funding', None),
+    'highlights': ('p.highlights', json_list),
+    'has_applied': (HAS_APPLIED_SQL, bool),
+}
+PROJECT_DEFAULT_FIELDS = [name for name in PROJECT_LIST_FIELDS if name != 'excerpt']
+PROJECT_CARD_FIELDS = ['id', 'title', 'excerpt', 'category', 'status', 'tags', 'skills_required', 'created_at',
+                       'created_by_name', 'created_by_id', 'is_recruiting', 'images', 'has_applied']
 
 # Protected routes
 @app.route('/api/projects', methods=['GET'])
 def get_projects():
-    from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-    
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     # Get user_id if authenticated (optional for this endpoint)
-    user_id = None
-    try:
-        verify_jwt_in_request(optional=True)
-        identity = get_jwt_identity()
-        if identity:
-            user_id = int(identity.replace('user_', ''))
-    except:
-        pass
+    user_id = get_optional_user_id()
     
     try:
+        try:
+            fields = resolve_fields(PROJECT_LIST_FIELDS, PROJECT_DEFAULT_FIELDS, PROJECT_CARD_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Get filter parameters
         availability_filter = request.args.get('availability', 'all')  # 'all', 'available', 'not_available'
         
-        cursor.execute('''
-            SELECT p.id, p.title, p.description, p.category, p.status, p.team_members, p.tags, p.skills_required, 
-                   p.stipend, p.duration, p.location, p.work_type, p.created_at, u.name as created_by_name, p.is_recruiting,
-                   p.images, p.project_links, p.jd_pdf, p.created_by, p.contact_details, p.team_roles, p.partners, p.funding, p.highlights
+        # Keyset pagination on (created_at, id); only when the client asks for pages
+        paginate = 'limit' in request.args or 'cursor' in request.args
+        if paginate:
+            # The cursor is built from these, so they are always returned in paged mode
+            fields += [name for name in ['id', 'created_at'] if name not in fields]
+        
+        # has_applied is resolved in the same query; without a user it is always 0
+        query = f'''
+            SELECT {select_clause(PROJECT_LIST_FIELDS, fields)}
             FROM projects p
             LEFT JOIN users u ON p.created_by = u.id
-            ORDER BY p.created_at DESC
-        ''')
+        '''
+        params = [user_id] if 'has_applied' in fields else []
+        conditions = []
         
-        projects = []
-        for row in cursor.fetchall():
-            project_id = row[0]
-            
-            # Check if user has applied to this project (only if user is authenticated)
-            has_applied = False
-            if user_id:
-                cursor.execute('SELECT id FROM project_applications WHERE student_id = ? AND project_id = ?', 
-                              (user_id, project_id))
-                has_applied = cursor.fetchone() is not None
-            
-            # Apply availability filter
-            if availability_filter == 'available' and has_applied:
-                continue
-            elif availability_filter == 'not_available' and not has_applied:
-                continue
-            
-            projects.append({
-                'id': project_id,
-                'title': row[1],
-                'description': row[2],
-                'category': row[3],
-                'status': row[4],
-                'team_members': json.loads(row[5]) if row[5] else [],
-                'tags': json.loads(row[6]) if row[6] else [],
-                'skills_required': json.loads(row[7]) if row[7] else [],
-                'stipend': row[8],
-                'duration': row[9],
-                'location': row[10],
-                'work_type': row[11],
-                'created_at': row[12],
-                'created_by_name': row[13],
-                'is_recruiting': bool(row[14]) if row[14] is not None else True,
-                'images': json.loads(row[15]) if row[15] else [],
-                'project_links': json.loads(row[16]) if row[16] else [],
-                'jd_pdf': row[17],
-                'created_by_id': row[18],
-                'contact_details': json.loads(row[19]) if row[19] else {},
-                'team_roles': json.loads(row[20]) if row[20] else [],
-                'partners': json.loads(row[21]) if row[21] else [],
-                'funding': row[22],
-                'highlights': json.loads(row[23]) if row[23] else [],
-                'has_applied': has_applied
-            })
+        # Apply availability filter
+        if availability_filter == 'available':
+            conditions.append(f'NOT {HAS_APPLIED_SQL}')
+            params.append(user_id)
+        elif availability_filter == 'not_available':
+            conditions.append(HAS_APPLIED_SQL)
+            params.append(user_id)
+        
+        # Server-side catalogue filters
+        for field in ['category', 'status', 'work_type']:
+            if request.args.get(field):
+                conditions.append(f'p.{field} = ?')
+                params.append(request.args[field])
+        if request.args.get('is_recruiting'):
+            conditions.append('COALESCE(p.is_recruiting, 1) = ?')
+            params.append(1 if request.args['is_recruiting'].lower() in ['true', '1', 'yes'] else 0)
+        if request.args.get('tag'):
+            conditions.append('EXISTS (SELECT 1 FROM json_each(p.tags) WHERE LOWER(json_each.value) = LOWER(?))')
+            params.append(request.args['tag'])
+        
+        if paginate:
+            try:
+                limit = min(max(int(request.args.get('limit', PROJECTS_PAGE_SIZE)), 1), PROJECTS_MAX_PAGE_SIZE)
+            except ValueError:
+                return jsonify({'error': 'limit must be an integer'}), 400
+            if request.args.get('cursor'):
+                try:
+                    cursor_created_at, cursor_id = decode_cursor(request.args['cursor'])
+                except ValueError:
+                    return jsonify({'error': 'Invalid cursor'}), 400
+                conditions.append('(p.created_at, p.id) < (?, ?)')
+                params.extend([cursor_created_at, cursor_id])
+        
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY p.created_at DESC, p.id DESC'
+        if paginate:
+            # One extra row tells us whether there is a next page
+            query += ' LIMIT ?'
+            params.append(limit + 1)
+        cursor.execute(query, params)
+        
+        projects = [row_to_dict(PROJECT_LIST_FIELDS, fields, row) for row in cursor.fetchall()]
+        
+        if paginate:
+            next_cursor = None
+            if len(projects) > limit:
+                projects = projects[:limit]
+                next_cursor = encode_cursor(projects[-1]['created_at'], projects[-1]['id'])
+            return jsonify({'projects': projects, 'next_cursor': next_cursor}), 200
         
         return jsonify(projects), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+
+RECOMMENDED_PROJECT_COLUMNS = '''
+    p.id, p.title, p.description, p.category, p.status, p.team_members, p.tags, p.skills_required,
+    p.stipend, p.duration, p.location, p.work_type, p.created_at, u.name as created_by_name, p.is_recruiting,
+    p.images, p.project_links, p.jd_pdf, p.created_by, p.contact_details, p.team_roles, p.partners, p.funding, p.highlights
+'''
+
+def recommended_project_dict(row, match_score=0, matched_skills=()):
+    return {
+        'id': row[0],
+        'title': row[1],
+        'description': row[2],
+        'category': row[3],
+        'status': row[4],
+        'team_members': json.loads(row[5]) if row[5] else [],
+        'tags': json.loads(row[6]) if row[6] else [],
+        'skills_required': json.loads(row[7]) if row[7] else [],
+        'stipend': row[8],
+        'duration': row[9],
+        'location': row[10],
+        'work_type': row[11],
+        'created_at': row[12],
+        'created_by_name': row[13],
+        'is_recruiting': bool(row[14]) if row[14] is not None else True,
+        'images': json.loads(row[15]) if row[15] else [],
+        'project_links': json.loads(row[16]) if row[16] else [],
+        'jd_pdf': row[17],
+        'created_by_id': row[18],
+        'contact_details': json.loads(row[19]) if row[19] else {},
+        'team_roles': json.loads(row[20]) if row[20] else [],
+        'partners': json.loads(row[21]) if row[21] else [],
+        'funding': row[22],
+        'highlights': json.loads(row[23]) if row[23] else [],
+        'match_score': match_score,
+        'matched_skills': list(matched_skills)
+    }
+
+PROJECTS_RECOMMENDED_DEFAULT = 50
+PROJECTS_RECOMMENDED_MAX = 100
 
 # Get recommended projects for a student based on their skills
 @app.route('/api/projects/recommended', methods=['GET'])
 @jwt_required()
 def get_recommended_projects():
+    """Active projects the student hasn't applied to, best match first.
+
+    ?strategy=heuristic (default) scores skill/keyword substring matches;
+    ?strategy=tfidf ranks by cosine similarity against the prebuilt TF-IDF
+    index (see tfidf.py). ?limit= keeps only the top matches (default 50,
+    at most 100).
+
+    The TF-IDF index is rebuilt every TFIDF_REBUILD_INTERVAL seconds, so a
+    project created since the last build is not ranked by it until the next.
+    """
     user_id = get_user_id_from_jwt()
     
-    conn = sqlite3.connect('launchpad.db')
+    strategy = request.args.get('strategy', 'heuristic')
+    if strategy not in ('heuristic', 'tfidf'):
+        return jsonify({'error': 'strategy must be heuristic or tfidf'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', PROJECTS_RECOMMENDED_DEFAULT)), 1), PROJECTS_RECOMMENDED_MAX)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Get user's skills
+        # Projects already applied to are skipped
         cursor.execute('''
-            SELECT skill_name FROM user_skills WHERE user_id = ?
+            SELECT project_id FROM project_applications WHERE student_id = ?
         ''', (user_id,))
-        user_skills = [row[0].lower() for row in cursor.fetchall()]
-        
-        # Get user's department and specialization for additional matching
-        cursor.execute('''
-            SELECT department, specialization, branch FROM users WHERE id = ?
-        ''', (user_id,))
-        user_data = cursor.fetchone()
-        user_keywords = []
-        if user_data:
-            if user_data[0]:  # department
-                user_keywords.append(user_data[0].lower())
-            if user_data[1]:  # specialization
-                user_keywords.append(user_data[1].lower())
-            if user_data[2]:  # branch
-                user_keywords.append(user_data[2].lower())
-        
-        # Get all active projects
-        cursor.execute('''
-            SELECT p.id, p.title, p.description, p.category, p.status, p.team_members, p.tags, p.skills_required, 
-                   p.stipend, p.duration, p.location, p.work_type, p.created_at, u.name as created_by_name, p.is_recruiting,
-                   p.images, p.project_links, p.jd_pdf, p.created_by, p.contact_details, p.team_roles, p.partners, p.funding, p.highlights
-            FROM projects p
-            LEFT JOIN users u ON p.created_by = u.id
-            WHERE p.status = 'active'
-            ORDER BY p.created_at DESC
-        ''')
-        
-        projects_with_scores = []
-        for row in cursor.fetchall():
-            project_id = row[0]
-            
-            # Check if user has already applied
-            cursor.execute('SELECT id FROM project_applications WHERE student_id = ? AND project_id = ?', 
-                          (user_id, project_id))
-            if cursor.fetchone():
-                continue  # Skip projects already applied to
-            
-            # Calculate match score
-            skills_required = json.loads(row[7]) if row[7] else []
-            tags = json.loads(row[6]) if row[6] else []
-            title = row[1].lower()
-            description = row[2].lower()
-            category = row[3].lower()
-            
-            score = 0
-            matched_skills = []
-            
-            # Match skills (highest weight)
-            for skill in user_skills:
-                for req_skill in skills_required:
-                    if skill in req_skill.lower() or req_skill.lower() in skill:
-                        score += 10
-                        matched_skills.append(req_skill)
-                        break
-            
-            # Match tags
-            for skill in user_skills:
-                for tag in tags:
-                    if skill in tag.lower() or tag.lower() in skill:
-                        score += 5
-                        break
-            
-            # Match keywords in title and description
-            for keyword in user_keywords:
-                if keyword in title:
-                    score += 3
-                if keyword in description:
-                    score += 2
-                if keyword in category:
-                    score += 3
+        applied = {row[0] for row in cursor.fetchall()}
+        
+        if strategy == 'tfidf':
+            tfidf.schedule_rebuilds(app.config['DATABASE'], app.config['TFIDF_INDEX_DIR'],
+                                    app.config['TFIDF_REBUILD_INTERVAL'])
+            index = tfidf.get_index(app.config['TFIDF_INDEX_DIR'])
+            if index is None:
+                return jsonify({'error': 'TF-IDF index is not available; run python tfidf.py build'}), 503
+            terms = tfidf.student_terms(cursor, user_id)
+            matches = [(project_id, round(score, 4), None)
+                       for project_id, score in index.top_k(terms, limit, exclude=applied)]
+        else:
+            # Get user's skills
+            cursor.execute('''
+                SELECT skill_name FROM user_skills WHERE user_id = ?
+            ''', (user_id,))
+            user_skills = [row[0] for row in cursor.fetchall()]
             
-            # Match skills in title/description
-            for skill in user_skills:
-                if skill in title:
-                    score += 4
-                if skill in description:
-                    score += 2
+            # Get user's department and specialization for additional matching
+            cursor.execute('''
+                SELECT department, specialization, branch FROM users WHERE id = ?
+            ''', (user_id,))
+            user_data = cursor.fetchone()
+            user_keywords = [value for value in (user_data or []) if value]
             
-            # Only include projects with some relevance
-            if score > 0:
-                project_data = {
-                    'id': project_id,
-                    'title': row[1],
-                    'description': row[2],
-                    'category': row[3],
-                    'status': row[4],
-                    'team_members': json.loads(row[5]) if row[5] else [],
-                    'tags': tags,
-                    'skills_required': skills_required,
-                    'stipend': row[8],
-                    'duration': row[9],
-                    'location': row[10],
-                    'work_type': row[11],
-                    'created_at': row[12],
-                    'created_by_name': row[13],
-                    'is_recruiting': bool(row[14]) if row[14] is not None else True,
-                    'images': json.loads(row[15]) if row[15] else [],
-                    'project_links': json.loads(row[16]) if row[16] else [],
-                    'jd_pdf': row[17],
-                    'created_by_id': row[18],
-                    'contact_details': json.loads(row[19]) if row[19] else {},
-                    'team_roles': json.loads(row[20]) if row[20] else [],
-                    'partners': json.loads(row[21]) if row[21] else [],
-                    'funding': row[22],
-                    'highlights': json.loads(row[23]) if row[23] else [],
-                    'match_score': score,
-                    'matched_skills': list(set(matched_skills))
-                }
-                projects_with_scores.append(project_data)
-        
-        # Sort by match score (highest first)
-        projects_with_scores.sort(key=lambda x: x['match_score'], reverse=True)
+            recommender.ensure_fresh(cursor)
+            matches = recommender.recommend(user_skills, user_keywords, exclude=applied, limit=limit)
         
-        # If no matches, return recent active projects
+        projects_with_scores = []
+        if matches:
+            # The TF-IDF index is built offline, so re-check that each project is still active
+            placeholders = ', '.join('?' * len(matches))
+            cursor.execute(f'''
+                SELECT {RECOMMENDED_PROJECT_COLUMNS}
+                FROM projects p
+                LEFT JOIN users u ON p.created_by = u.id
+                WHERE p.id IN ({placeholders}) AND p.status = 'active'
+            ''', [project_id for project_id, _, _ in matches])
+            rows = {row[0]: row for row in cursor.fetchall()}
+            for project_id, score, matched_skills in matches:
+                if project_id not in rows:
+                    continue
+                if matched_skills is None:
+                    # Required skills sharing a word or phrase with the student's profile
+                    skills_required = json.loads(rows[project_id][7]) if rows[project_id][7] else []
+                    matched_skills = [skill for skill in skills_required if terms.keys() & set(tfidf.tokenize(skill))]
+                projects_with_scores.append(recommended_project_dict(rows[project_id], score, matched_skills))
         if not projects_with_scores:
-            cursor.execute('''
-                SELECT p.id, p.title, p.description, p.category, p.status, p.team_members, p.tags, p.skills_required, 
-                       p.stipend, p.duration, p.location, p.work_type, p.created_at, u.name as created_by_name, p.is_recruiting,
-                       p.images, p.project_links, p.jd_pdf, p.created_by, p.contact_details, p.team_roles, p.partners, p.funding, p.highlights
+            # If no matches, or every match has since been closed, return recent active projects
+            cursor.execute(f'''
+                SELECT {RECOMMENDED_PROJECT_COLUMNS}
                 FROM projects p
                 LEFT JOIN users u ON p.created_by = u.id
                 WHERE p.status = 'active'
                 ORDER BY p.created_at DESC
-                LIMIT 10
-            ''')
-            
-            for row in cursor.fetchall():
-                project_id = row[0]
-                cursor.execute('SELECT id FROM project_applications WHERE student_id = ? AND project_id = ?', 
-                              (user_id, project_id))
-                if cursor.fetchone():
-                    continue
-                    
-                projects_with_scores.append({
-                    'id': project_id,
-                    'title': row[1],
-                    'description': row[2],
-                    'category': row[3],
-                    'status': row[4],
-                    'team_members': json.loads(row[5]) if row[5] else [],
-                    'tags': json.loads(row[6]) if row[6] else [],
-                    'skills_required': json.loads(row[7]) if row[7] else [],
-                    'stipend': row[8],
-                    'duration': row[9],
-                    'location': row[10],
-                    'work_type': row[11],
-                    'created_at': row[12],
-                    'created_by_name': row[13],
-                    'is_recruiting': bool(row[14]) if row[14] is not None else True,
-                    'images': json.loads(row[15]) if row[15] else [],
-                    'project_links': json.loads(row[16]) if row[16] else [],
-                    'jd_pdf': row[17],
-                    'created_by_id': row[18],
-                    'contact_details': json.loads(row[19]) if row[19] else {},
-                    'team_roles': json.loads(row[20]) if row[20] else [],
-                    'partners': json.loads(row[21]) if row[21] else [],
-                    'funding': row[22],
-                    'highlights': json.loads(row[23]) if row[23] else [],
-                    'match_score': 0,
-                    'matched_skills': []
-                })
+                LIMIT ?
+            ''', (min(limit, 10),))
+            projects_with_scores = [recommended_project_dict(row) for row in cursor.fetchall() if row[0] not in applied]
         
         return jsonify(projects_with_scores), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Create a project (alumni only)
 @app.route('/api/projects', methods=['POST'])
 @jwt_required()
 def create_project():
     try:
-        user_id = get_user_id_from_jwt()
+        user_id, role = current_user()
         print(f"DEBUG: User ID from JWT: {user_id}")
     except Exception as e:
         print(f"DEBUG: JWT Error: {e}")
@@ -938,13 +708,11 @@ def create_project():
     print(f"DEBUG: Authorization header: {request.headers.get('Authorization')}")
     print(f"DEBUG: All headers: {dict(request.headers)}")
 
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        role_row = cursor.fetchone()
-        if not role_row or role_row[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can create projects'}), 403
 
         required = ['title', 'description', 'category']
@@ -968,14 +736,15 @@ def create_project():
         highlights = json.dumps(data.get('highlights', []))
 
         cursor.execute('''
-            INSERT INTO projects (title, description, category, status, team_members, tags, skills_required, stipend, duration, location, work_type, is_recruiting, images, project_links, jd_pdf, contact_details, team_roles, partners, funding, highlights, created_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO projects (title, description, excerpt, category, status, team_members, tags, skills_required, stipend, duration, location, work_type, is_recruiting, images, project_links, jd_pdf, contact_details, team_roles, partners, funding, highlights, created_by)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''' , (
-            data['title'], data['description'], data['category'], status, team_members, tags, skills_required,
+            data['title'], data['description'], make_excerpt(data['description']), data['category'], status, team_members, tags, skills_required,
             None, None, None, None, is_recruiting, images, project_links, jd_pdf, contact_details, team_roles, partners, funding, highlights, user_id
         ))
 
         project_id = cursor.lastrowid
+        user_stats.project_changed(cursor, user_id, None, status)
         
         # Create positions if provided
         positions = data.get('positions', [])
@@ -998,12 +767,11 @@ def create_project():
                 ))
         
         conn.commit()
+        recommender.refresh_project(cursor, project_id)
         return jsonify({'id': project_id, 'message': 'Project created'}), 201
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Update a project (alumni only - project creator)
 @app.route('/api/projects/<int:project_id>', methods=['PUT'])
@@ -1015,12 +783,12 @@ def update_project(project_id):
         return jsonify({'error': f'JWT Error: {str(e)}'}), 422
     
     data = request.get_json()
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
         # Check if project exists and user is the creator
-        cursor.execute('SELECT created_by FROM projects WHERE id = ?', (project_id,))
+        cursor.execute('SELECT created_by, status FROM projects WHERE id = ?', (project_id,))
         project = cursor.fetchone()
         
         if not project:
@@ -1050,6 +818,8 @@ def update_project(project_id):
         if 'description' in data:
             update_fields.append('description = ?')
             update_values.append(data['description'])
+            update_fields.append('excerpt = ?')
+            update_values.append(make_excerpt(data['description']))
         if 'category' in data:
             update_fields.append('category = ?')
             update_values.append(data['category'])
@@ -1097,7 +867,16 @@ def update_project(project_id):
         if update_fields:
             update_values.append(project_id)
             query = f"UPDATE projects SET {', '.join(update_fields)} WHERE id = ?"
+            if 'status' in data:
+                # Only if the status is still the one we read; the counters below depend on it
+                query += ' AND status IS ?'
+                update_values.append(project[1])
             cursor.execute(query, update_values)
+            if 'status' in data:
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return jsonify({'error': 'Project status was changed meanwhile; reload and try again'}), 409
+                user_stats.project_changed(cursor, user_id, project[1], data['status'])
 
         # Update positions if provided
         def coerce_bool(value):
@@ -1169,62 +948,76 @@ def update_project(project_id):
                     ))
 
         conn.commit()
+        recommender.refresh_project(cursor, project_id)
         return jsonify({'message': 'Project updated successfully'}), 200
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+
+# Columns the blog feed can return; ?fields= / ?view=card pick a subset
+BLOG_LIST_FIELDS = {
+    'id': ('b.id', None),
+    'title': ('b.title', None),
+    'content': ('b.content', None),
+    'excerpt': ('b.excerpt', None),
+    'category': ('b.category', None),
+    'created_at': ('b.created_at', None),
+    'updated_at': ('b.updated_at', None),
+    'images': ('b.images', json_list),
+    'pdfs': ('b.pdfs', json_list),
+    'author_name': ('u.name', None),
+    'author_id': ('b.author_id', None),
+    'likes_count': ('b.likes_count', None),
+    'is_liked': ('0', bool),  # Resolved per viewer after the query
+}
+BLOG_DEFAULT_FIELDS = [name for name in BLOG_LIST_FIELDS if name != 'excerpt']
+BLOG_CARD_FIELDS = ['id', 'title', 'excerpt', 'category', 'created_at', 'images', 'author_name', 'author_id',
+                    'likes_count', 'is_liked']
+
+# Which of post_ids the user has liked, as a set
+def liked_post_ids(cursor, user_id, post_ids):
+    rows = fetch_in_chunks(cursor, '''
+        SELECT blog_post_id FROM blog_likes WHERE user_id = ? AND blog_post_id IN ({ids})
+    ''', post_ids, (user_id,))
+    return {row[0] for row in rows}
 
 @app.route('/api/blog', methods=['GET'])
 def get_blog_posts():
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        cursor.execute('''
-            SELECT b.id, b.title, b.content, b.category, b.created_at, b.updated_at,
-                   b.images, b.pdfs, u.name as author_name, b.author_id
+        try:
+            fields = resolve_fields(BLOG_LIST_FIELDS, BLOG_DEFAULT_FIELDS, BLOG_CARD_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        cursor.execute(f'''
+            SELECT {select_clause(BLOG_LIST_FIELDS, fields)}
             FROM blog_posts b
             LEFT JOIN users u ON b.author_id = u.id
             ORDER BY b.created_at DESC
         ''')
         
-        posts = []
-        for row in cursor.fetchall():
-            post_id = row[0]
-            
-            # Get likes count for this post
-            cursor.execute('SELECT COUNT(*) FROM blog_likes WHERE blog_post_id = ?', (post_id,))
-            likes_count = cursor.fetchone()[0]
-            
-            posts.append({
-                'id': post_id,
-                'title': row[1],
-                'content': row[2],
-                'category': row[3],
-                'created_at': row[4],
-                'updated_at': row[5],
-                'images': json.loads(row[6]) if row[6] else [],
-                'pdfs': json.loads(row[7]) if row[7] else [],
-                'author_name': row[8],
-                'author_id': row[9],
-                'likes_count': likes_count,
-                'is_liked': False  # Will be updated if user is logged in
-            })
+        posts = [row_to_dict(BLOG_LIST_FIELDS, fields, row) for row in cursor.fetchall()]
+        
+        # Resolve is_liked for the whole page with one lookup per chunk of ids
+        user_id = get_optional_user_id()
+        if user_id and 'is_liked' in fields and 'id' in fields:
+            liked = liked_post_ids(cursor, user_id, [post['id'] for post in posts])
+            for post in posts:
+                post['is_liked'] = post['id'] in liked
         
         return jsonify(posts), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/blog', methods=['POST'])
 @jwt_required()
 def create_blog_post():
     try:
-        user_id = get_user_id_from_jwt()
+        user_id, role = current_user()
         print(f"DEBUG: User ID from JWT: {user_id}")
     except Exception as e:
         print(f"DEBUG: JWT Error: {e}")
@@ -1235,13 +1028,11 @@ def create_blog_post():
     print(f"DEBUG: Authorization header: {request.headers.get('Authorization')}")
     print(f"DEBUG: All headers: {dict(request.headers)}")
 
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        role_row = cursor.fetchone()
-        if not role_row or role_row[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can create blog posts'}), 403
 
         required = ['title', 'content']
@@ -1253,28 +1044,27 @@ def create_blog_post():
         images_json = json.dumps([])
         pdfs_json = json.dumps([])
         cursor.execute('''
-            INSERT INTO blog_posts (title, content, category, author_id, images, pdfs)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (data['title'], data['content'], data.get('category'), user_id, images_json, pdfs_json))
+            INSERT INTO blog_posts (title, content, excerpt, category, author_id, images, pdfs)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (data['title'], data['content'], make_excerpt(data['content']), data.get('category'), user_id, images_json, pdfs_json))
+        post_id = cursor.lastrowid
+        user_stats.bump(cursor, user_id, blog_posts=1)
 
         conn.commit()
-        post_id = cursor.lastrowid
         return jsonify({'id': post_id, 'message': 'Blog post created'}), 201
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/blog/<int:post_id>', methods=['GET'])
 def get_blog_post(post_id):
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
         cursor.execute('''
             SELECT b.id, b.title, b.content, b.category, b.created_at, b.updated_at,
-                   b.images, b.pdfs, u.name as author_name, b.author_id
+                   b.images, b.pdfs, u.name as author_name, b.author_id, b.likes_count
             FROM blog_posts b
             LEFT JOIN users u ON b.author_id = u.id
             WHERE b.id = ?
@@ -1285,13 +1075,11 @@ def get_blog_post(post_id):
         if not post_data:
             return jsonify({'error': 'Blog post not found'}), 404
         
-        # Get likes count
-        cursor.execute('SELECT COUNT(*) FROM blog_likes WHERE blog_post_id = ?', (post_id,))
-        likes_count = cursor.fetchone()[0]
+        likes_count = post_data[10]
         
         # Check if current user has liked this post (if user is logged in)
-        is_liked = False
-        # Note: We'll need to get user_id from JWT token for this to work properly
+        user_id = get_optional_user_id()
+        is_liked = bool(user_id) and post_id in liked_post_ids(cursor, user_id, [post_id])
         
         post = {
             'id': post_data[0],
@@ -1312,8 +1100,6 @@ def get_blog_post(post_id):
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Update a blog post (author only)
 @app.route('/api/blog/<int:post_id>', methods=['PUT'])
@@ -1324,7 +1110,7 @@ def update_blog_post(post_id):
     except Exception as e:
         return jsonify({'error': f'JWT Error: {str(e)}'}), 422
     data = request.get_json()
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     try:
         cursor.execute('SELECT author_id FROM blog_posts WHERE id = ?', (post_id,))
@@ -1341,6 +1127,8 @@ def update_blog_post(post_id):
         if 'content' in data:
             fields.append('content = ?')
             values.append(data['content'])
+            fields.append('excerpt = ?')
+            values.append(make_excerpt(data['content']))
         if 'category' in data:
             fields.append('category = ?')
             values.append(data['category'])
@@ -1356,8 +1144,6 @@ def update_blog_post(post_id):
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Delete a blog post (author only)
 @app.route('/api/blog/<int:post_id>', methods=['DELETE'])
@@ -1367,7 +1153,7 @@ def delete_blog_post(post_id):
         user_id = get_user_id_from_jwt()
     except Exception as e:
         return jsonify({'error': f'JWT Error: {str(e)}'}), 422
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     try:
         cursor.execute('SELECT author_id FROM blog_posts WHERE id = ?', (post_id,))
@@ -1377,6 +1163,7 @@ def delete_blog_post(post_id):
         if row[0] != user_id:
             return jsonify({'error': 'Only the author can delete this post'}), 403
         cursor.execute('DELETE FROM blog_posts WHERE id = ?', (post_id,))
+        user_stats.bump(cursor, user_id, blog_posts=-1)
         # Clean up likes for this post
         cursor.execute('DELETE FROM blog_likes WHERE blog_post_id = ?', (post_id,))
         conn.commit()
@@ -1384,15 +1171,13 @@ def delete_blog_post(post_id):
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
     user_id = get_user_id_from_jwt()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -1456,14 +1241,12 @@ def get_profile():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Get user profile by ID (for viewing other users' profiles)
 @app.route('/api/users/<int:user_id>/profile', methods=['GET'])
 @jwt_required()
 def get_user_profile_by_id(user_id):
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -1526,8 +1309,6 @@ def get_user_profile_by_id(user_id):
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Update profile endpoint
 @app.route('/api/profile', methods=['PUT'])
@@ -1536,7 +1317,7 @@ def update_profile():
     user_id = get_user_id_from_jwt()
     data = request.get_json()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -1612,35 +1393,31 @@ def update_profile():
                 ''', (user_id, language.get('name'), language.get('proficiency', 'intermediate')))
         
         conn.commit()
+        mentor_recommender.refresh_alumni(cursor, user_id)
         return jsonify({'message': 'Profile updated successfully'}), 200
         
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Project application endpoints
 @app.route('/api/projects/<int:project_id>/apply', methods=['POST'])
 @jwt_required()
 def apply_to_project(project_id):
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     data = request.get_json()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is a student
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'student':
+        if role != 'student':
             return jsonify({'error': 'Only students can apply to projects'}), 403
         
         # Check if project exists
-        cursor.execute('SELECT id FROM projects WHERE id = ?', (project_id,))
-        if not cursor.fetchone():
+        cursor.execute('SELECT created_by FROM projects WHERE id = ?', (project_id,))
+        project = cursor.fetchone()
+        if not project:
             return jsonify({'error': 'Project not found'}), 404
         
         # Check if already applied
@@ -1653,6 +1430,7 @@ def apply_to_project(project_id):
             INSERT INTO project_applications (student_id, project_id, message)
             VALUES (?, ?, ?)
         ''', (user_id, project_id, data.get('message', '')))
+        user_stats.application_changed(cursor, user_id, project[0], None, 'pending')
         
         conn.commit()
         return jsonify({'message': 'Application submitted successfully'}), 201
@@ -1660,22 +1438,18 @@ def apply_to_project(project_id):
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Get projects a student applied to
 @app.route('/api/students/applied-projects', methods=['GET'])
 @jwt_required()
 def get_student_applied_projects():
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
 
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        role_row = cursor.fetchone()
-        if not role_row or role_row[0] != 'student':
+        if role != 'student':
             return jsonify({'error': 'Only students can view applied projects'}), 403
 
         cursor.execute('''
@@ -1711,12 +1485,10 @@ def get_student_applied_projects():
         return jsonify(results), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/projects/<int:project_id>', methods=['GET'])
 def get_project_detail(project_id):
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -1808,25 +1580,19 @@ def get_project_detail(project_id):
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Mentorship request endpoints
 @app.route('/api/mentorship/request', methods=['POST'])
 @jwt_required()
 def request_mentorship():
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     data = request.get_json()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is a student
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'student':
+        if role != 'student':
             return jsonify({'error': 'Only students can request mentorship'}), 403
         
         alumni_id = data.get('alumni_id')
@@ -1834,10 +1600,7 @@ def request_mentorship():
             return jsonify({'error': 'Alumni ID is required'}), 400
         
         # Check if alumni exists and is actually an alumni
-        cursor.execute('SELECT role FROM users WHERE id = ?', (alumni_id,))
-        alumni_role = cursor.fetchone()
-        
-        if not alumni_role or alumni_role[0] != 'alumni':
+        if role_cache.get(cursor, alumni_id) != 'alumni':
             return jsonify({'error': 'Invalid alumni ID'}), 400
         
         # Check if already requested
@@ -1850,6 +1613,7 @@ def request_mentorship():
             INSERT INTO mentorship_requests (student_id, alumni_id, message)
             VALUES (?, ?, ?)
         ''', (user_id, alumni_id, data.get('message', '')))
+        user_stats.mentorship_changed(cursor, user_id, alumni_id, None, 'pending')
         
         conn.commit()
         return jsonify({'message': 'Mentorship request sent successfully'}), 201
@@ -1857,14 +1621,12 @@ def request_mentorship():
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Create mentorship request (student sends to alumni)
 @app.route('/api/mentorship/requests', methods=['POST'])
 @jwt_required()
 def create_mentorship_request():
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     data = request.get_json()
     
     alumni_id = data.get('alumni_id')
@@ -1873,25 +1635,20 @@ def create_mentorship_request():
     if not alumni_id:
         return jsonify({'error': 'Alumni ID is required'}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is a student
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'student':
+        if role != 'student':
             return jsonify({'error': 'Only students can send mentorship requests'}), 403
         
         # Check if alumni exists
-        cursor.execute('SELECT role FROM users WHERE id = ?', (alumni_id,))
-        alumni = cursor.fetchone()
+        alumni_role = role_cache.get(cursor, alumni_id)
         
-        if not alumni:
+        if not alumni_role:
             return jsonify({'error': 'Alumni not found'}), 404
         
-        if alumni[0] != 'alumni':
+        if alumni_role != 'alumni':
             return jsonify({'error': 'User is not an alumni'}), 400
         
         # Check if request already exists
@@ -1909,6 +1666,7 @@ def create_mentorship_request():
             INSERT INTO mentorship_requests (student_id, alumni_id, message, status, created_at)
             VALUES (?, ?, ?, 'pending', datetime('now'))
         ''', (user_id, alumni_id, message))
+        user_stats.mentorship_changed(cursor, user_id, alumni_id, None, 'pending')
         
         conn.commit()
         return jsonify({'message': 'Mentorship request sent successfully'}), 201
@@ -1916,26 +1674,20 @@ def create_mentorship_request():
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/mentorship/requests', methods=['GET'])
 @jwt_required()
 def get_mentorship_requests():
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Get user role
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role:
+        if not role:
             return jsonify({'error': 'User not found'}), 404
         
-        if user_role[0] == 'student':
+        if role == 'student':
             # Get requests sent by student
             cursor.execute('''
                 SELECT mr.id, mr.message, mr.status, mr.created_at,
@@ -1971,23 +1723,50 @@ def get_mentorship_requests():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+
+# Columns the alumni directory can return; ?fields= / ?view=card pick a subset
+ALUMNI_LIST_FIELDS = {
+    'id': ('id', None),
+    'name': ('name', None),
+    'email': ('email', None),
+    'graduation_year': ('graduation_year', None),
+    'department': ('department', None),
+    'hall': ('hall', None),
+    'branch': ('branch', None),
+    'bio': ('bio', None),
+    'current_company': ('current_company', None),
+    'current_position': ('current_position', None),
+    'location': ('location', None),
+    'work_preference': ('work_preference', None),
+    'linkedin': ('linkedin', None),
+    'github': ('github', None),
+    'years_of_experience': ('years_of_experience', None),
+    'domain': ('domain', None),
+    'tech_skills': ('tech_skills', json_list),
+    'is_available': ('is_available', bool_default_true),
+    'avatar': ('avatar', None),
+}
+ALUMNI_DEFAULT_FIELDS = [name for name in ALUMNI_LIST_FIELDS if name != 'avatar']
+ALUMNI_CARD_FIELDS = ['id', 'name', 'avatar', 'graduation_year', 'department', 'current_company', 'current_position',
+                      'domain', 'tech_skills', 'is_available']
 
 # Get alumni list for mentorship
 @app.route('/api/alumni', methods=['GET'])
 def get_alumni():
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     # Get availability filter from query params
     availability_filter = request.args.get('availability', 'all')
     
     try:
-        query = '''
-            SELECT id, name, email, graduation_year, department, hall, branch, bio,
-                   current_company, current_position, location, work_preference,
-                   linkedin, github, years_of_experience, domain, tech_skills, is_available
+        try:
+            fields = resolve_fields(ALUMNI_LIST_FIELDS, ALUMNI_DEFAULT_FIELDS, ALUMNI_CARD_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = f'''
+            SELECT {select_clause(ALUMNI_LIST_FIELDS, fields)}
             FROM users
             WHERE role = 'alumni'
         '''
@@ -2002,68 +1781,99 @@ def get_alumni():
         
         cursor.execute(query)
         
-        alumni = []
-        for row in cursor.fetchall():
-            alumni.append({
-                'id': row[0],
-                'name': row[1],
-                'email': row[2],
-                'graduation_year': row[3],
-                'department': row[4],
-                'hall': row[5],
-                'branch': row[6],
-                'bio': row[7],
-                'current_company': row[8],
-                'current_position': row[9],
-                'location': row[10],
-                'work_preference': row[11],
-                'linkedin': row[12],
-                'github': row[13],
-                'years_of_experience': row[14],
-                'domain': row[15],
-                'tech_skills': json.loads(row[16]) if row[16] else [],
-                'is_available': bool(row[17]) if row[17] is not None else True
-            })
+        alumni = [row_to_dict(ALUMNI_LIST_FIELDS, fields, row) for row in cursor.fetchall()]
         
         return jsonify(alumni), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
-# Student dashboard statistics
-@app.route('/api/students/dashboard-stats', methods=['GET'])
+MENTORS_RECOMMENDED_DEFAULT = 10
+MENTORS_RECOMMENDED_MAX = 50
+
+# Alumni ranked for the current student
+@app.route('/api/alumni/recommended', methods=['GET'])
 @jwt_required()
-def get_student_dashboard_stats():
-    user_id = get_user_id_from_jwt()
+def get_recommended_mentors():
+    """Top ?limit= available alumni for the student, skipping ones already requested.
+
+    Accepts the same ?fields= / ?view=card as /api/alumni; every entry also
+    carries match_score and matched_skills.
+    """
+    user_id, role = current_user()
+    
+    try:
+        limit = min(max(int(request.args.get('limit', MENTORS_RECOMMENDED_DEFAULT)), 1), MENTORS_RECOMMENDED_MAX)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    try:
+        fields = resolve_fields(ALUMNI_LIST_FIELDS, ALUMNI_DEFAULT_FIELDS, ALUMNI_CARD_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is a student
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
+        cursor.execute('SELECT department, branch, specialization FROM users WHERE id = ?', (user_id,))
+        student = cursor.fetchone()
+        if not student or role != 'student':
+            return jsonify({'error': 'Only students can get mentor recommendations'}), 403
         
-        if not user_role or user_role[0] != 'student':
-            return jsonify({'error': 'Only students can access dashboard stats'}), 403
+        cursor.execute('SELECT skill_name FROM user_skills WHERE user_id = ?', (user_id,))
+        skills = [row[0] for row in cursor.fetchall()]
+        
+        cursor.execute('SELECT alumni_id FROM mentorship_requests WHERE student_id = ?', (user_id,))
+        requested = {row[0] for row in cursor.fetchall()}
+        
+        mentor_recommender.ensure_fresh(cursor)
+        matches = mentor_recommender.recommend(skills, student[0], student[1], student[2],
+                                               exclude=requested, limit=limit)
+        if not matches:
+            return jsonify([]), 200
+        
+        # 'id' is needed to line rows up with their scores
+        select_fields = fields if 'id' in fields else ['id'] + fields
+        placeholders = ', '.join('?' * len(matches))
+        cursor.execute(f'''
+            SELECT {select_clause(ALUMNI_LIST_FIELDS, select_fields)}
+            FROM users
+            WHERE id IN ({placeholders})
+        ''', [alumni_id for alumni_id, _, _ in matches])
+        rows = {item['id']: item for item in (row_to_dict(ALUMNI_LIST_FIELDS, select_fields, row) for row in cursor.fetchall())}
         
-        # Get applied projects count
-        cursor.execute('SELECT COUNT(*) FROM project_applications WHERE student_id = ?', (user_id,))
-        applied_projects = cursor.fetchone()[0]
+        mentors = []
+        for alumni_id, score, matched_skills in matches:
+            if alumni_id in rows:
+                mentor = {name: rows[alumni_id][name] for name in fields}
+                mentor['match_score'] = score
+                mentor['matched_skills'] = matched_skills
+                mentors.append(mentor)
         
-        # Get accepted projects count
-        cursor.execute('SELECT COUNT(*) FROM project_applications WHERE student_id = ? AND status = "accepted"', (user_id,))
-        accepted_projects = cursor.fetchone()[0]
+        return jsonify(mentors), 200
         
-        # Get pending applications count
-        cursor.execute('SELECT COUNT(*) FROM project_applications WHERE student_id = ? AND status = "pending"', (user_id,))
-        pending_applications = cursor.fetchone()[0]
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Student dashboard statistics
+@app.route('/api/students/dashboard-stats', methods=['GET'])
+@jwt_required()
+def get_student_dashboard_stats():
+    user_id, role = current_user()
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    try:
+        if role != 'student':
+            return jsonify({'error': 'Only students can access dashboard stats'}), 403
         
-        # Get mentorship requests count
-        cursor.execute('SELECT COUNT(*) FROM mentorship_requests WHERE student_id = ?', (user_id,))
-        mentorship_requests = cursor.fetchone()[0]
+        # Counters kept by user_stats.py; users with no activity yet have no row
+        cursor.execute('''
+            SELECT applied_projects, accepted_projects, pending_applications, mentorship_requests
+            FROM user_stats WHERE user_id = ?
+        ''', (user_id,))
+        applied_projects, accepted_projects, pending_applications, mentorship_requests = cursor.fetchone() or (0,) * 4
         
         stats = {
             'applied_projects': applied_projects,
@@ -2076,53 +1886,28 @@ def get_student_dashboard_stats():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Alumni dashboard statistics
 @app.route('/api/alumni/dashboard-stats', methods=['GET'])
 @jwt_required()
 def get_alumni_dashboard_stats():
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is an alumni
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can access dashboard stats'}), 403
         
-        # Get active projects count
-        cursor.execute('SELECT COUNT(*) FROM projects WHERE created_by = ? AND status = "active"', (user_id,))
-        active_projects = cursor.fetchone()[0]
-        
-        # Get total projects count
-        cursor.execute('SELECT COUNT(*) FROM projects WHERE created_by = ?', (user_id,))
-        total_projects = cursor.fetchone()[0]
-        
-        # Get mentees count (accepted mentorship requests)
-        cursor.execute('SELECT COUNT(*) FROM mentorship_requests WHERE alumni_id = ? AND status = "accepted"', (user_id,))
-        mentees = cursor.fetchone()[0]
-        
-        # Get blog posts count
-        cursor.execute('SELECT COUNT(*) FROM blog_posts WHERE author_id = ?', (user_id,))
-        blog_posts = cursor.fetchone()[0]
-        
-        # Get pending mentorship requests count
-        cursor.execute('SELECT COUNT(*) FROM mentorship_requests WHERE alumni_id = ? AND status = "pending"', (user_id,))
-        pending_mentorship_requests = cursor.fetchone()[0]
-        
-        # Get pending project applications count
+        # Counters kept by user_stats.py; users with no activity yet have no row
         cursor.execute('''
-            SELECT COUNT(*) FROM project_applications pa
-            JOIN projects p ON pa.project_id = p.id
-            WHERE p.created_by = ? AND pa.status = "pending"
+            SELECT active_projects, total_projects, mentees, blog_posts,
+                   pending_mentorship_requests, pending_project_applications
+            FROM user_stats WHERE user_id = ?
         ''', (user_id,))
-        pending_project_applications = cursor.fetchone()[0]
+        (active_projects, total_projects, mentees, blog_posts,
+         pending_mentorship_requests, pending_project_applications) = cursor.fetchone() or (0,) * 6
         
         stats = {
             'active_projects': active_projects,
@@ -2137,8 +1922,6 @@ def get_alumni_dashboard_stats():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Accept/Decline mentorship request
 @app.route('/api/mentorship/<int:request_id>/<action>', methods=['POST'])
@@ -2149,13 +1932,13 @@ def handle_mentorship_request(request_id, action):
     if action not in ['accept', 'decline']:
         return jsonify({'error': 'Invalid action'}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
         # Check if user is an alumni and owns this request
         cursor.execute('''
-            SELECT mr.id, mr.alumni_id, u.role
+            SELECT mr.id, mr.alumni_id, u.role, mr.student_id, mr.status
             FROM mentorship_requests mr
             JOIN users u ON mr.alumni_id = u.id
             WHERE mr.id = ?
@@ -2174,11 +1957,16 @@ def handle_mentorship_request(request_id, action):
         
         # Update request status
         new_status = 'accepted' if action == 'accept' else 'declined'
+        # Conditional on the status we read, so two concurrent accepts cannot both count
         cursor.execute('''
             UPDATE mentorship_requests 
             SET status = ?
-            WHERE id = ?
-        ''', (new_status, request_id))
+            WHERE id = ? AND status IS ?
+        ''', (new_status, request_id, request_data[4]))
+        if cursor.rowcount == 0:
+            conn.rollback()
+            return jsonify({'error': 'Mentorship request was handled meanwhile; reload and try again'}), 409
+        user_stats.mentorship_changed(cursor, request_data[3], user_id, request_data[4], new_status)
         
         conn.commit()
         return jsonify({'message': f'Mentorship request {action}ed successfully'}), 200
@@ -2186,24 +1974,55 @@ def handle_mentorship_request(request_id, action):
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Get project applications for alumni
+APPLICATION_SORTS = ('created_at', 'fit')
+
+# {user_id: [skill_name, ...]} for many users in one query per chunk of ids
+def skills_by_user(cursor, user_ids):
+    user_ids = list(user_ids)
+    skills = {user_id: [] for user_id in user_ids}
+    rows = fetch_in_chunks(cursor, '''
+        SELECT user_id, skill_name FROM user_skills WHERE user_id IN ({ids})
+    ''', user_ids)
+    for user_id, skill_name in rows:
+        skills[user_id].append(skill_name)
+    return skills
+
+def rank_by_fit(cursor, applications, requirements):
+    """Add fit_score, matched_skills and student_skills to each application and
+    sort best fit first (newest first among equal scores).
+
+    requirements[i] is (position required_skills, project skills_required) as
+    stored JSON for applications[i]; the position's list wins when non-empty.
+    """
+    skills = skills_by_user(cursor, {application['student_id'] for application in applications})
+    for application, (position_skills, project_skills) in zip(applications, requirements):
+        required = (json.loads(position_skills) if position_skills else []) or \
+                   (json.loads(project_skills) if project_skills else [])
+        student_skills = skills[application['student_id']]
+        fit_score, matched_skills = skill_fit(student_skills, required)
+        application['fit_score'] = fit_score
+        application['matched_skills'] = matched_skills
+        application['student_skills'] = student_skills
+    # Rows arrive newest first and the sort is stable
+    applications.sort(key=lambda application: application['fit_score'], reverse=True)
+
 @app.route('/api/alumni/project-applications', methods=['GET'])
 @jwt_required()
 def get_alumni_project_applications():
-    user_id = get_user_id_from_jwt()
+    """Applications to the alumnus's projects; ?sort=fit ranks applicants by skill fit."""
+    user_id, role = current_user()
+    
+    sort = request.args.get('sort', 'created_at')
+    if sort not in APPLICATION_SORTS:
+        return jsonify({'error': 'sort must be created_at or fit'}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is an alumni
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can view project applications'}), 403
         
         # Get project applications for alumni's projects
@@ -2212,7 +2031,8 @@ def get_alumni_project_applications():
                    p.title as project_title, p.id as project_id,
                    pa.student_id, u.name as student_name, u.email as student_email,
                    pa.position_id, pp.title as position_title,
-                   pa.is_completed, pa.completed_at, pa.feedback, pa.has_team
+                   pa.is_completed, pa.completed_at, pa.feedback, pa.has_team,
+                   pp.required_skills, p.skills_required
             FROM project_applications pa
             JOIN projects p ON pa.project_id = p.id
             JOIN users u ON pa.student_id = u.id
@@ -2222,7 +2042,9 @@ def get_alumni_project_applications():
         ''', (user_id,))
 
         applications = []
+        requirements = []
         for row in cursor.fetchall():
+            requirements.append((row[15], row[16]))
             applications.append({
                 'id': row[0],
                 'message': row[1],
@@ -2241,31 +2063,34 @@ def get_alumni_project_applications():
                 'has_team': bool(row[14]) if row[14] is not None else False
             })
         
+        if sort == 'fit':
+            rank_by_fit(cursor, applications, requirements)
+        
         return jsonify(applications), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
   
 # Get applications for a specific project (for alumni)
 @app.route('/api/projects/<int:project_id>/applications', methods=['GET'])
 @jwt_required()
 def get_project_applications(project_id):
-    user_id = get_user_id_from_jwt()
+    """Applications to one project; ?sort=fit ranks applicants by skill fit."""
+    user_id, role = current_user()
+    
+    sort = request.args.get('sort', 'created_at')
+    if sort not in APPLICATION_SORTS:
+        return jsonify({'error': 'sort must be created_at or fit'}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
         # Check if user is an alumni and owns the project
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can view project applications'}), 403
         
-        cursor.execute('SELECT created_by FROM projects WHERE id = ?', (project_id,))
+        cursor.execute('SELECT created_by, skills_required FROM projects WHERE id = ?', (project_id,))
         project = cursor.fetchone()
         
         if not project:
@@ -2279,7 +2104,8 @@ def get_project_applications(project_id):
             SELECT pa.id, pa.message, pa.status, pa.created_at,
                    pa.student_id, u.name as student_name, u.email as student_email,
                    pa.position_id, pp.title as position_title,
-                   pa.is_completed, pa.completed_at, pa.feedback, pa.has_team
+                   pa.is_completed, pa.completed_at, pa.feedback, pa.has_team,
+                   pp.required_skills
             FROM project_applications pa
             JOIN users u ON pa.student_id = u.id
             LEFT JOIN project_positions pp ON pa.position_id = pp.id
@@ -2288,7 +2114,9 @@ def get_project_applications(project_id):
         ''', (project_id,))
 
         applications = []
+        requirements = []
         for row in cursor.fetchall():
+            requirements.append((row[13], project[1]))
             applications.append({
                 'id': row[0],
                 'message': row[1],
@@ -2305,31 +2133,29 @@ def get_project_applications(project_id):
                 'has_team': bool(row[12]) if row[12] is not None else False
             })
         
+        if sort == 'fit':
+            rank_by_fit(cursor, applications, requirements)
+        
         return jsonify(applications), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Submit feedback and mark project as completed for a student
 @app.route('/api/project-applications/<int:application_id>/complete', methods=['POST'])
 @jwt_required()
 def complete_project_application(application_id):
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     data = request.get_json()
     
     feedback = data.get('feedback', '')
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
         # Check if user is alumni
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can mark projects as completed'}), 403
         
         # Get application details and verify ownership
@@ -2355,30 +2181,11 @@ def complete_project_application(application_id):
             return jsonify({'error': f'Only accepted applications can be marked as completed. Current status: {application[3]}'}), 400
         
         # Update application with feedback and completion status
-        try:
-            cursor.execute('''
-                UPDATE project_applications 
-                SET feedback = ?, is_completed = 1, completed_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (feedback, application_id))
-        except sqlite3.OperationalError as e:
-            # Column might not exist, try to add it
-            if 'no such column' in str(e).lower():
-                try:
-                    cursor.execute('ALTER TABLE project_applications ADD COLUMN feedback TEXT')
-                    cursor.execute('ALTER TABLE project_applications ADD COLUMN completed_at TIMESTAMP')
-                    cursor.execute('ALTER TABLE project_applications ADD COLUMN is_completed BOOLEAN DEFAULT 0')
-                    conn.commit()
-                    # Retry the update
-                    cursor.execute('''
-                        UPDATE project_applications 
-                        SET feedback = ?, is_completed = 1, completed_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    ''', (feedback, application_id))
-                except Exception as alter_error:
-                    return jsonify({'error': f'Database schema error: {str(alter_error)}'}), 500
-            else:
-                raise
+        cursor.execute('''
+            UPDATE project_applications 
+            SET feedback = ?, is_completed = 1, completed_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (feedback, application_id))
         
         conn.commit()
         
@@ -2391,8 +2198,6 @@ def complete_project_application(application_id):
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Get feedback for a student's completed projects
 @app.route('/api/students/completed-projects', methods=['GET'])
@@ -2400,7 +2205,7 @@ def complete_project_application(application_id):
 def get_student_completed_projects():
     user_id = get_user_id_from_jwt()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -2436,8 +2241,6 @@ def get_student_completed_projects():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Check if student has applied to a project
 @app.route('/api/projects/<int:project_id>/application-status', methods=['GET'])
@@ -2445,7 +2248,7 @@ def get_student_completed_projects():
 def check_application_status(project_id):
     user_id = get_user_id_from_jwt()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
@@ -2494,8 +2297,6 @@ def check_application_status(project_id):
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 #Submit application        
 @app.route('/api/project-applications', methods=['POST'])
@@ -2516,7 +2317,7 @@ def create_project_application():
     if not position_id:
         print(f"WARNING: Application submitted without position_id for project {project_id}")
         # Check if project has positions - if so, require position_id
-        cursor = sqlite3.connect('launchpad.db').cursor()
+        cursor = get_db().cursor()
         cursor.execute('SELECT COUNT(*) FROM project_positions WHERE project_id = ? AND is_active = 1', (project_id,))
         active_positions = cursor.fetchone()[0]
         cursor.close()
@@ -2524,12 +2325,12 @@ def create_project_application():
         if active_positions > 0:
             return jsonify({'error': 'Position ID is required. Please select a specific position to apply for.'}), 400
 
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
         # Check if project exists
-        cursor.execute('SELECT id FROM projects WHERE id = ?', (project_id,))
+        cursor.execute('SELECT id, created_by FROM projects WHERE id = ?', (project_id,))
         project = cursor.fetchone()
         if not project:
             return jsonify({'error': 'Project not found'}), 404
@@ -2556,6 +2357,7 @@ def create_project_application():
             INSERT INTO project_applications (project_id, student_id, position_id, message, status, created_at, has_team)
             VALUES (?, ?, ?, ?, ?, datetime('now'), ?)
         ''', (project_id, user_id, position_id, message, 'pending', has_team))
+        user_stats.application_changed(cursor, user_id, project[1], None, 'pending')
 
         conn.commit()
         return jsonify({'message': 'Application submitted successfully', 'position_id': position_id}), 201
@@ -2563,8 +2365,6 @@ def create_project_application():
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Withdraw application (student)
 @app.route('/api/project-applications/<int:project_id>', methods=['DELETE'])
@@ -2572,18 +2372,30 @@ def create_project_application():
 def withdraw_application(project_id):
     user_id = get_user_id_from_jwt()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
         # Find and delete the application
         cursor.execute('''
-            DELETE FROM project_applications 
-            WHERE project_id = ? AND student_id = ?
+            SELECT pa.id, pa.status, p.created_by FROM project_applications pa
+            JOIN projects p ON pa.project_id = p.id
+            WHERE pa.project_id = ? AND pa.student_id = ?
         ''', (project_id, user_id))
+        withdrawn = cursor.fetchall()
         
-        if cursor.rowcount == 0:
+        if not withdrawn:
             return jsonify({'error': 'Application not found'}), 404
+        for application_id, status, owner_id in withdrawn:
+            # Conditional on the status we read, which the counters are adjusted by
+            cursor.execute('''
+                DELETE FROM project_applications 
+                WHERE id = ? AND status IS ?
+            ''', (application_id, status))
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return jsonify({'error': 'Application was handled meanwhile; reload and try again'}), 409
+            user_stats.application_changed(cursor, user_id, owner_id, status, None)
         
         conn.commit()
         return jsonify({'message': 'Application withdrawn successfully'}), 200
@@ -2591,8 +2403,6 @@ def withdraw_application(project_id):
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Accept/Decline project application
 @app.route('/api/project-applications/<int:application_id>/<action>', methods=['POST'])
@@ -2603,13 +2413,13 @@ def handle_project_application(application_id, action):
     if action not in ['accept', 'decline']:
         return jsonify({'error': 'Invalid action'}), 400
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
         # Check if user is an alumni and owns the project
         cursor.execute('''
-            SELECT pa.id, p.created_by, u.role, pa.position_id, pa.status
+            SELECT pa.id, p.created_by, u.role, pa.position_id, pa.status, pa.student_id
             FROM project_applications pa
             JOIN projects p ON pa.project_id = p.id
             JOIN users u ON p.created_by = u.id
@@ -2632,11 +2442,16 @@ def handle_project_application(application_id, action):
         
         # Update application status
         new_status = 'accepted' if action == 'accept' else 'declined'
+        # Conditional on the status we read, so two concurrent accepts cannot both count
         cursor.execute('''
             UPDATE project_applications 
             SET status = ?
-            WHERE id = ?
-        ''', (new_status, application_id))
+            WHERE id = ? AND status IS ?
+        ''', (new_status, application_id, old_status))
+        if cursor.rowcount == 0:
+            conn.rollback()
+            return jsonify({'error': 'Project application was handled meanwhile; reload and try again'}), 409
+        user_stats.application_changed(cursor, application_data[5], user_id, old_status, new_status)
         
         # Update position filled_count if position exists
         if position_id:
@@ -2674,24 +2489,18 @@ def handle_project_application(application_id, action):
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Get alumni's projects
 @app.route('/api/alumni/projects', methods=['GET'])
 @jwt_required()
 def get_alumni_projects():
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is an alumni
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can view their projects'}), 403
         
         # Get alumni's projects
@@ -2722,24 +2531,18 @@ def get_alumni_projects():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Get alumni's blog posts
 @app.route('/api/alumni/blog-posts', methods=['GET'])
 @jwt_required()
 def get_alumni_blog_posts():
-    user_id = get_user_id_from_jwt()
+    user_id, role = current_user()
     
-    conn = sqlite3.connect('launchpad.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # Check if user is an alumni
-        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role[0] != 'alumni':
+        if role != 'alumni':
             return jsonify({'error': 'Only alumni can view their blog posts'}), 403
         
         # Get alumni's blog posts
@@ -2767,93 +2570,108 @@ def get_alumni_blog_posts():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+# Upper bound for ?wait= on the long-poll variants below
+LONG_POLL_MAX_SECONDS = 30
+
+wait_limit = WaitLimit(app.config['MAX_OPEN_STREAMS'])
+
+def wait_for_events(user_id, after_event_id, timeout, match):
+    """Block until an event for user_id newer than after_event_id satisfies
+    match, or timeout seconds pass. Returns whether one arrived.
+
+    The request's database connection goes back to the pool first, so a
+    waiting client never holds one. Raises WaitLimitReached (503) when
+    MAX_OPEN_STREAMS requests are already waiting.
+    """
+    wait_limit.enter()
+    try:
+        db.close_db()
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            events = broker.wait(user_id, after_event_id, remaining)
+            if not events:
+                return False
+            if any(event.type == 'resync' or match(event) for event in events):
+                return True
+            after_event_id = events[-1].id
     finally:
-        conn.close()
+        wait_limit.leave()
 
 # Messaging endpoints
 @app.route('/api/messages/conversations', methods=['GET'])
 @jwt_required()
 def get_conversations():
+    """The user's inbox, most recently active first.
+
+    Long-poll: ?wait=<seconds>&after_event_id=<X-Last-Event-Id of the previous
+    response> blocks until something changes for the user, then returns the
+    inbox, or 204 if the wait ran out.
+    """
     try:
         user_id = get_user_id_from_jwt()
-        conn = sqlite3.connect('launchpad.db')
+        
+        try:
+            wait = min(max(float(request.args.get('wait', 0)), 0), LONG_POLL_MAX_SECONDS)
+            after_event_id = int(request.args['after_event_id']) if 'after_event_id' in request.args else broker.last_id
+        except ValueError:
+            return jsonify({'error': 'wait and after_event_id must be numbers'}), 400
+        if wait and not wait_for_events(user_id, after_event_id, wait, lambda event: event.type in ('message', 'conversation')):
+            return '', 204
+        
+        # Taken before the query so nothing that lands after it is missed
+        last_event_id = broker.last_id
+        conn = get_db()
         cursor = conn.cursor()
         
-        # Get all conversations for the user
+        # Whole inbox in one statement; the last message and the unread count
+        # (messages past the read watermark) both come from the (conversation_id, id) index
         cursor.execute('''
-            SELECT DISTINCT 
-                CASE 
-                    WHEN user1_id = ? THEN user2_id 
-                    ELSE user1_id 
-                END as other_user_id,
-                u.name as other_user_name,
-                u.email as other_user_email,
-                u.role as other_user_role,
-                u.avatar as other_user_avatar
-            FROM conversations c
-            JOIN users u ON u.id = CASE 
-                WHEN c.user1_id = ? THEN c.user2_id 
-                ELSE c.user1_id 
-            END
-            WHERE c.user1_id = ? OR c.user2_id = ?
-            ORDER BY c.updated_at DESC
-        ''', (user_id, user_id, user_id, user_id))
-        
-        conversations = []
-        for row in cursor.fetchall():
-            other_user_id = row[0]
-            other_user_name = row[1]
-            other_user_email = row[2]
-            other_user_role = row[3]
-            other_user_avatar = row[4]
-            
-            # Get last message and unread count
-            cursor.execute('''
-                SELECT content, created_at, is_read
-                FROM messages
-                WHERE (sender_id = ? AND receiver_id = ?) OR (sender_id = ? AND receiver_id = ?)
-                ORDER BY created_at DESC
-                LIMIT 1
-            ''', (user_id, other_user_id, other_user_id, user_id))
-            
-            last_message_data = cursor.fetchone()
-            last_message = last_message_data[0] if last_message_data else None
-            last_message_time = last_message_data[1] if last_message_data else None
-            
-            # Count unread messages
-            cursor.execute('''
-                SELECT COUNT(*) FROM messages
-                WHERE sender_id = ? AND receiver_id = ? AND is_read = 0
-            ''', (other_user_id, user_id))
-            unread_count = cursor.fetchone()[0]
-            
-            # Get the actual conversation ID from database
-            cursor.execute('''
-                SELECT id FROM conversations
-                WHERE (user1_id = ? AND user2_id = ?) OR (user1_id = ? AND user2_id = ?)
-            ''', (user_id, other_user_id, other_user_id, user_id))
-            conversation_data = cursor.fetchone()
-            conversation_id = conversation_data[0] if conversation_data else None
-            
-            conversations.append({
-                'id': conversation_id,
-                'other_user_id': other_user_id,
-                'other_user_name': other_user_name,
-                'other_user_email': other_user_email,
-                'other_user_role': other_user_role,
-                'other_user_avatar': other_user_avatar,
-                'last_message': last_message,
-                'last_message_time': last_message_time,
-                'unread_count': unread_count,
-                'is_online': False  # TODO: Implement online status
-            })
-        
-        return jsonify(conversations), 200
-        
+            WITH mine AS (
+                SELECT c.id,
+                       CASE WHEN c.user1_id = :user_id THEN c.user2_id ELSE c.user1_id END AS other_user_id,
+                       c.updated_at
+                FROM conversations c
+                WHERE c.user1_id = :user_id OR c.user2_id = :user_id
+            )
+            SELECT mine.id, mine.other_user_id, u.name, u.email, u.role, u.avatar,
+                   lm.content, lm.created_at,
+                   (SELECT COUNT(*) FROM messages
+                    WHERE conversation_id = mine.id AND receiver_id = :user_id
+                      AND id > COALESCE((SELECT last_read_message_id FROM conversation_reads
+                                         WHERE conversation_id = mine.id AND user_id = :user_id), 0)) AS unread_count
+            FROM mine
+            JOIN users u ON u.id = mine.other_user_id
+            LEFT JOIN messages lm ON lm.id = (
+                SELECT MAX(id) FROM messages WHERE conversation_id = mine.id
+            )
+            ORDER BY mine.updated_at DESC
+        ''', {'user_id': user_id})
+        
+        rows = cursor.fetchall()
+        online = presence.lookup([row[1] for row in rows])
+        conversations = [{
+            'id': row[0],
+            'other_user_id': row[1],
+            'other_user_name': row[2],
+            'other_user_email': row[3],
+            'other_user_role': row[4],
+            'other_user_avatar': row[5],
+            'last_message': row[6],
+            'last_message_time': row[7],
+            'unread_count': row[8],
+            'is_online': online[row[1]]
+        } for row in rows]
+        
+        return jsonify(conversations), 200, {'X-Last-Event-Id': str(last_event_id)}
+        
+    except WaitLimitReached:
+        raise  # 503 from wait_limit_callback
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/messages/conversations', methods=['POST'])
 @jwt_required()
@@ -2866,7 +2684,7 @@ def create_conversation():
         if not other_user_id:
             return jsonify({'error': 'other_user_id is required'}), 400
         
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Check if conversation already exists
@@ -2888,19 +2706,19 @@ def create_conversation():
         conversation_id = cursor.lastrowid
         conn.commit()
         
+        broker.publish([other_user_id], 'conversation', {'id': conversation_id})
+        
         return jsonify({'id': conversation_id}), 201
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/messages/conversations/<int:conversation_id>', methods=['GET'])
 @jwt_required()
 def get_conversation(conversation_id):
     try:
         user_id = get_user_id_from_jwt()
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Get conversation details
@@ -2934,22 +2752,41 @@ def get_conversation(conversation_id):
             'role': other_user_data[3],
             'department': other_user_data[4],
             'graduation_year': other_user_data[5],
-            'is_online': False  # TODO: Implement online status
+            'is_online': presence.is_online(other_user_data[0])
         }
         
         return jsonify({'other_user': other_user}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+
+MESSAGES_PAGE_SIZE = 50
+MESSAGES_MAX_PAGE_SIZE = 200
+SQLITE_MAX_INTEGER = 2 ** 63 - 1
 
 @app.route('/api/messages/conversations/<int:conversation_id>/messages', methods=['GET'])
 @jwt_required()
 def get_messages(conversation_id):
+    """Messages in a conversation, oldest first.
+
+    ?since_id=N returns only messages newer than N (204 when there are none);
+    adding &wait=<seconds> long-polls for them first. ?limit=&before_id= pages
+    backwards through history. Without any of these the whole thread is
+    returned as before.
+    """
     try:
         user_id = get_user_id_from_jwt()
-        conn = sqlite3.connect('launchpad.db')
+        
+        try:
+            since_id = int(request.args['since_id']) if 'since_id' in request.args else None
+            before_id = int(request.args['before_id']) if 'before_id' in request.args else None
+            limit = min(max(int(request.args.get('limit', MESSAGES_PAGE_SIZE)), 1), MESSAGES_MAX_PAGE_SIZE)
+            wait = min(max(float(request.args.get('wait', 0)), 0), LONG_POLL_MAX_SECONDS)
+        except ValueError:
+            return jsonify({'error': 'since_id, before_id, limit and wait must be numbers'}), 400
+        paginate = since_id is None and ('limit' in request.args or before_id is not None)
+        
+        conn = get_db()
         cursor = conn.cursor()
         
         # Verify user is part of conversation
@@ -2962,37 +2799,141 @@ def get_messages(conversation_id):
             return jsonify({'error': 'Access denied'}), 403
         
         # Get messages
+        if since_id is not None:
+            # Polling: cost depends on what is new, not on the thread length
+            while True:
+                # Taken before the query so a message committed right after it still wakes us
+                after_event_id = broker.last_id
+                cursor.execute('''
+                    SELECT id, sender_id, receiver_id, content, created_at
+                    FROM messages
+                    WHERE conversation_id = ? AND id > ?
+                    ORDER BY id ASC
+                    LIMIT ?
+                ''', (conversation_id, since_id, MESSAGES_MAX_PAGE_SIZE))
+                rows = cursor.fetchall()
+                if rows or not wait or not wait_for_events(
+                        user_id, after_event_id, wait,
+                        lambda event: event.type == 'message' and event.data['conversation_id'] == conversation_id):
+                    break
+                # Woken by a new message: look again, but only wait once per request
+                wait = 0
+                conn = get_db()
+                cursor = conn.cursor()
+        elif paginate:
+            # Newest page first; one extra row tells us whether older ones remain
+            cursor.execute('''
+                SELECT id, sender_id, receiver_id, content, created_at
+                FROM messages
+                WHERE conversation_id = ? AND id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (conversation_id, before_id if before_id is not None else SQLITE_MAX_INTEGER, limit + 1))
+            rows = cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit][::-1]
+        else:
+            cursor.execute('''
+                SELECT id, sender_id, receiver_id, content, created_at
+                FROM messages
+                WHERE conversation_id = ?
+                ORDER BY id ASC
+            ''', (conversation_id,))
+            rows = cursor.fetchall()
+        
+        if since_id is not None and not rows:
+            return '', 204
+        
+        # A message is read once it is at or below its receiver's watermark;
+        # marking read is a separate POST, so this path never writes
         cursor.execute('''
-            SELECT id, sender_id, receiver_id, content, created_at, is_read
-            FROM messages
-            WHERE (sender_id = ? AND receiver_id = ?) OR (sender_id = ? AND receiver_id = ?)
-            ORDER BY created_at ASC
-        ''', (conversation[0], conversation[1], conversation[1], conversation[0]))
+            SELECT user_id, last_read_message_id FROM conversation_reads WHERE conversation_id = ?
+        ''', (conversation_id,))
+        read_up_to = dict(cursor.fetchall())
         
         messages = []
-        for row in cursor.fetchall():
+        for row in rows:
             messages.append({
                 'id': row[0],
                 'sender_id': row[1],
                 'receiver_id': row[2],
                 'content': row[3],
                 'created_at': row[4],
-                'is_read': bool(row[5])
+                'is_read': row[0] <= read_up_to.get(row[2], 0)
             })
         
-        # Mark messages as read
+        if paginate:
+            next_before_id = messages[0]['id'] if has_more else None
+            return jsonify({'messages': messages, 'next_before_id': next_before_id}), 200
+        
+        return jsonify(messages), 200
+        
+    except WaitLimitReached:
+        raise  # 503 from wait_limit_callback
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/messages/conversations/<int:conversation_id>/read', methods=['POST'])
+@jwt_required()
+def mark_conversation_read(conversation_id):
+    """Move the user's read watermark up to message up_to_id (default: the latest)."""
+    try:
+        user_id = get_user_id_from_jwt()
+        data = request.get_json(silent=True) or {}
+        
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        # Verify user is part of conversation
         cursor.execute('''
-            UPDATE messages SET is_read = 1
-            WHERE receiver_id = ? AND is_read = 0
-        ''', (user_id,))
+            SELECT user1_id, user2_id FROM conversations WHERE id = ?
+        ''', (conversation_id,))
+        
+        conversation = cursor.fetchone()
+        if not conversation or user_id not in [conversation[0], conversation[1]]:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        cursor.execute('''
+            SELECT MAX(id) FROM messages WHERE conversation_id = ?
+        ''', (conversation_id,))
+        latest_id = cursor.fetchone()[0] or 0
+        try:
+            up_to_id = min(int(data.get('up_to_id', latest_id)), latest_id)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'up_to_id must be an integer'}), 400
+        
+        cursor.execute('''
+            SELECT last_read_message_id FROM conversation_reads WHERE conversation_id = ? AND user_id = ?
+        ''', (conversation_id, user_id))
+        row = cursor.fetchone()
+        current = row[0] if row else 0
+        
+        # Nothing new to mark: answer without taking the write lock
+        if up_to_id <= current:
+            return jsonify({'conversation_id': conversation_id, 'last_read_message_id': current}), 200
+        
+        cursor.execute('''
+            INSERT INTO conversation_reads (conversation_id, user_id, last_read_message_id, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (conversation_id, user_id) DO UPDATE SET
+                last_read_message_id = excluded.last_read_message_id,
+                updated_at = excluded.updated_at
+            WHERE excluded.last_read_message_id > conversation_reads.last_read_message_id
+        ''', (conversation_id, user_id, up_to_id))
         conn.commit()
         
-        return jsonify(messages), 200
+        # Read receipt for the sender
+        other_user_id = conversation[1] if conversation[0] == user_id else conversation[0]
+        broker.publish([other_user_id], 'read', {
+            'conversation_id': conversation_id,
+            'reader_id': user_id,
+            'up_to_id': up_to_id,
+        })
+        
+        return jsonify({'conversation_id': conversation_id, 'last_read_message_id': up_to_id}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/messages/conversations/<int:conversation_id>/messages', methods=['POST'])
 @jwt_required()
@@ -3005,7 +2946,7 @@ def send_message(conversation_id):
         if not content:
             return jsonify({'error': 'Message content is required'}), 400
         
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Verify user is part of conversation
@@ -3022,9 +2963,9 @@ def send_message(conversation_id):
         
         # Insert message
         cursor.execute('''
-            INSERT INTO messages (sender_id, receiver_id, content, created_at, is_read)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP, 0)
-        ''', (user_id, receiver_id, content))
+            INSERT INTO messages (conversation_id, sender_id, receiver_id, content, created_at, is_read)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, 0)
+        ''', (conversation_id, user_id, receiver_id, content))
         
         message_id = cursor.lastrowid
         
@@ -3051,58 +2992,123 @@ def send_message(conversation_id):
             'is_read': bool(message_data[5])
         }
         
+        broker.publish([user_id, receiver_id], 'message', dict(message, conversation_id=conversation_id))
+        
         return jsonify(message), 201
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+
+SSE_HEARTBEAT_SECONDS = 15
+SSE_RETRY_MS = 3000
+
+def format_sse(event):
+    return f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data)}\n\n"
+
+@app.route('/api/messages/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_messages():
+    """Server-Sent Events: 'message', 'read', 'conversation' and 'resync'.
+
+    EventSource cannot set headers, so the token may also be passed as ?jwt=.
+    Reconnects resume after the Last-Event-ID header (or ?last_event_id=).
+    No database connection is held while the stream is open.
+    """
+    user_id = get_user_id_from_jwt()
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        after_id = int(last_event_id) if last_event_id else broker.last_id
+    except ValueError:
+        return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+    wait_limit.enter()
+    
+    def generate(after_id):
+        yield f'retry: {SSE_RETRY_MS}\n\n'
+        while True:
+            # An open stream keeps the user online
+            presence.touch(user_id)
+            events = broker.wait(user_id, after_id, SSE_HEARTBEAT_SECONDS)
+            if not events:
+                # Comment line keeps proxies from timing out the idle connection
+                yield ': heartbeat\n\n'
+                continue
+            for event in events:
+                yield format_sse(event)
+            after_id = events[-1].id
+    
+    response = Response(generate(after_id), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    # Runs when the client goes away and the server closes the response
+    response.call_on_close(wait_limit.leave)
+    return response
+
+PRESENCE_MAX_IDS = 200
+
+@app.route('/api/presence', methods=['GET'])
+@jwt_required()
+def get_presence():
+    """Online status for ?ids=1,2,3 (at most PRESENCE_MAX_IDS ids)."""
+    get_user_id_from_jwt()
+    try:
+        user_ids = [int(part) for part in request.args.get('ids', '').split(',') if part.strip()]
+    except ValueError:
+        return jsonify({'error': 'ids must be a comma-separated list of integers'}), 400
+    if len(user_ids) > PRESENCE_MAX_IDS:
+        return jsonify({'error': f'At most {PRESENCE_MAX_IDS} ids per request'}), 400
+    
+    online = presence.lookup(user_ids)
+    return jsonify({'presence': {str(user_id): is_online for user_id, is_online in online.items()}}), 200
+
+# Columns the user picker can return; ?fields= / ?view=card pick a subset
+AVAILABLE_USER_FIELDS = {
+    'id': ('id', None),
+    'name': ('name', None),
+    'email': ('email', None),
+    'role': ('role', None),
+    'department': ('department', None),
+    'graduation_year': ('graduation_year', None),
+    'current_company': ('current_company', None),
+    'current_position': ('current_position', None),
+    'location': ('location', None),
+    'bio': ('bio', None),
+    'linkedin': ('linkedin', None),
+    'github': ('github', None),
+    'website': ('website', None),
+    'hall': ('hall', None),
+    'branch': ('branch', None),
+    'avatar': ('avatar', None),
+}
+AVAILABLE_USER_CARD_FIELDS = ['id', 'name', 'role', 'department', 'current_company', 'current_position', 'avatar']
 
 @app.route('/api/messages/available-users', methods=['GET'])
 @jwt_required()
 def get_available_users():
     try:
         user_id = get_user_id_from_jwt()
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
+        try:
+            fields = resolve_fields(AVAILABLE_USER_FIELDS, list(AVAILABLE_USER_FIELDS), AVAILABLE_USER_CARD_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Return all other users regardless of role
-        cursor.execute('''
-            SELECT id, name, email, role, department, graduation_year, 
-                   current_company, current_position, location, bio, 
-                   linkedin, github, website, hall, branch, avatar
+        cursor.execute(f'''
+            SELECT {select_clause(AVAILABLE_USER_FIELDS, fields)}
             FROM users
             WHERE id != ?
             ORDER BY name
         ''', (user_id,))
         
-        users = []
-        for row in cursor.fetchall():
-            users.append({
-                'id': row[0],
-                'name': row[1],
-                'email': row[2],
-                'role': row[3],
-                'department': row[4],
-                'graduation_year': row[5],
-                'current_company': row[6],
-                'current_position': row[7],
-                'location': row[8],
-                'bio': row[9],
-                'linkedin': row[10],
-                'github': row[11],
-                'website': row[12],
-                'hall': row[13],
-                'branch': row[14],
-                'avatar': row[15]
-            })
+        users = [row_to_dict(AVAILABLE_USER_FIELDS, fields, row) for row in cursor.fetchall()]
         
         return jsonify(users), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Blog likes endpoints
 @app.route('/api/blog/<int:post_id>/like', methods=['POST'])
@@ -3110,24 +3116,27 @@ def get_available_users():
 def toggle_blog_like(post_id):
     try:
         user_id = get_user_id_from_jwt()
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
-        # Check if user has already liked this post
-        cursor.execute('SELECT id FROM blog_likes WHERE blog_post_id = ? AND user_id = ?', (post_id, user_id))
-        existing_like = cursor.fetchone()
+        cursor.execute('SELECT id FROM blog_posts WHERE id = ?', (post_id,))
+        if not cursor.fetchone():
+            return jsonify({'error': 'Blog post not found'}), 404
         
-        if existing_like:
-            # Unlike the post
-            cursor.execute('DELETE FROM blog_likes WHERE blog_post_id = ? AND user_id = ?', (post_id, user_id))
+        # Unlike if the user already liked this post, otherwise like it. The counter
+        # only moves when a row really changed, in the same transaction as the row.
+        cursor.execute('DELETE FROM blog_likes WHERE blog_post_id = ? AND user_id = ?', (post_id, user_id))
+        if cursor.rowcount:
+            cursor.execute('UPDATE blog_posts SET likes_count = likes_count - 1 WHERE id = ?', (post_id,))
             action = 'unliked'
         else:
-            # Like the post
-            cursor.execute('INSERT INTO blog_likes (blog_post_id, user_id) VALUES (?, ?)', (post_id, user_id))
+            cursor.execute('INSERT OR IGNORE INTO blog_likes (blog_post_id, user_id) VALUES (?, ?)', (post_id, user_id))
+            if cursor.rowcount:
+                cursor.execute('UPDATE blog_posts SET likes_count = likes_count + 1 WHERE id = ?', (post_id,))
             action = 'liked'
         
         # Get updated likes count
-        cursor.execute('SELECT COUNT(*) FROM blog_likes WHERE blog_post_id = ?', (post_id,))
+        cursor.execute('SELECT likes_count FROM blog_posts WHERE id = ?', (post_id,))
         likes_count = cursor.fetchone()[0]
         
         conn.commit()
@@ -3140,8 +3149,6 @@ def toggle_blog_like(post_id):
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 # Profile picture upload endpoint
 @app.route('/api/profile/upload-picture', methods=['POST'])
@@ -3170,12 +3177,11 @@ def upload_profile_picture():
             file.save(file_path)
             
             # Update user's avatar in database
-            conn = sqlite3.connect('launchpad.db')
+            conn = get_db()
             cursor = conn.cursor()
             
             cursor.execute('UPDATE users SET avatar = ? WHERE id = ?', (unique_filename, user_id))
             conn.commit()
-            conn.close()
             
             return jsonify({
                 'message': 'Profile picture uploaded successfully',
@@ -3208,7 +3214,7 @@ def get_project_highlight_image(project_id, filename):
 def upload_blog_image(post_id):
     user_id = get_user_id_from_jwt()
     try:
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('SELECT author_id, images FROM blog_posts WHERE id = ?', (post_id,))
         row = cursor.fetchone()
@@ -3236,7 +3242,6 @@ def upload_blog_image(post_id):
         images.append(file_url)
         cursor.execute('UPDATE blog_posts SET images = ? WHERE id = ?', (json.dumps(images), post_id))
         conn.commit()
-        conn.close()
         return jsonify({'message': 'Image uploaded', 'url': file_url, 'images': images}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -3255,7 +3260,7 @@ def get_blog_image(post_id, filename):
 def upload_blog_pdf(post_id):
     user_id = get_user_id_from_jwt()
     try:
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('SELECT author_id, pdfs FROM blog_posts WHERE id = ?', (post_id,))
         row = cursor.fetchone()
@@ -3281,7 +3286,6 @@ def upload_blog_pdf(post_id):
         pdfs.append(file_url)
         cursor.execute('UPDATE blog_posts SET pdfs = ? WHERE id = ?', (json.dumps(pdfs), post_id))
         conn.commit()
-        conn.close()
         return jsonify({'message': 'PDF uploaded', 'url': file_url, 'pdfs': pdfs}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -3318,7 +3322,7 @@ def upload_cv():
         file.save(filepath)
         
         # Update user's CV in database
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Get old CV filename to delete it
@@ -3329,7 +3333,6 @@ def upload_cv():
         # Update with new CV
         cursor.execute('UPDATE users SET cv_pdf = ? WHERE id = ?', (filename, user_id))
         conn.commit()
-        conn.close()
         
         # Delete old CV file if it exists
         if old_cv:
@@ -3360,7 +3363,7 @@ def delete_cv():
     user_id = get_user_id_from_jwt()
     
     try:
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Get CV filename
@@ -3378,7 +3381,6 @@ def delete_cv():
             cursor.execute('UPDATE users SET cv_pdf = NULL WHERE id = ?', (user_id,))
             conn.commit()
         
-        conn.close()
         return jsonify({'message': 'CV deleted successfully'}), 200
         
     except Exception as e:
@@ -3391,7 +3393,7 @@ def upload_project_image(project_id):
     user_id = get_user_id_from_jwt()
     
     try:
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Check if user is project creator
@@ -3433,7 +3435,6 @@ def upload_project_image(project_id):
         images.append(file_url)
         cursor.execute('UPDATE projects SET images = ? WHERE id = ?', (json.dumps(images), project_id))
         conn.commit()
-        conn.close()
 
         return jsonify({'message': 'Image uploaded', 'url': file_url, 'images': images}), 200
         
@@ -3446,7 +3447,7 @@ def upload_project_image(project_id):
 def upload_project_highlight_image(project_id):
     user_id = get_user_id_from_jwt()
     try:
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
 
         # Check if user is project creator
@@ -3499,7 +3500,7 @@ def upload_project_jd(project_id):
     user_id = get_user_id_from_jwt()
     
     try:
-        conn = sqlite3.connect('launchpad.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Check if user is project creator
@@ -3535,7 +3536,6 @@ def upload_project_jd(project_id):
         jd_url = f"/api/projects/{project_id}/jd/{unique_filename}"
         cursor.execute('UPDATE projects SET jd_pdf = ? WHERE id = ?', (jd_url, project_id))
         conn.commit()
-        conn.close()
 
         return jsonify({'message': 'JD uploaded', 'jd_pdf': jd_url}), 200
         
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark project recommendation strategies on a synthetic catalogue: the
+default heuristic scorer (recommend.py) against the TF-IDF index (tfidf.py).
+Reports index build time, per-query latency and how much the two top-k
+lists overlap.
+
+Usage: python bench_recommend.py [--projects 5000] [--students 200] [--k 10]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+import tfidf
+from migrate import run_migrations
+from recommend import ProjectRecommender
+
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C', 'C++', 'Go', 'Rust', 'SQL', 'React', 'React Native',
+    'Node.js', 'Django', 'Flask', 'Machine Learning', 'Deep Learning', 'Computer Vision', 'NLP', 'TensorFlow',
+    'PyTorch', 'Data Analysis', 'Embedded Systems', 'IoT', 'MATLAB', 'AutoCAD', 'Robotics', 'ROS', 'Docker',
+    'Kubernetes', 'AWS', 'Blockchain', 'Solidity', 'Figma', 'UI/UX', 'Power Systems', 'VLSI', 'CFD',
+]
+DEPARTMENTS = ['Computer Science', 'Electrical Engineering', 'Mechanical Engineering', 'Civil Engineering',
+               'Chemical Engineering', 'Electronics and Communication', 'Aerospace Engineering']
+FILLER = ['platform', 'system', 'students', 'research', 'prototype', 'scalable', 'real-time', 'analysis',
+          'design', 'optimization', 'campus', 'energy', 'smart', 'monitoring', 'automation', 'tool']
+
+
+def populate(conn, projects, students, seed=7):
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO users (name, email, password_hash, role) VALUES ('Alum', 'alum@x', '-', 'alumni')")
+    alum_id = cursor.lastrowid
+    for i in range(projects):
+        skills = rng.sample(SKILLS, 3)
+        words = rng.sample(FILLER, 6) + rng.sample(SKILLS, 2)
+        cursor.execute('''
+            INSERT INTO projects (title, description, category, status, tags, skills_required, created_by, created_at)
+            VALUES (?, ?, ?, 'active', ?, ?, ?, datetime('now', ?))
+        ''', (' '.join(rng.sample(words, 3)).title(), ' '.join(words * 3), rng.choice(DEPARTMENTS),
+              json.dumps(rng.sample(SKILLS, 2)), json.dumps(skills), alum_id, f'-{i} minutes'))
+    student_ids = []
+    for i in range(students):
+        cursor.execute('''
+            INSERT INTO users (name, email, password_hash, role, department, specialization)
+            VALUES (?, ?, '-', 'student', ?, ?)
+        ''', (f'Student {i}', f's{i}@x', rng.choice(DEPARTMENTS), rng.choice(SKILLS)))
+        student_ids.append(cursor.lastrowid)
+        cursor.executemany('INSERT INTO user_skills (user_id, skill_name) VALUES (?, ?)',
+                           [(cursor.lastrowid, skill) for skill in rng.sample(SKILLS, 4)])
+    conn.commit()
+    return student_ids
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def report(name, build_ms, latencies):
+    if not latencies:
+        print(f"{name:10} build={build_ms:8.1f}ms  p50=n/a  p95=n/a")
+        return
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:10} build={build_ms:8.1f}ms  p50={statistics.median(latencies):7.2f}ms  p95={p95:7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    if tfidf.np is None:
+        raise SystemExit('numpy and scipy are required (pip install numpy scipy)')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        run_migrations(conn)
+        student_ids = populate(conn, args.projects, args.students)
+        cursor = conn.cursor()
+
+        heuristic = ProjectRecommender()
+        _, heuristic_build = timed(lambda: heuristic.rebuild(cursor))
+        path, tfidf_build = timed(lambda: tfidf.build_index(conn, os.path.join(tmp, 'index')))
+        index = tfidf.TfidfIndex(path)
+
+        heuristic_ms, tfidf_ms, overlaps = [], [], []
+        for user_id in student_ids:
+            skills = [row[0] for row in cursor.execute('SELECT skill_name FROM user_skills WHERE user_id = ?', (user_id,))]
+            keywords = [v for v in cursor.execute('SELECT department, specialization, branch FROM users WHERE id = ?',
+                                                  (user_id,)).fetchone() if v]
+            terms = tfidf.student_terms(cursor, user_id)
+
+            by_heuristic, ms = timed(lambda: heuristic.recommend(skills, keywords, limit=args.k))
+            heuristic_ms.append(ms)
+            by_tfidf, ms = timed(lambda: index.top_k(terms, args.k))
+            tfidf_ms.append(ms)
+
+            top_heuristic = {project_id for project_id, _, _ in by_heuristic}
+            top_tfidf = {project_id for project_id, _ in by_tfidf}
+            if top_heuristic:
+                overlaps.append(len(top_heuristic & top_tfidf) / len(top_heuristic))
+        conn.close()
+
+    print(f"{args.projects} projects, {args.students} students, top {args.k}")
+    report('heuristic', heuristic_build, heuristic_ms)
+    report('tfidf', tfidf_build, tfidf_ms)
+    # No students, or none the heuristic found anything for
+    overlap = f"{statistics.mean(overlaps):.0%}" if overlaps else 'n/a'
+    print(f"top-{args.k} overlap: {overlap}")
+
+
+if __name__ == '__main__':
+    main()
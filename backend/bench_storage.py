@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark read throughput while a writer is busy, for two storage profiles:
+the SQLite default (rollback journal, synchronous=FULL) and the WAL profile
+the app applies to every connection.
+
+Usage: python bench_storage.py [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from db import DEFAULT_STORAGE_PROFILE, apply_storage_profile
+
+ROLLBACK_PROFILE = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': DEFAULT_STORAGE_PROFILE['busy_timeout'],
+}
+
+
+def setup(db_path, profile):
+    conn = sqlite3.connect(db_path)
+    apply_storage_profile(conn, profile)
+    conn.execute('''
+        CREATE TABLE messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender_id INTEGER NOT NULL,
+            receiver_id INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany(
+        'INSERT INTO messages (sender_id, receiver_id, content) VALUES (?, ?, ?)',
+        [(i % 50, (i + 1) % 50, 'x' * 200) for i in range(20000)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(profile_name, profile, seconds, readers):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        setup(db_path, profile)
+
+        stop = threading.Event()
+        counts = {'reads': 0, 'writes': 0, 'locked': 0}
+        lock = threading.Lock()
+
+        def writer():
+            conn = sqlite3.connect(db_path)
+            apply_storage_profile(conn, profile)
+            while not stop.is_set():
+                try:
+                    conn.execute('INSERT INTO messages (sender_id, receiver_id, content) VALUES (1, 2, ?)', ('y' * 200,))
+                    conn.commit()
+                    with lock:
+                        counts['writes'] += 1
+                except sqlite3.OperationalError:
+                    with lock:
+                        counts['locked'] += 1
+            conn.close()
+
+        def reader(n):
+            conn = sqlite3.connect(db_path)
+            apply_storage_profile(conn, profile)
+            while not stop.is_set():
+                try:
+                    conn.execute('SELECT id, content FROM messages WHERE id > ? ORDER BY id LIMIT 50', (n * 100,)).fetchall()
+                    with lock:
+                        counts['reads'] += 1
+                except sqlite3.OperationalError:
+                    with lock:
+                        counts['locked'] += 1
+            conn.close()
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        print(f"{profile_name:10} reads/s={counts['reads'] / seconds:10.0f}  "
+              f"writes/s={counts['writes'] / seconds:8.0f}  locked errors={counts['locked']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    run('rollback', ROLLBACK_PROFILE, args.seconds, args.readers)
+    run('wal', DEFAULT_STORAGE_PROFILE, args.seconds, args.readers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Verify blog_posts.likes_count against the rows in blog_likes.
+
+Usage: python check_blog_likes.py [--repair]
+"""
+
+import sqlite3
+import sys
+
+from db import get_db_path
+
+DRIFT_QUERY = '''
+    SELECT b.id, b.likes_count, COUNT(bl.id) AS actual
+    FROM blog_posts b
+    LEFT JOIN blog_likes bl ON bl.blog_post_id = b.id
+    GROUP BY b.id
+    HAVING b.likes_count != COUNT(bl.id)
+'''
+
+
+def find_drift(cursor):
+    """Return (post_id, stored_count, actual_count) for every post whose counter is off."""
+    cursor.execute(DRIFT_QUERY)
+    return cursor.fetchall()
+
+
+def repair(cursor):
+    """Recompute the counter for drifted posts; returns how many were fixed."""
+    drift = find_drift(cursor)
+    cursor.executemany('UPDATE blog_posts SET likes_count = ? WHERE id = ?',
+                       [(actual, post_id) for post_id, _, actual in drift])
+    return len(drift)
+
+
+def main():
+    conn = sqlite3.connect(get_db_path())
+    cursor = conn.cursor()
+    try:
+        if '--repair' in sys.argv:
+            fixed = repair(cursor)
+            conn.commit()
+            print(f"Repaired likes_count on {fixed} post(s)")
+            return 0
+
+        drift = find_drift(cursor)
+        for post_id, stored, actual in drift:
+            print(f"blog post {post_id}: likes_count={stored}, blog_likes rows={actual}")
+        if drift:
+            print(f"{len(drift)} post(s) drifted; run with --repair to fix")
+            return 1
+        print("All likes_count values match blog_likes")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
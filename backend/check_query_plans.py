@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Run EXPLAIN QUERY PLAN over every SQL statement in app.py and fail when one
+of them falls back to a full table scan.
+
+Statements are collected from cursor.execute('...') calls with a literal SQL
+string (dynamically built queries are skipped) and planned against a scratch
+database migrated to the current schema. A plan step like "SCAN messages" on
+one of LARGE_TABLES is a failure; scans that walk an index ("SCAN p USING
+INDEX ...") are fine.
+
+Usage: python check_query_plans.py [path/to/app.py]
+"""
+
+import ast
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from migrate import run_migrations
+
+LARGE_TABLES = {
+    'users', 'projects', 'project_positions', 'project_applications', 'blog_posts',
+    'blog_likes', 'conversations', 'messages', 'mentorship_requests',
+    'user_skills', 'user_achievements', 'user_languages', 'user_stats',
+}
+
+# (function, table) pairs whose scan is inherent to what the endpoint returns
+ALLOWED_SCANS = {
+    ('get_available_users', 'users'): 'lists every user except the caller',
+}
+
+SQL_START = re.compile(r'^\s*(SELECT|UPDATE|DELETE|INSERT|WITH)\b', re.IGNORECASE)
+NAMED_PARAM = re.compile(r':(\w+)')
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SCAN_STEP = re.compile(r'^SCAN (\w+)(.*)$')
+SQL_KEYWORDS = {'where', 'join', 'left', 'inner', 'on', 'order', 'group', 'limit', 'set', 'values', 'select'}
+
+
+def collect_statements(source):
+    """Yield (function name, line number, sql) for each literal execute() call."""
+    tree = ast.parse(source)
+    for func in ast.walk(tree):
+        if not isinstance(func, ast.FunctionDef):
+            continue
+        for node in ast.walk(func):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr == 'execute' and node.args
+                    and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+                sql = node.args[0].value
+                if SQL_START.match(sql):
+                    yield func.name, node.lineno, sql
+
+
+def table_aliases(sql):
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def check(app_path):
+    with open(app_path) as f:
+        statements = list(collect_statements(f.read()))
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'plans.db'))
+        run_migrations(conn)
+        for func_name, lineno, sql in statements:
+            named = NAMED_PARAM.findall(sql)
+            params = dict.fromkeys(named) if named else (None,) * sql.count('?')
+            try:
+                plan = conn.execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+            except sqlite3.Error as e:
+                failures.append(f"{app_path}:{lineno} {func_name}: cannot plan statement ({e})")
+                continue
+            aliases = table_aliases(sql)
+            for step in plan:
+                match = SCAN_STEP.match(step[3])
+                if not match or 'USING' in match.group(2):
+                    continue
+                table = aliases.get(match.group(1), match.group(1))
+                if table in LARGE_TABLES and (func_name, table) not in ALLOWED_SCANS:
+                    failures.append(f"{app_path}:{lineno} {func_name}: full scan of {table}")
+        conn.close()
+
+    print(f"Checked {len(statements)} statements")
+    for failure in failures:
+        print(failure)
+    return not failures
+
+
+if __name__ == '__main__':
+    app_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    sys.exit(0 if check(app_path) else 1)
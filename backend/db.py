@@ -0,0 +1,228 @@
+"""
+SQLite connection handling for the Flask app.
+
+Each worker process keeps a small, bounded pool of connections to
+launchpad.db. Route handlers check a connection out with get_db(); it is
+stored on flask.g and handed back to the pool in teardown_appcontext, so
+handlers never open or close connections themselves.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from flask import g, current_app
+
+
+# PRAGMAs applied to every connection. WAL lets readers keep going while a
+# writer holds the lock; NORMAL sync is safe under WAL (a power cut can only
+# lose the last transactions, never corrupt the file).
+DEFAULT_STORAGE_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,           # ms to wait on a locked database before failing
+    'cache_size': -16000,           # negative = KiB, so ~16MB of page cache
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def storage_profile_from_env():
+    profile = dict(DEFAULT_STORAGE_PROFILE)
+    for key, default in DEFAULT_STORAGE_PROFILE.items():
+        value = os.environ.get(f'SQLITE_{key.upper()}')
+        if value is not None:
+            profile[key] = int(value) if isinstance(default, int) else value
+    return profile
+
+
+def apply_storage_profile(conn, profile):
+    for key, value in profile.items():
+        conn.execute(f'PRAGMA {key} = {value}')
+
+
+def get_db_path():
+    if os.environ.get("RENDER") == "true":  # Running on Render
+        base_dir = os.environ.get("RENDER_DATA_DIR", ".")
+        return os.path.join(base_dir, "launchpad.db")
+    return "launchpad.db"  # Local development
+
+
+class PoolExhausted(Exception):
+    """No connection became free within the checkout timeout."""
+
+
+class ConnectionPool:
+    def __init__(self, db_path, size=8, timeout=5.0, health_check_after=30.0, profile=None):
+        self.db_path = db_path
+        self.profile = profile or {}
+        self.size = size
+        self.timeout = timeout
+        # Connections idle for longer than this are pinged before reuse
+        self.health_check_after = health_check_after
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'exhausted': 0,
+            'connections_opened': 0,
+            'connections_discarded': 0,
+            'checkpoints': 0,
+            'last_checkpoint': None,
+        }
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        apply_storage_profile(conn, self.profile)
+        with self._lock:
+            self.stats['connections_opened'] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._open -= 1
+            self.stats['connections_discarded'] += 1
+
+    def _is_healthy(self, conn):
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self):
+        with self._lock:
+            self.stats['checkouts'] += 1
+
+        try:
+            conn, idle_since = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._open < self.size
+                if can_open:
+                    self._open += 1
+            if can_open:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+
+            # Pool is at capacity: wait for another request to return one
+            with self._lock:
+                self.stats['waits'] += 1
+            try:
+                conn, idle_since = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self.stats['exhausted'] += 1
+                raise PoolExhausted(f'No database connection available after {self.timeout}s')
+
+        if time.monotonic() - idle_since > self.health_check_after and not self._is_healthy(conn):
+            self._discard(conn)
+            with self._lock:
+                self._open += 1
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+        return conn
+
+    def release(self, conn):
+        try:
+            # Anything the handler left uncommitted is thrown away, same as close()
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def checkpoint(self):
+        # Uses its own short-lived connection so it never competes for a pooled one
+        conn = sqlite3.connect(self.db_path)
+        try:
+            apply_storage_profile(conn, self.profile)
+            busy, wal_pages, checkpointed = conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+        finally:
+            conn.close()
+        with self._lock:
+            self.stats['checkpoints'] += 1
+            self.stats['last_checkpoint'] = {
+                'busy': busy,
+                'wal_pages': wal_pages,
+                'checkpointed_pages': checkpointed,
+            }
+
+    def start_checkpointer(self, interval):
+        """Run a PASSIVE WAL checkpoint every `interval` seconds on a daemon thread.
+
+        SQLite's automatic checkpoint only fires on commit, so a burst of writes
+        followed by read-only traffic leaves a large WAL that every reader has to
+        scan. The passive mode never blocks readers or writers.
+        """
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.checkpoint()
+                except sqlite3.Error as e:
+                    print(f"WARNING: WAL checkpoint failed: {e}")
+
+        threading.Thread(target=run, name='sqlite-checkpoint', daemon=True).start()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, size=self.size, open=self._open, idle=self._idle.qsize())
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool, _pool_pid
+    # gunicorn forks workers; every process builds its own pool
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                config = current_app.config
+                _pool = ConnectionPool(
+                    config['DATABASE'],
+                    size=config['DB_POOL_SIZE'],
+                    timeout=config['DB_POOL_TIMEOUT'],
+                    profile=config['SQLITE_PROFILE'],
+                )
+                _pool_pid = os.getpid()
+                if config['SQLITE_PROFILE'].get('journal_mode', '').upper() == 'WAL' and config['SQLITE_CHECKPOINT_INTERVAL'] > 0:
+                    _pool.start_checkpointer(config['SQLITE_CHECKPOINT_INTERVAL'])
+    return _pool
+
+
+def get_db():
+    if 'db' not in g:
+        g.db = get_pool().acquire()
+    return g.db
+
+
+def close_db(exception=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool().release(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
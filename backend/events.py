@@ -0,0 +1,130 @@
+"""
+In-process pub/sub for chat events (new messages, read receipts, new
+conversations), consumed by the /api/messages/stream SSE endpoint.
+
+Every event gets an id from one global counter and is kept in a short
+per-user ring buffer, so a client reconnecting with Last-Event-ID receives
+what it missed. If it fell further behind than the buffer reaches, it gets a
+single 'resync' event and should refetch.
+
+The counter starts at the process start time in microseconds, so ids keep
+increasing across restarts and deploys. An id from before this process
+started (or one this process never issued) also gets 'resync': whatever
+happened while the client was connected elsewhere is not in the buffer.
+
+State lives in process memory: publishers and subscribers must share a
+worker process (see gunicorn.conf.py).
+"""
+
+import collections
+import threading
+import time
+
+
+def epoch_event_id():
+    return int(time.time() * 1_000_000)
+
+
+RECENT_EVENTS_PER_USER = 100
+
+Event = collections.namedtuple('Event', ['id', 'type', 'data'])
+
+
+class EventBroker:
+    def __init__(self, history=RECENT_EVENTS_PER_USER, first_id=None):
+        self.history = history
+        self._lock = threading.Lock()
+        # Ids issued by this process are all greater than _first_id
+        self._first_id = epoch_event_id() if first_id is None else first_id
+        self._last_id = self._first_id
+        self._recent = {}       # user_id -> deque of Event
+        self._evicted = {}      # user_id -> id of the newest event dropped from the buffer
+        self._conditions = {}   # user_id -> Condition sharing self._lock
+
+    @property
+    def last_id(self):
+        with self._lock:
+            return self._last_id
+
+    def _condition(self, user_id):
+        condition = self._conditions.get(user_id)
+        if condition is None:
+            condition = self._conditions[user_id] = threading.Condition(self._lock)
+        return condition
+
+    def publish(self, user_ids, event_type, data):
+        """Deliver one event to each of user_ids; returns its id."""
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, event_type, data)
+            for user_id in set(user_ids):
+                recent = self._recent.get(user_id)
+                if recent is None:
+                    recent = self._recent[user_id] = collections.deque(maxlen=self.history)
+                if len(recent) == recent.maxlen:
+                    self._evicted[user_id] = recent[0].id
+                recent.append(event)
+                self._condition(user_id).notify_all()
+            return event.id
+
+    def _events_after(self, user_id, after_id):
+        # From before this process started, never issued, or already out of the buffer
+        evicted = self._evicted.get(user_id, 0)
+        if not self._first_id <= after_id <= self._last_id or after_id < evicted:
+            return [Event(self._last_id, 'resync', {})]
+        return [event for event in self._recent.get(user_id, ()) if event.id > after_id]
+
+    def wait(self, user_id, after_id, timeout):
+        """Events for user_id newer than after_id, blocking up to timeout seconds.
+
+        Returns an empty list if nothing arrived in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            condition = self._condition(user_id)
+            while True:
+                events = self._events_after(user_id, after_id)
+                if events:
+                    return events
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                condition.wait(remaining)
+
+
+class WaitLimitReached(Exception):
+    """Every slot for blocking requests is taken."""
+
+
+class WaitLimit:
+    """Caps how many requests block on the broker at once.
+
+    Each open stream or pending long-poll holds a server thread for its
+    whole life; past the cap new ones are turned away so the remaining
+    threads stay free for ordinary requests. A limit of 0 means no cap
+    (e.g. under gevent, where waiting costs a greenlet, not a thread).
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._open = 0
+        self._rejected = 0
+
+    def enter(self):
+        with self._lock:
+            if self.limit and self._open >= self.limit:
+                self._rejected += 1
+                raise WaitLimitReached()
+            self._open += 1
+
+    def leave(self):
+        with self._lock:
+            self._open -= 1
+
+    def snapshot(self):
+        with self._lock:
+            return {'limit': self.limit, 'open': self._open, 'rejected': self._rejected}
+
+
+broker = EventBroker()
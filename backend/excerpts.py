@@ -0,0 +1,29 @@
+"""
+Plain-text excerpts for list cards.
+
+Blog content comes from the rich text editor (HTML) or seed data
+(markdown), project descriptions are free text. Excerpts are computed once
+when a row is written and stored next to the full text, so card views can
+select a short column instead of the whole body.
+"""
+
+import html
+import re
+
+EXCERPT_LENGTH = 200
+
+_TAG = re.compile(r'<[^>]+>')
+_MARKDOWN = re.compile(r'[#*_`>]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    if not text:
+        return ''
+    plain = html.unescape(_TAG.sub(' ', text))
+    plain = _WHITESPACE.sub(' ', _MARKDOWN.sub('', plain)).strip()
+    if len(plain) <= length:
+        return plain
+    # Cut on a word boundary
+    cut = plain[:length].rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:') + '...'
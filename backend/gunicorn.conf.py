@@ -0,0 +1,29 @@
+"""
+Gunicorn settings, loaded automatically by `gunicorn app:app` from this directory.
+
+/api/messages/stream keeps one request open per connected client, and the
+event broker (events.py) lives in process memory, so we run a single worker
+process and get concurrency inside it:
+
+- gthread (default): one thread per open request. At most
+  MAX_OPEN_STREAMS (default 24) of the threads are given to streams and
+  long-polls; past that they get 503 and the client polls instead, so
+  the remaining threads always serve ordinary requests. Raise both
+  GUNICORN_THREADS and MAX_OPEN_STREAMS for more.
+- gevent: GUNICORN_WORKER_CLASS=gevent (after `pip install gevent`) holds
+  thousands of idle streams cheaply, one greenlet each; set
+  MAX_OPEN_STREAMS=0 to lift the cap.
+
+Password hashing is CPU-bound and runs in a separate process pool
+(hashing.py, PASSWORD_HASH_WORKERS), so it never holds these threads.
+"""
+
+import os
+
+workers = 1
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 2000))
+
+# Streams send a heartbeat every 15s; keep idle keep-alive sockets around a little longer
+keepalive = 20
@@ -0,0 +1,183 @@
+"""
+Password hashing off the request thread.
+
+generate_password_hash / check_password_hash burn tens to hundreds of ms of
+CPU each. Run inline, a burst of logins pins the worker's threads (and the
+GIL) and every other endpoint stalls behind them. Instead the app process
+hands hashing to a small process pool:
+
+- PASSWORD_HASH_WORKERS processes do the hashing (0 hashes inline on the
+  request thread, still behind the admission limit);
+- at most PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE hashes are in flight.
+  Beyond that, or when a result takes longer than PASSWORD_HASH_TIMEOUT
+  seconds, HashPoolBusy is raised and the app answers 503 with Retry-After
+  straight away instead of queueing more work it cannot finish.
+
+Workers are started with spawn, which re-imports the launching script:
+anything that imports app and logs users in from its top level needs an
+`if __name__ == '__main__':` guard, or should set PASSWORD_HASH_WORKERS=0.
+
+Time spent waiting for hashes is added to g.hash_seconds so the per-route
+metrics (metrics.py) can report it.
+
+The method and cost come from PASSWORD_HASH_METHOD (any werkzeug method
+string, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000') or else from
+PASSWORD_HASH_PROFILE: 'default' keeps werkzeug's own default, 'fast' is
+for tests and seeding synthetic data. `python tune_password_hash.py` picks
+a cost for a target latency on the host. Stored hashes made with other
+parameters keep working and are replaced on the user's next login.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import g, current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+HASH_PROFILES = {
+    'default': f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}',  # what generate_password_hash() picks on werkzeug 2.3
+    'fast': 'pbkdf2:sha256:1000',  # tests and seed data only; upgraded on the first real login
+}
+SCRYPT_DEFAULTS = (2 ** 15, 8, 1)
+
+
+def canonical_method(method):
+    """The method string werkzeug stores in front of the salt, e.g. 'pbkdf2' -> 'pbkdf2:sha256:600000'."""
+    name, *args = method.split(':')
+    if name == 'pbkdf2' and len(args) <= 2:
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    if name == 'scrypt' and len(args) in (0, 3):
+        n, r, p = map(int, args) if args else SCRYPT_DEFAULTS
+        return f'scrypt:{n}:{r}:{p}'
+    raise ValueError(f'Unsupported password hash method: {method!r}')
+
+
+def method_from_env():
+    method = os.environ.get('PASSWORD_HASH_METHOD')
+    if not method:
+        profile = os.environ.get('PASSWORD_HASH_PROFILE', 'default')
+        if profile not in HASH_PROFILES:
+            raise ValueError(f"PASSWORD_HASH_PROFILE must be one of {', '.join(HASH_PROFILES)}, not {profile!r}")
+        method = HASH_PROFILES[profile]
+    return canonical_method(method)
+
+
+def needs_rehash(password_hash, method):
+    """True when password_hash was made with other parameters than method."""
+    return password_hash.split('$', 1)[0] != canonical_method(method)
+
+
+class HashPoolBusy(Exception):
+    """Too many password hashes in flight, or one took too long."""
+
+
+class HashPool:
+    def __init__(self, workers=2, queue=8, timeout=10.0):
+        self.workers = workers
+        self.limit = max(workers, 1) + queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.limit)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {'submitted': 0, 'rejected': 0, 'timeouts': 0, 'restarts': 0}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the app process has threads (pool checkpointer, streams)
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats['rejected'] += 1
+            raise HashPoolBusy()
+        with self._lock:
+            self.stats['submitted'] += 1
+            self._in_flight += 1
+
+        if self.workers == 0:
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            self._release()
+            self._restart()
+            raise
+        # The slot stays taken until the hash actually finishes, even if we stop waiting
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.stats['timeouts'] += 1
+            raise HashPoolBusy()
+        except BrokenProcessPool:
+            self._restart()
+            raise
+
+    def _restart(self):
+        with self._lock:
+            broken, self._executor = self._executor, None
+            self.stats['restarts'] += 1
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, workers=self.workers, limit=self.limit, in_flight=self._in_flight)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_hash_pool():
+    global _pool, _pool_pid
+    # One pool per process, sized for the single gunicorn worker (gunicorn.conf.py);
+    # the pid check only matters if the process forks after first use
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                config = current_app.config
+                _pool = HashPool(
+                    workers=config['PASSWORD_HASH_WORKERS'],
+                    queue=config['PASSWORD_HASH_QUEUE'],
+                    timeout=config['PASSWORD_HASH_TIMEOUT'],
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    try:
+        return get_hash_pool().run(fn, *args)
+    finally:
+        g.hash_seconds = g.get('hash_seconds', 0.0) + time.perf_counter() - started
+
+
+def hash_password(password):
+    return _timed(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def verify_password(password_hash, password):
+    return _timed(check_password_hash, password_hash, password)
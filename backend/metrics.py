@@ -0,0 +1,68 @@
+"""
+Per-route request latency, reported by /api/health.
+
+Each route (method plus URL rule, e.g. "POST /api/auth/login") keeps
+counters and the last SAMPLE_SIZE latencies, from which p50/p95 are taken.
+Routes that hash passwords also report how much of that time was spent
+waiting on the hash pool (hashing.py). Per process, like the pools.
+"""
+
+import collections
+import statistics
+import threading
+
+SAMPLE_SIZE = 512
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def summarize(samples):
+    values = sorted(samples)
+    return {
+        'p50_ms': round(statistics.median(values) * 1000, 2),
+        'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+        'max_ms': round(values[-1] * 1000, 2),
+    }
+
+
+class RouteMetrics:
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, route, status, seconds, hash_seconds=None):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {
+                    'count': 0,
+                    'errors': 0,     # 5xx
+                    'rejected': 0,   # 429/503: shed under load
+                    'latency': collections.deque(maxlen=self.sample_size),
+                    'hash': collections.deque(maxlen=self.sample_size),
+                }
+            entry['count'] += 1
+            if status in (429, 503):
+                entry['rejected'] += 1
+            elif status >= 500:
+                entry['errors'] += 1
+            entry['latency'].append(seconds)
+            if hash_seconds is not None:
+                entry['hash'].append(hash_seconds)
+
+    def snapshot(self):
+        with self._lock:
+            routes = {route: (entry['count'], entry['errors'], entry['rejected'], list(entry['latency']), list(entry['hash']))
+                      for route, entry in self._routes.items()}
+        report = {}
+        for route, (count, errors, rejected, latency, hashing) in sorted(routes.items()):
+            report[route] = dict(summarize(latency), count=count, errors=errors, rejected=rejected)
+            if hashing:
+                report[route]['hash'] = summarize(hashing)
+        return report
+
+
+route_metrics = RouteMetrics()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for launchpad.db.
+
+Migrations live in migrations/NNNN_description.py and each defines
+upgrade(cursor). Applied versions are recorded in the schema_version table;
+every pending migration runs in its own transaction together with its
+schema_version row, so a failed migration leaves nothing half-applied.
+
+Usage: python migrate.py
+"""
+
+import importlib
+import os
+import re
+import sqlite3
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+def discover_migrations():
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), filename[:-3]))
+    return sorted(migrations)
+
+
+def current_version(conn):
+    try:
+        row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:  # no schema_version table yet
+        return 0
+    return row[0] or 0
+
+
+def column_exists(cursor, table, column):
+    cursor.execute(f'PRAGMA table_info({table})')
+    return any(row[1] == column for row in cursor.fetchall())
+
+
+def add_column(cursor, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN, skipped when the column is already there."""
+    if not column_exists(cursor, table, column):
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+def run_migrations(conn):
+    """Bring the schema up to date; returns the list of versions applied."""
+    migrations = discover_migrations()
+    latest = migrations[-1][0] if migrations else 0
+
+    # Fast path for every boot after the first: one lookup, nothing to do
+    if current_version(conn) >= latest:
+        return []
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.commit()
+
+    applied = []
+    for version, name in migrations:
+        # BEGIN IMMEDIATE serializes concurrent runners; re-check once we hold the lock
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if current_version(conn) >= version:
+                conn.rollback()
+                continue
+            module = importlib.import_module(f'migrations.{name}')
+            cursor = conn.cursor()
+            module.upgrade(cursor)
+            cursor.execute('INSERT INTO schema_version (version, name) VALUES (?, ?)', (version, name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Applied migration {name}")
+        applied.append(version)
+    return applied
+
+
+if __name__ == '__main__':
+    from app import init_db
+    init_db()
+    print("Schema is up to date")
@@ -0,0 +1,267 @@
+"""
+Baseline schema.
+
+Creates every table on a fresh database. Databases created before the
+migration runner may be missing columns that used to be added by the
+ALTER TABLE cascade in init_db, so those are added here when absent.
+"""
+
+from migrate import add_column
+
+
+def upgrade(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL CHECK (role IN ('student', 'alumni')),
+            graduation_year INTEGER,
+            department TEXT,
+            hall TEXT,
+            branch TEXT,
+            bio TEXT,
+            current_company TEXT,
+            current_position TEXT,
+            location TEXT,
+            work_preference TEXT CHECK (work_preference IN ('onsite', 'remote', 'hybrid')),
+            phone TEXT,
+            website TEXT,
+            linkedin TEXT,
+            github TEXT,
+            avatar TEXT,
+            years_of_experience INTEGER,
+            domain TEXT,
+            tech_skills TEXT,
+            program TEXT,
+            cv_pdf TEXT,
+            joining_year INTEGER,
+            institute TEXT,
+            specialization TEXT,
+            past_projects TEXT,
+            is_available BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    for column, definition in [
+        ('hall', 'TEXT'),
+        ('branch', 'TEXT'),
+        ('bio', 'TEXT'),
+        ('current_company', 'TEXT'),
+        ('current_position', 'TEXT'),
+        ('location', 'TEXT'),
+        ('work_preference', 'TEXT'),
+        ('phone', 'TEXT'),
+        ('website', 'TEXT'),
+        ('linkedin', 'TEXT'),
+        ('github', 'TEXT'),
+        ('avatar', 'TEXT'),
+        ('years_of_experience', 'INTEGER'),
+        ('domain', 'TEXT'),
+        ('tech_skills', 'TEXT'),
+        ('program', 'TEXT'),
+        ('cv_pdf', 'TEXT'),
+        ('joining_year', 'INTEGER'),
+        ('institute', 'TEXT'),
+        ('specialization', 'TEXT'),
+        ('past_projects', 'TEXT'),
+        ('is_available', 'BOOLEAN DEFAULT 1'),
+    ]:
+        add_column(cursor, 'users', column, definition)
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            category TEXT NOT NULL,
+            status TEXT NOT NULL CHECK (status IN ('active', 'completed', 'paused')),
+            team_members TEXT,
+            tags TEXT,
+            stipend INTEGER,
+            duration TEXT,
+            skills_required TEXT,
+            location TEXT,
+            work_type TEXT CHECK (work_type IN ('remote', 'onsite', 'hybrid')),
+            is_recruiting BOOLEAN DEFAULT 1,
+            images TEXT,
+            project_links TEXT,
+            jd_pdf TEXT,
+            contact_details TEXT,
+            team_roles TEXT,
+            partners TEXT,
+            funding TEXT,
+            highlights TEXT,
+            created_by INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users (id)
+        )
+    ''')
+    for column, definition in [
+        ('stipend', 'INTEGER'),
+        ('duration', 'TEXT'),
+        ('skills_required', 'TEXT'),
+        ('location', 'TEXT'),
+        ('work_type', 'TEXT'),
+        ('is_recruiting', 'BOOLEAN DEFAULT 1'),
+        ('images', 'TEXT'),
+        ('project_links', 'TEXT'),
+        ('jd_pdf', 'TEXT'),
+        ('contact_details', 'TEXT'),
+        ('team_roles', 'TEXT'),
+        ('partners', 'TEXT'),
+        ('funding', 'TEXT'),
+        ('highlights', 'TEXT'),
+    ]:
+        add_column(cursor, 'projects', column, definition)
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS blog_posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            category TEXT,
+            author_id INTEGER,
+            images TEXT,
+            pdfs TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (author_id) REFERENCES users (id)
+        )
+    ''')
+    add_column(cursor, 'blog_posts', 'images', 'TEXT')
+    add_column(cursor, 'blog_posts', 'pdfs', 'TEXT')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user1_id INTEGER NOT NULL,
+            user2_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user1_id) REFERENCES users (id),
+            FOREIGN KEY (user2_id) REFERENCES users (id),
+            UNIQUE(user1_id, user2_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender_id INTEGER NOT NULL,
+            receiver_id INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_read INTEGER DEFAULT 0,
+            FOREIGN KEY (sender_id) REFERENCES users (id),
+            FOREIGN KEY (receiver_id) REFERENCES users (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS blog_likes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            blog_post_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (blog_post_id) REFERENCES blog_posts (id),
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(blog_post_id, user_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS mentorship_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            alumni_id INTEGER NOT NULL,
+            message TEXT,
+            status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'accepted', 'declined')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES users (id),
+            FOREIGN KEY (alumni_id) REFERENCES users (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_positions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            required_skills TEXT,
+            count INTEGER DEFAULT 1,
+            filled_count INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT 1,
+            stipend INTEGER,
+            duration TEXT,
+            location TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects (id)
+        )
+    ''')
+    add_column(cursor, 'project_positions', 'stipend', 'INTEGER')
+    add_column(cursor, 'project_positions', 'duration', 'TEXT')
+    add_column(cursor, 'project_positions', 'location', 'TEXT')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            project_id INTEGER NOT NULL,
+            position_id INTEGER,
+            message TEXT,
+            status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'accepted', 'declined')),
+            feedback TEXT,
+            completed_at TIMESTAMP,
+            is_completed BOOLEAN DEFAULT 0,
+            has_team BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES users (id),
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            FOREIGN KEY (position_id) REFERENCES project_positions (id)
+        )
+    ''')
+    add_column(cursor, 'project_applications', 'position_id', 'INTEGER REFERENCES project_positions(id)')
+    add_column(cursor, 'project_applications', 'feedback', 'TEXT')
+    add_column(cursor, 'project_applications', 'completed_at', 'TIMESTAMP')
+    add_column(cursor, 'project_applications', 'is_completed', 'BOOLEAN DEFAULT 0')
+    add_column(cursor, 'project_applications', 'has_team', 'BOOLEAN DEFAULT 0')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            skill_name TEXT NOT NULL,
+            skill_type TEXT DEFAULT 'technical' CHECK (skill_type IN ('technical', 'soft', 'language')),
+            proficiency_level TEXT DEFAULT 'intermediate' CHECK (proficiency_level IN ('beginner', 'intermediate', 'advanced', 'expert')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_achievements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            achievement_type TEXT DEFAULT 'award' CHECK (achievement_type IN ('award', 'certification', 'project', 'publication', 'other')),
+            date_earned DATE,
+            issuer TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_languages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            language_name TEXT NOT NULL,
+            proficiency_level TEXT DEFAULT 'intermediate' CHECK (proficiency_level IN ('beginner', 'intermediate', 'advanced', 'native')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
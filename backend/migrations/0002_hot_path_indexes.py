@@ -0,0 +1,34 @@
+"""
+Secondary indexes for the columns the API filters, joins and sorts on.
+
+Lookups that are already served by a UNIQUE constraint's automatic index
+(users.email, blog_likes(blog_post_id, user_id), conversations(user1_id,
+user2_id)) are not duplicated here. Run check_query_plans.py after adding
+a query to make sure it is covered.
+"""
+
+INDEXES = [
+    ('idx_users_role_name', 'users (role, name)'),
+    ('idx_projects_created_at', 'projects (created_at)'),
+    ('idx_projects_status_created_at', 'projects (status, created_at)'),
+    ('idx_projects_created_by_status', 'projects (created_by, status, created_at)'),
+    ('idx_project_positions_project', 'project_positions (project_id)'),
+    ('idx_project_applications_student_project', 'project_applications (student_id, project_id)'),
+    ('idx_project_applications_project_created', 'project_applications (project_id, created_at)'),
+    ('idx_project_applications_position_status', 'project_applications (position_id, status)'),
+    ('idx_blog_posts_created_at', 'blog_posts (created_at)'),
+    ('idx_blog_posts_author_created', 'blog_posts (author_id, created_at)'),
+    ('idx_mentorship_requests_alumni_status', 'mentorship_requests (alumni_id, status)'),
+    ('idx_mentorship_requests_student_alumni', 'mentorship_requests (student_id, alumni_id)'),
+    ('idx_conversations_user2', 'conversations (user2_id)'),
+    ('idx_messages_sender_receiver_created', 'messages (sender_id, receiver_id, created_at)'),
+    ('idx_messages_receiver_read', 'messages (receiver_id, is_read)'),
+    ('idx_user_skills_user', 'user_skills (user_id)'),
+    ('idx_user_achievements_user', 'user_achievements (user_id)'),
+    ('idx_user_languages_user', 'user_languages (user_id)'),
+]
+
+
+def upgrade(cursor):
+    for name, target in INDEXES:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
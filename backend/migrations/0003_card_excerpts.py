@@ -0,0 +1,19 @@
+"""
+Store card excerpts for blog posts and projects, computed at write time.
+"""
+
+from excerpts import make_excerpt
+from migrate import add_column
+
+
+def upgrade(cursor):
+    add_column(cursor, 'blog_posts', 'excerpt', 'TEXT')
+    add_column(cursor, 'projects', 'excerpt', 'TEXT')
+
+    cursor.execute('SELECT id, content FROM blog_posts')
+    rows = [(make_excerpt(content), post_id) for post_id, content in cursor.fetchall()]
+    cursor.executemany('UPDATE blog_posts SET excerpt = ? WHERE id = ?', rows)
+
+    cursor.execute('SELECT id, description FROM projects')
+    rows = [(make_excerpt(description), project_id) for project_id, description in cursor.fetchall()]
+    cursor.executemany('UPDATE projects SET excerpt = ? WHERE id = ?', rows)
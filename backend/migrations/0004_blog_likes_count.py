@@ -0,0 +1,13 @@
+"""
+Denormalized like counter on blog_posts, kept in sync by toggle_blog_like.
+"""
+
+from migrate import add_column
+
+
+def upgrade(cursor):
+    add_column(cursor, 'blog_posts', 'likes_count', 'INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('''
+        UPDATE blog_posts
+        SET likes_count = (SELECT COUNT(*) FROM blog_likes bl WHERE bl.blog_post_id = blog_posts.id)
+    ''')
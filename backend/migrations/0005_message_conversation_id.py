@@ -0,0 +1,38 @@
+"""
+Link every message to its conversation so thread reads can use an index on
+(conversation_id, id) instead of matching the sender/receiver pair both ways.
+"""
+
+from migrate import add_column
+
+
+def upgrade(cursor):
+    add_column(cursor, 'messages', 'conversation_id', 'INTEGER REFERENCES conversations (id)')
+
+    # Messages sent before conversations existed may have no row to point at
+    cursor.execute('''
+        INSERT OR IGNORE INTO conversations (user1_id, user2_id, created_at, updated_at)
+        SELECT MIN(m.sender_id, m.receiver_id), MAX(m.sender_id, m.receiver_id),
+               MIN(m.created_at), MAX(m.created_at)
+        FROM messages m
+        WHERE NOT EXISTS (
+            SELECT 1 FROM conversations c
+            WHERE (c.user1_id = m.sender_id AND c.user2_id = m.receiver_id)
+               OR (c.user1_id = m.receiver_id AND c.user2_id = m.sender_id)
+        )
+        GROUP BY MIN(m.sender_id, m.receiver_id), MAX(m.sender_id, m.receiver_id)
+    ''')
+
+    cursor.execute('''
+        UPDATE messages
+        SET conversation_id = (
+            SELECT c.id FROM conversations c
+            WHERE (c.user1_id = messages.sender_id AND c.user2_id = messages.receiver_id)
+               OR (c.user1_id = messages.receiver_id AND c.user2_id = messages.sender_id)
+            ORDER BY c.id
+            LIMIT 1
+        )
+        WHERE conversation_id IS NULL
+    ''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (conversation_id, id)')
@@ -0,0 +1,38 @@
+"""
+Per-conversation read watermarks: a message is read once its id is at or
+below the receiver's last_read_message_id. Replaces flipping messages.is_read
+row by row; the column stays for old rows but is no longer consulted.
+"""
+
+
+def upgrade(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS conversation_reads (
+            conversation_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            last_read_message_id INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (conversation_id, user_id),
+            FOREIGN KEY (conversation_id) REFERENCES conversations (id),
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        ) WITHOUT ROWID
+    ''')
+
+    # Everything before a participant's oldest unread message counts as read
+    cursor.execute('''
+        INSERT OR IGNORE INTO conversation_reads (conversation_id, user_id, last_read_message_id)
+        SELECT p.conversation_id, p.user_id, COALESCE(
+            (SELECT MIN(m.id) - 1 FROM messages m
+             WHERE m.conversation_id = p.conversation_id AND m.receiver_id = p.user_id AND m.is_read = 0),
+            (SELECT MAX(m.id) FROM messages m WHERE m.conversation_id = p.conversation_id),
+            0
+        )
+        FROM (
+            SELECT id AS conversation_id, user1_id AS user_id FROM conversations
+            UNION
+            SELECT id, user2_id FROM conversations
+        ) p
+    ''')
+
+    # Only the old per-row unread lookups used this
+    cursor.execute('DROP INDEX IF EXISTS idx_messages_receiver_read')
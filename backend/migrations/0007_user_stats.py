@@ -0,0 +1,45 @@
+"""
+Per-user dashboard counters, kept up to date by the write endpoints through
+user_stats.py so the dashboard endpoints read one row instead of counting.
+"""
+
+
+def upgrade(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INTEGER PRIMARY KEY,
+            active_projects INTEGER NOT NULL DEFAULT 0,
+            total_projects INTEGER NOT NULL DEFAULT 0,
+            mentees INTEGER NOT NULL DEFAULT 0,
+            blog_posts INTEGER NOT NULL DEFAULT 0,
+            pending_mentorship_requests INTEGER NOT NULL DEFAULT 0,
+            pending_project_applications INTEGER NOT NULL DEFAULT 0,
+            applied_projects INTEGER NOT NULL DEFAULT 0,
+            accepted_projects INTEGER NOT NULL DEFAULT 0,
+            pending_applications INTEGER NOT NULL DEFAULT 0,
+            mentorship_requests INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    # Same counts as user_stats.rebuild(), frozen at this schema version
+    cursor.execute('''
+        INSERT OR REPLACE INTO user_stats (
+            user_id, active_projects, total_projects, mentees, blog_posts, pending_mentorship_requests,
+            pending_project_applications, applied_projects, accepted_projects, pending_applications,
+            mentorship_requests
+        )
+        SELECT u.id,
+               (SELECT COUNT(*) FROM projects p WHERE p.created_by = u.id AND p.status = 'active'),
+               (SELECT COUNT(*) FROM projects p WHERE p.created_by = u.id),
+               (SELECT COUNT(*) FROM mentorship_requests mr WHERE mr.alumni_id = u.id AND mr.status = 'accepted'),
+               (SELECT COUNT(*) FROM blog_posts b WHERE b.author_id = u.id),
+               (SELECT COUNT(*) FROM mentorship_requests mr WHERE mr.alumni_id = u.id AND mr.status = 'pending'),
+               (SELECT COUNT(*) FROM project_applications pa JOIN projects p ON pa.project_id = p.id
+                WHERE p.created_by = u.id AND pa.status = 'pending'),
+               (SELECT COUNT(*) FROM project_applications pa WHERE pa.student_id = u.id),
+               (SELECT COUNT(*) FROM project_applications pa WHERE pa.student_id = u.id AND pa.status = 'accepted'),
+               (SELECT COUNT(*) FROM project_applications pa WHERE pa.student_id = u.id AND pa.status = 'pending'),
+               (SELECT COUNT(*) FROM mentorship_requests mr WHERE mr.student_id = u.id)
+        FROM users u
+    ''')
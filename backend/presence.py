@@ -0,0 +1,43 @@
+"""
+In-memory online presence.
+
+A user counts as online if they made an authenticated request or had an
+open message stream within the last PRESENCE_TTL_SECONDS. Nothing is written
+to SQLite; like the event broker this is per process, which is why
+gunicorn.conf.py runs a single worker.
+"""
+
+import threading
+import time
+
+PRESENCE_TTL_SECONDS = 60
+
+
+class PresenceRegistry:
+    def __init__(self, ttl=PRESENCE_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._last_seen = {}  # user_id -> time.monotonic() of the last activity
+        self._next_prune = time.monotonic() + ttl
+
+    def touch(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            self._last_seen[user_id] = now
+            # Drop expired users now and then so the dict doesn't grow forever
+            if now >= self._next_prune:
+                cutoff = now - self.ttl
+                self._last_seen = {uid: seen for uid, seen in self._last_seen.items() if seen > cutoff}
+                self._next_prune = now + self.ttl
+
+    def lookup(self, user_ids):
+        """{user_id: is_online} for every id in user_ids."""
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            return {user_id: self._last_seen.get(user_id, cutoff) > cutoff for user_id in user_ids}
+
+    def is_online(self, user_id):
+        return self.lookup([user_id])[user_id]
+
+
+presence = PresenceRegistry()
@@ -0,0 +1,325 @@
+"""
+Project and mentor recommendations for students.
+
+Scores are the same substring heuristics /api/projects/recommended always used
+(a required skill 10, a tag 5, a skill in the title 4 or description 2, a
+profile keyword in the title or category 3 or description 2), but only
+projects that can possibly score are visited. The recommender keeps, per
+active project:
+
+- the vocabulary of normalized skills_required and tags, each mapped to the
+  projects that list it. Both directions of the skill <-> requirement
+  substring test are answered by scanning this vocabulary, which is far
+  smaller than projects x skills;
+- an inverted index from each word of the title, description and category to
+  projects. A student term can only be a substring of a text if its longest
+  word is a substring of one of the text's words, so scanning the word
+  vocabulary gives a superset of the projects to score.
+
+The index is built on first use, updated for a single project when it is
+created or edited, and rebuilt in full after REBUILD_INTERVAL seconds to pick
+up writes made outside the app (seed_data.py, other processes).
+"""
+
+import heapq
+import json
+import re
+import threading
+import time
+
+REBUILD_INTERVAL = 300
+WORD = re.compile(r'[a-z0-9+#.]+')
+
+
+def normalize(term):
+    return ' '.join(term.lower().split())
+
+
+def words(text):
+    return set(WORD.findall(text.lower()))
+
+
+def longest_word(term):
+    found = WORD.findall(term)
+    return max(found, key=len) if found else None
+
+
+class ProjectRecommender:
+    def __init__(self, rebuild_interval=REBUILD_INTERVAL):
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._projects = {}      # project_id -> scoring fields, lowercased
+        self._skill_terms = {}   # normalized skill -> set of project ids
+        self._tag_terms = {}     # normalized tag -> set of project ids
+        self._text_words = {}    # word from title/description/category -> set of project ids
+
+    # ----------------- Index maintenance -----------------
+
+    def _load(self, cursor, project_id=None):
+        query = '''
+            SELECT id, title, description, category, tags, skills_required, created_at
+            FROM projects WHERE status = 'active'
+        '''
+        if project_id is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query + ' AND id = ?', (project_id,))
+        return cursor.fetchall()
+
+    def _add(self, row):
+        project_id, title, description, category, tags, skills_required, created_at = row
+        skills = json.loads(skills_required) if skills_required else []
+        tags = json.loads(tags) if tags else []
+        project = {
+            'skills': [(normalize(skill), skill) for skill in skills if normalize(skill)],
+            'tags': [normalize(tag) for tag in tags if normalize(tag)],
+            'title': (title or '').lower(),
+            'description': (description or '').lower(),
+            'category': (category or '').lower(),
+            'created_at': created_at or '',
+        }
+        self._projects[project_id] = project
+        for skill, _ in project['skills']:
+            self._skill_terms.setdefault(skill, set()).add(project_id)
+        for tag in project['tags']:
+            self._tag_terms.setdefault(tag, set()).add(project_id)
+        for word in words(project['title']) | words(project['description']) | words(project['category']):
+            self._text_words.setdefault(word, set()).add(project_id)
+
+    def _remove(self, project_id):
+        project = self._projects.pop(project_id, None)
+        if project is None:
+            return
+        postings = [(self._skill_terms, skill) for skill, _ in project['skills']]
+        postings += [(self._tag_terms, tag) for tag in project['tags']]
+        postings += [(self._text_words, word)
+                     for word in words(project['title']) | words(project['description']) | words(project['category'])]
+        for index, key in postings:
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(project_id)
+                if not ids:
+                    del index[key]
+
+    def rebuild(self, cursor):
+        rows = self._load(cursor)
+        with self._lock:
+            self._projects, self._skill_terms, self._tag_terms, self._text_words = {}, {}, {}, {}
+            for row in rows:
+                self._add(row)
+            self._built_at = time.monotonic()
+
+    def refresh_project(self, cursor, project_id):
+        """Re-index one project after it was created or edited."""
+        if self._built_at is None:
+            return  # Nothing built yet; the first lookup loads everything
+        rows = self._load(cursor, project_id)
+        with self._lock:
+            self._remove(project_id)
+            for row in rows:
+                self._add(row)
+
+    def ensure_fresh(self, cursor):
+        if self._built_at is None or time.monotonic() - self._built_at > self.rebuild_interval:
+            self.rebuild(cursor)
+
+    # ----------------- Scoring -----------------
+
+    def _candidates(self, skills, keywords):
+        candidates = set()
+        for skill in skills:
+            for index in (self._skill_terms, self._tag_terms):
+                for term, ids in index.items():
+                    if skill in term or term in skill:
+                        candidates |= ids
+        for term in skills + keywords:
+            anchor = longest_word(term)
+            if anchor:
+                for word, ids in self._text_words.items():
+                    if anchor in word:
+                        candidates |= ids
+        return candidates
+
+    def _score(self, project, skills, keywords):
+        score = 0
+        matched_skills = []
+
+        # Match skills (highest weight)
+        for skill in skills:
+            for req_skill, original in project['skills']:
+                if skill in req_skill or req_skill in skill:
+                    score += 10
+                    matched_skills.append(original)
+                    break
+
+        # Match tags
+        for skill in skills:
+            for tag in project['tags']:
+                if skill in tag or tag in skill:
+                    score += 5
+                    break
+
+        # Match keywords in title, description and category
+        for keyword in keywords:
+            if keyword in project['title']:
+                score += 3
+            if keyword in project['description']:
+                score += 2
+            if keyword in project['category']:
+                score += 3
+
+        # Match skills in title/description
+        for skill in skills:
+            if skill in project['title']:
+                score += 4
+            if skill in project['description']:
+                score += 2
+
+        return score, sorted(set(matched_skills))
+
+    def recommend(self, skills, keywords, exclude=(), limit=None):
+        """[(project_id, score, matched_skills)] best first, newest first on ties."""
+        skills = [term for term in (normalize(s) for s in skills) if term]
+        keywords = [term for term in (normalize(k) for k in keywords) if term]
+
+        scored = []
+        with self._lock:
+            for project_id in self._candidates(skills, keywords) - set(exclude):
+                project = self._projects[project_id]
+                score, matched_skills = self._score(project, skills, keywords)
+                if score > 0:
+                    scored.append((score, project['created_at'], project_id, matched_skills))
+
+        top = heapq.nlargest(limit if limit is not None else len(scored), scored, key=lambda item: item[:3])
+        return [(project_id, score, matched_skills) for score, _, project_id, matched_skills in top]
+
+
+class MentorRecommender:
+    """Ranks available alumni for a student.
+
+    Keeps a precomputed feature row per available alumnus (normalized
+    tech_skills, domain, department, branch, years_of_experience), refreshed
+    for one alumnus when their profile changes and rebuilt in full after
+    REBUILD_INTERVAL seconds. Weights follow the project scorer: a shared
+    skill 10, a skill in the domain 4, specialization in the domain or skills
+    5, same department or branch 3 each, then up to 5 points for experience
+    among alumni that matched on something.
+    """
+
+    def __init__(self, rebuild_interval=REBUILD_INTERVAL):
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._alumni = {}  # user_id -> features
+
+    def _load(self, cursor, user_id=None):
+        query = '''
+            SELECT id, tech_skills, domain, department, branch, years_of_experience
+            FROM users WHERE role = 'alumni' AND COALESCE(is_available, 1) = 1
+        '''
+        if user_id is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query + ' AND id = ?', (user_id,))
+        return cursor.fetchall()
+
+    def _features(self, row):
+        _, tech_skills, domain, department, branch, years_of_experience = row
+        try:
+            skills = json.loads(tech_skills) if tech_skills and isinstance(tech_skills, str) else []
+        except ValueError:
+            skills = tech_skills
+        if isinstance(skills, str):
+            skills = skills.split(',')  # stored as 'Python, SQL'
+        elif not isinstance(skills, list):
+            skills = []
+        try:
+            years_of_experience = max(int(float(years_of_experience or 0)), 0)
+        except (TypeError, ValueError, OverflowError):
+            years_of_experience = 0  # free text such as '5+ years'
+        return {
+            'skills': [(normalize(str(skill)), str(skill)) for skill in skills if normalize(str(skill))],
+            'domain': normalize(domain or ''),
+            'department': normalize(department or ''),
+            'branch': normalize(branch or ''),
+            'years_of_experience': years_of_experience,
+        }
+
+    def rebuild(self, cursor):
+        rows = self._load(cursor)
+        with self._lock:
+            self._alumni = {row[0]: self._features(row) for row in rows}
+            self._built_at = time.monotonic()
+
+    def refresh_alumni(self, cursor, user_id):
+        """Re-read one user's features after a profile update; no-op for students."""
+        if self._built_at is None:
+            return
+        rows = self._load(cursor, user_id)
+        with self._lock:
+            self._alumni.pop(user_id, None)
+            for row in rows:
+                self._alumni[row[0]] = self._features(row)
+
+    def ensure_fresh(self, cursor):
+        if self._built_at is None or time.monotonic() - self._built_at > self.rebuild_interval:
+            self.rebuild(cursor)
+
+    def _score(self, alumnus, skills, department, branch, specialization):
+        score = 0
+        matched_skills = []
+        for skill in skills:
+            for alumni_skill, original in alumnus['skills']:
+                if skill in alumni_skill or alumni_skill in skill:
+                    score += 10
+                    matched_skills.append(original)
+                    break
+            if alumnus['domain'] and skill in alumnus['domain']:
+                score += 4
+        if specialization and (specialization in alumnus['domain']
+                               or any(specialization in alumni_skill for alumni_skill, _ in alumnus['skills'])):
+            score += 5
+        if department and department == alumnus['department']:
+            score += 3
+        if branch and branch == alumnus['branch']:
+            score += 3
+        if score:
+            score += min(alumnus['years_of_experience'], 20) / 4
+        return score, sorted(set(matched_skills))
+
+    def recommend(self, skills, department=None, branch=None, specialization=None, exclude=(), limit=10):
+        """[(alumni_id, score, matched_skills)] best first."""
+        skills = [term for term in (normalize(s) for s in skills) if term]
+        department, branch, specialization = (normalize(value or '') for value in (department, branch, specialization))
+
+        scored = []
+        with self._lock:
+            for alumni_id, alumnus in self._alumni.items():
+                if alumni_id in exclude:
+                    continue
+                score, matched_skills = self._score(alumnus, skills, department, branch, specialization)
+                if score > 0:
+                    scored.append((score, alumni_id, matched_skills))
+
+        top = heapq.nlargest(limit, scored, key=lambda item: (item[0], -item[1]))
+        return [(alumni_id, score, matched_skills) for score, alumni_id, matched_skills in top]
+
+
+recommender = ProjectRecommender()
+mentor_recommender = MentorRecommender()
+
+
+def skill_fit(applicant_skills, required_skills):
+    """(fit_score 0-100, matched required skills) for one applicant.
+
+    A required skill counts as matched when it and one of the applicant's
+    skills contain each other, the same test the project scorer uses.
+    """
+    applicant = [term for term in (normalize(skill) for skill in applicant_skills) if term]
+    required = [(normalize(skill), skill) for skill in required_skills if normalize(skill)]
+    if not required:
+        return 0, []
+    matched = [original for skill, original in required
+               if any(skill in mine or mine in skill for mine in applicant)]
+    return round(100 * len(matched) / len(required)), matched
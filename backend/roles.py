@@ -0,0 +1,54 @@
+"""
+Per-process cache of user roles.
+
+Handlers use it for the caller (app.current_user) and for other users:
+the student whose projects are being listed, the alumnus a mentorship
+request is addressed to. The JWT also carries a 'role' claim, but that
+would outlive a deleted account; a lookup here returns None for it, so
+role-gated routes answer 403. Roles never change through the API, so
+entries only expire after ROLE_CACHE_TTL_SECONDS to pick up writes made
+outside the app (seed_data.py resets every user, deletions are manual).
+Misses are never cached.
+"""
+
+import threading
+import time
+
+ROLE_CACHE_TTL_SECONDS = 300
+ROLE_CACHE_MAX_ENTRIES = 10000
+
+
+class RoleCache:
+    def __init__(self, ttl=ROLE_CACHE_TTL_SECONDS, max_entries=ROLE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._roles = {}  # user_id -> (role, time.monotonic() it expires)
+
+    def get(self, cursor, user_id):
+        """The user's role, or None if there is no such user."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._roles.get(user_id)
+        if cached and cached[1] > now:
+            return cached[0]
+        cursor.execute('SELECT role FROM users WHERE id = ?', (user_id,))
+        row = cursor.fetchone()
+        if row is None:
+            self.invalidate(user_id)  # Don't remember misses; the id may be registered next
+            return None
+        self.set(user_id, row[0])
+        return row[0]
+
+    def set(self, user_id, role):
+        with self._lock:
+            if len(self._roles) >= self.max_entries and user_id not in self._roles:
+                self._roles.clear()
+            self._roles[user_id] = (role, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._roles.pop(user_id, None)
+
+
+role_cache = RoleCache()
@@ -1,9 +1,21 @@
+import os
 import sqlite3
 from werkzeug.security import generate_password_hash
 from datetime import datetime, timedelta
 import json
 import random
 from app import init_db
+from excerpts import make_excerpt
+from check_blog_likes import repair as repair_likes_counts
+import user_stats
+from hashing import HASH_PROFILES, method_from_env
+
+def seed_password_method():
+    # Demo accounts don't need a production-cost hash: use the fast profile unless the
+    # environment asks for something else. The app upgrades each hash on first login.
+    if os.environ.get('PASSWORD_HASH_METHOD') or os.environ.get('PASSWORD_HASH_PROFILE'):
+        return method_from_env()
+    return HASH_PROFILES['fast']
 
 def seed_database():
     # Initialize database tables first
@@ -13,10 +25,12 @@ def seed_database():
     cursor = conn.cursor()
     
     # Clear existing data
+    cursor.execute('DELETE FROM user_stats')
     cursor.execute('DELETE FROM project_applications')
     cursor.execute('DELETE FROM project_positions')
     cursor.execute('DELETE FROM conversations')
     cursor.execute('DELETE FROM messages')
+    cursor.execute('DELETE FROM conversation_reads')
     cursor.execute('DELETE FROM blog_likes')
     cursor.execute('DELETE FROM user_skills')
     cursor.execute('DELETE FROM user_achievements')
@@ -364,8 +378,12 @@ def seed_database():
     ]
     
     user_ids = {}
+    password_method = seed_password_method()
+    password_hashes = {}  # Every seed user shares a password; hash each distinct one once
     for user in users:
-        password_hash = generate_password_hash(user['password'])
+        if user['password'] not in password_hashes:
+            password_hashes[user['password']] = generate_password_hash(user['password'], password_method)
+        password_hash = password_hashes[user['password']]
         cursor.execute('''
             INSERT INTO users (name, email, password_hash, role, graduation_year, department, hall, branch, bio,
                                current_company, current_position, location, work_preference, phone, website,
@@ -759,11 +777,11 @@ def seed_database():
     project_ids = {}
     for project in projects:
         cursor.execute('''
-            INSERT INTO projects (title, description, category, status, team_members, tags, created_by, 
+            INSERT INTO projects (title, description, excerpt, category, status, team_members, tags, created_by, 
                                   skills_required, is_recruiting, images, project_links, jd_pdf, 
                                   contact_details, team_roles, partners, funding, highlights)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (project['title'], project['description'], project['category'], project['status'], 
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (project['title'], project['description'], make_excerpt(project['description']), project['category'], project['status'], 
               project['team_members'], project['tags'], project['created_by'], 
               project['skills_required'], project['is_recruiting'], project['images'], 
               project['project_links'], project['jd_pdf'], project['contact_details'], 
@@ -1192,9 +1210,9 @@ The journey is hard, but incredibly rewarding. Would I do it again? Absolutely.
     blog_post_ids = {}
     for post in blog_posts:
         cursor.execute('''
-            INSERT INTO blog_posts (title, content, category, author_id)
-            VALUES (?, ?, ?, ?)
-        ''', (post['title'], post['content'], post['category'], post['author_id']))
+            INSERT INTO blog_posts (title, content, excerpt, category, author_id)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (post['title'], post['content'], make_excerpt(post['content']), post['category'], post['author_id']))
         blog_post_ids[post['title']] = cursor.lastrowid
 
     # ----------------- Mentorship Requests -----------------
@@ -1365,13 +1383,22 @@ The journey is hard, but incredibly rewarding. Would I do it again? Absolutely.
         
         # Add messages
         messages = message_templates[idx % len(message_templates)]
+        message_ids = []
         for i, msg_content in enumerate(messages):
             sender = user1_id if i % 2 == 0 else user2_id
             receiver = user2_id if i % 2 == 0 else user1_id
             cursor.execute('''
-                INSERT INTO messages (sender_id, receiver_id, content, is_read)
-                VALUES (?, ?, ?, ?)
-            ''', (sender, receiver, msg_content, 1 if i < len(messages) - 2 else 0))
+                INSERT INTO messages (conversation_id, sender_id, receiver_id, content, is_read)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (conv_id, sender, receiver, msg_content, 1 if i < len(messages) - 2 else 0))
+            message_ids.append(cursor.lastrowid)
+        
+        # Both sides have read all but the last two messages
+        for participant in (user1_id, user2_id):
+            cursor.execute('''
+                INSERT INTO conversation_reads (conversation_id, user_id, last_read_message_id)
+                VALUES (?, ?, ?)
+            ''', (conv_id, participant, message_ids[-3]))
 
     # ----------------- Blog Likes -----------------
     # Students like alumni blog posts
@@ -1389,6 +1416,10 @@ The journey is hard, but incredibly rewarding. Would I do it again? Absolutely.
                 VALUES (?, ?)
             ''', (post_id, user_ids[student_email]))
 
+    # Likes were inserted directly, so bring the denormalized counters in line
+    repair_likes_counts(cursor)
+    user_stats.rebuild(cursor)
+
     conn.commit()
     conn.close()
     print("✅ Database seeded successfully with comprehensive data!")
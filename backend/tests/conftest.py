@@ -0,0 +1,75 @@
+import os
+import sqlite3
+
+import pytest
+
+# Cheap hashes, no hash worker processes and no background threads under test; set before app reads them
+os.environ.setdefault('PASSWORD_HASH_PROFILE', 'fast')
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+os.environ.setdefault('SQLITE_CHECKPOINT_INTERVAL', '0')
+os.environ.setdefault('TFIDF_REBUILD_INTERVAL', '0')
+
+import app as app_module  # noqa: E402
+import db  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from migrate import run_migrations  # noqa: E402
+from recommend import MentorRecommender, ProjectRecommender  # noqa: E402
+from roles import RoleCache  # noqa: E402
+
+STATEMENT_PREFIXES = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A migrated scratch database that the app's connection pool points at."""
+    path = str(tmp_path / 'test.db')
+    conn = sqlite3.connect(path)
+    run_migrations(conn)
+    monkeypatch.setitem(app_module.app.config, 'DATABASE', path)
+    # Per-process caches would otherwise carry ids over from the previous test's database
+    monkeypatch.setattr(db, '_pool', None)
+    monkeypatch.setattr(app_module, 'role_cache', RoleCache())
+    monkeypatch.setattr(app_module, 'recommender', ProjectRecommender())
+    monkeypatch.setattr(app_module, 'mentor_recommender', MentorRecommender())
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def client(database):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """SQL statements the app runs on its pooled connections, in order.
+
+    PRAGMAs and the pool's own health checks are left out.
+    """
+    statements = []
+    connect = db.ConnectionPool._connect
+
+    def traced_connect(self):
+        conn = connect(self)
+        conn.set_trace_callback(
+            lambda sql: statements.append(sql) if sql.lstrip().upper().startswith(STATEMENT_PREFIXES) else None)
+        return conn
+
+    monkeypatch.setattr(db.ConnectionPool, '_connect', traced_connect)
+    return statements
+
+
+def add_user(conn, role, name=None, **fields):
+    name = name or f'{role} {os.urandom(4).hex()}'
+    columns = {'name': name, 'email': f'{name.replace(" ", ".")}@example.com', 'password_hash': '-', 'role': role}
+    columns.update(fields)
+    cursor = conn.execute(f"INSERT INTO users ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                          list(columns.values()))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def auth_header(user_id, role):
+    with app_module.app.app_context():
+        token = create_access_token(identity=f'user_{user_id}', additional_claims={'role': role})
+    return {'Authorization': f'Bearer {token}'}
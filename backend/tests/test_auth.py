@@ -0,0 +1,52 @@
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash
+
+import app as app_module
+from tests.conftest import add_user, auth_header
+
+OLD_METHOD = 'pbkdf2:sha256:500'
+
+
+def login(client, email, password='password123'):
+    return client.post('/api/auth/login', json={'email': email, 'password': password})
+
+
+def stored_hash(conn, user_id):
+    return conn.execute('SELECT password_hash FROM users WHERE id = ?', (user_id,)).fetchone()[0]
+
+
+def test_login_upgrades_an_outdated_hash(client, database):
+    old_hash = generate_password_hash('password123', OLD_METHOD)
+    user_id = add_user(database, 'student', 'Old Hash', password_hash=old_hash)
+
+    assert login(client, 'Old.Hash@example.com').status_code == 200
+    method = stored_hash(database, user_id).split('$', 1)[0]
+    assert method == app_module.app.config['PASSWORD_HASH_METHOD']
+
+
+def test_failed_hash_upgrade_does_not_fail_login(client, database, monkeypatch, capsys):
+    old_hash = generate_password_hash('password123', OLD_METHOD)
+    user_id = add_user(database, 'student', 'Old Hash', password_hash=old_hash)
+
+    def broken(password):
+        raise BrokenProcessPool('A process in the process pool was terminated abruptly')
+    monkeypatch.setattr(app_module, 'hash_password', broken)
+
+    response = login(client, 'Old.Hash@example.com')
+
+    assert response.status_code == 200 and response.get_json()['token']
+    assert stored_hash(database, user_id) == old_hash
+    assert 'Password hash upgrade for user' in capsys.readouterr().out
+    assert login(client, 'Old.Hash@example.com', 'wrong').status_code == 401
+
+
+def test_token_of_a_deleted_user_loses_its_role(client, database):
+    user_id = add_user(database, 'alumni')
+    headers = auth_header(user_id, 'alumni')
+    database.execute('DELETE FROM users WHERE id = ?', (user_id,))
+    database.commit()
+
+    # The token still carries role=alumni, but the account behind it is gone
+    assert client.get('/api/alumni/dashboard-stats', headers=headers).status_code == 403
+    assert client.post('/api/blog', headers=headers, json={'title': 'T', 'content': 'C'}).status_code == 403
@@ -0,0 +1,66 @@
+import json
+import sqlite3
+
+import app as app_module
+from tests.conftest import add_user, auth_header
+
+
+def test_fetch_in_chunks_binds_params_ahead_of_each_chunk():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE likes (user_id INTEGER, post_id INTEGER)')
+    conn.executemany('INSERT INTO likes VALUES (?, ?)',
+                     [(user_id, post_id) for user_id in (1, 2) for post_id in range(0, 1300, 3)])
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    sql = 'SELECT post_id FROM likes WHERE user_id = ? AND post_id IN ({ids})'
+    rows = app_module.fetch_in_chunks(conn.cursor(), sql, range(1201), (2,))
+
+    assert sorted(row[0] for row in rows) == list(range(0, 1201, 3))
+    assert len(statements) == 3
+    assert app_module.fetch_in_chunks(conn.cursor(), sql, [], (2,)) == []
+
+
+def test_blog_list_marks_the_viewers_likes(client, database):
+    author_id = add_user(database, 'alumni')
+    viewer_id = add_user(database, 'student')
+    database.executemany('''
+        INSERT INTO blog_posts (title, content, author_id) VALUES (?, 'Content', ?)
+    ''', [(f'Post {i}', author_id) for i in range(6)])
+    database.execute('''
+        INSERT INTO blog_likes (blog_post_id, user_id) SELECT id, ? FROM blog_posts WHERE id % 2 = 0
+    ''', (viewer_id,))
+    database.commit()
+
+    response = client.get('/api/blog', headers=auth_header(viewer_id, 'student'))
+
+    assert response.status_code == 200
+    liked = {post['id']: post['is_liked'] for post in response.get_json()}
+    assert liked == {post_id: post_id % 2 == 0 for post_id in range(1, 7)}
+
+
+def test_applications_sorted_by_fit_carry_student_skills(client, database):
+    alumni_id = add_user(database, 'alumni')
+    project_id = database.execute('''
+        INSERT INTO projects (title, description, category, status, skills_required, created_by)
+        VALUES ('Project', 'Description', 'Research', 'active', ?, ?)
+    ''', (json.dumps(['Python', 'SQL']), alumni_id)).lastrowid
+    skills = {
+        add_user(database, 'student'): ['Python', 'SQL'],
+        add_user(database, 'student'): ['Go'],
+    }
+    for student_id, student_skills in skills.items():
+        database.execute('INSERT INTO project_applications (student_id, project_id) VALUES (?, ?)',
+                         (student_id, project_id))
+        database.executemany('INSERT INTO user_skills (user_id, skill_name) VALUES (?, ?)',
+                             [(student_id, skill) for skill in student_skills])
+    database.commit()
+
+    response = client.get('/api/alumni/project-applications', query_string={'sort': 'fit'},
+                          headers=auth_header(alumni_id, 'alumni'))
+
+    assert response.status_code == 200
+    applications = response.get_json()
+    assert [application['student_id'] for application in applications] == list(skills)
+    for application in applications:
+        assert application['student_skills'] == skills[application['student_id']]
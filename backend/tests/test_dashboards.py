@@ -0,0 +1,91 @@
+import user_stats
+from tests.conftest import add_user, auth_header
+
+
+def add_activity(conn, alumni_id, student_id, count):
+    """count projects (one in three completed), applications, mentorship requests and blog posts."""
+    cursor = conn.cursor()
+    for i in range(count):
+        cursor.execute('''
+            INSERT INTO projects (title, description, category, status, created_by)
+            VALUES (?, 'Description', 'Research', ?, ?)
+        ''', (f'Project {i}', 'completed' if i % 3 == 0 else 'active', alumni_id))
+        cursor.execute('''
+            INSERT INTO project_applications (student_id, project_id, status) VALUES (?, ?, ?)
+        ''', (student_id, cursor.lastrowid, 'accepted' if i % 2 else 'pending'))
+        cursor.execute('''
+            INSERT INTO mentorship_requests (student_id, alumni_id, status) VALUES (?, ?, ?)
+        ''', (student_id, alumni_id, 'accepted' if i % 2 else 'pending'))
+        cursor.execute('''
+            INSERT INTO blog_posts (title, content, author_id) VALUES (?, 'Content', ?)
+        ''', (f'Post {i}', alumni_id))
+    # Rows written behind the app's back, so recompute the counters like seed_data.py does
+    user_stats.rebuild(cursor)
+    conn.commit()
+
+
+def dashboard(client, queries, path, headers):
+    queries.clear()
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    return response.get_json(), list(queries)
+
+
+def test_dashboards_run_one_query_regardless_of_activity(client, database, queries):
+    alumni_id = add_user(database, 'alumni')
+    student_id = add_user(database, 'student')
+    alumni, student = auth_header(alumni_id, 'alumni'), auth_header(student_id, 'student')
+
+    # The caller's role is looked up once and then cached; count the requests after that
+    dashboard(client, queries, '/api/alumni/dashboard-stats', alumni)
+    dashboard(client, queries, '/api/students/dashboard-stats', student)
+
+    add_activity(database, alumni_id, student_id, 3)
+    _, alumni_small = dashboard(client, queries, '/api/alumni/dashboard-stats', alumni)
+    _, student_small = dashboard(client, queries, '/api/students/dashboard-stats', student)
+
+    add_activity(database, alumni_id, student_id, 57)
+    alumni_stats, alumni_large = dashboard(client, queries, '/api/alumni/dashboard-stats', alumni)
+    student_stats, student_large = dashboard(client, queries, '/api/students/dashboard-stats', student)
+
+    assert len(alumni_small) == len(alumni_large) == 1
+    assert len(student_small) == len(student_large) == 1
+    assert alumni_stats == {
+        'active_projects': 40, 'total_projects': 60, 'mentees': 29, 'blog_posts': 60,
+        'pending_mentorship_requests': 31, 'pending_project_applications': 31,
+    }
+    assert student_stats == {
+        'applied_projects': 60, 'accepted_projects': 29, 'pending_applications': 31, 'mentorship_requests': 60,
+    }
+
+
+def test_dashboards_default_to_zero_and_check_role(client, database, queries):
+    alumni_id = add_user(database, 'alumni')
+    student_id = add_user(database, 'student')
+    alumni, student = auth_header(alumni_id, 'alumni'), auth_header(student_id, 'student')
+
+    stats, _ = dashboard(client, queries, '/api/alumni/dashboard-stats', alumni)
+    assert set(stats.values()) == {0}
+    stats, _ = dashboard(client, queries, '/api/students/dashboard-stats', student)
+    assert set(stats.values()) == {0}
+
+    assert client.get('/api/alumni/dashboard-stats', headers=student).status_code == 403
+    assert client.get('/api/students/dashboard-stats', headers=alumni).status_code == 403
+
+
+def test_new_blog_post_returns_its_id_and_counts_on_the_dashboard(client, database, queries):
+    other_id = add_user(database, 'alumni')
+    database.executemany("INSERT INTO blog_posts (title, content, author_id) VALUES (?, 'Content', ?)",
+                         [(f'Older post {i}', other_id) for i in range(3)])
+    database.commit()
+    alumni_id = add_user(database, 'alumni')
+    alumni = auth_header(alumni_id, 'alumni')
+
+    # The counter upsert also sets lastrowid; the id must still be the post's, not the user_stats row's
+    response = client.post('/api/blog', headers=alumni, json={'title': 'First post', 'content': 'Hello'})
+    assert response.status_code == 201
+    post_id = response.get_json()['id']
+    assert database.execute('SELECT author_id FROM blog_posts WHERE id = ?', (post_id,)).fetchone() == (alumni_id,)
+
+    stats, _ = dashboard(client, queries, '/api/alumni/dashboard-stats', alumni)
+    assert stats['blog_posts'] == 1
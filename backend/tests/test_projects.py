@@ -0,0 +1,57 @@
+import json
+
+from tests.conftest import add_user, auth_header
+
+
+def add_projects(conn, owner_id, count):
+    conn.executemany('''
+        INSERT INTO projects (title, description, category, status, tags, skills_required, created_by)
+        VALUES (?, 'Description', 'Research', 'active', ?, ?, ?)
+    ''', [(f'Project {i}', json.dumps(['ml']), json.dumps(['Python']), owner_id) for i in range(count)])
+    conn.commit()
+
+
+def applied_to(conn, student_id, every=2):
+    conn.execute('''
+        INSERT INTO project_applications (student_id, project_id, status)
+        SELECT ?, id, 'pending' FROM projects WHERE id % ? = 0
+    ''', (student_id, every))
+    conn.commit()
+
+
+def project_list_queries(client, queries, headers, **params):
+    queries.clear()
+    response = client.get('/api/projects', headers=headers, query_string=params)
+    assert response.status_code == 200
+    return response.get_json(), list(queries)
+
+
+def test_project_list_runs_one_query_regardless_of_row_count(client, database, queries):
+    owner_id = add_user(database, 'alumni')
+    student_id = add_user(database, 'student')
+    headers = auth_header(student_id, 'student')
+
+    add_projects(database, owner_id, 3)
+    applied_to(database, student_id)
+    small, small_queries = project_list_queries(client, queries, headers)
+
+    add_projects(database, owner_id, 60)
+    applied_to(database, student_id)
+    large, large_queries = project_list_queries(client, queries, headers)
+
+    assert len(small) == 3 and len(large) == 63
+    # has_applied comes from the same statement instead of one lookup per project
+    assert len(small_queries) == len(large_queries) == 1
+    applied = {project['id'] for project in large if project['has_applied']}
+    assert applied == {project['id'] for project in large if project['id'] % 2 == 0}
+
+
+def test_anonymous_and_paged_project_lists_stay_constant(client, database, queries):
+    owner_id = add_user(database, 'alumni')
+    add_projects(database, owner_id, 5)
+    _, small_queries = project_list_queries(client, queries, {}, limit=2)
+    add_projects(database, owner_id, 50)
+    page, large_queries = project_list_queries(client, queries, {}, limit=2)
+
+    assert len(page['projects']) == 2 and page['next_cursor']
+    assert len(small_queries) == len(large_queries) == 1
@@ -0,0 +1,37 @@
+import json
+
+from recommend import MentorRecommender
+
+
+def features(tech_skills, years_of_experience=None):
+    return MentorRecommender()._features((1, tech_skills, 'Machine Learning', 'CSE', None, years_of_experience))
+
+
+def test_tech_skills_that_are_not_a_list_do_not_break_features():
+    assert [original for _, original in features(json.dumps(['Python', 'SQL']))['skills']] == ['Python', 'SQL']
+    assert [original for _, original in features('Python, SQL')['skills']] == ['Python', ' SQL']
+    assert [original for _, original in features(json.dumps('Python'))['skills']] == ['Python']
+    assert features(json.dumps({'Python': 5}))['skills'] == []
+    assert features('42')['skills'] == []
+    assert features(42)['skills'] == []
+    assert features(None)['skills'] == []
+
+
+def test_years_of_experience_is_coerced_to_an_int():
+    assert features('[]', 7)['years_of_experience'] == 7
+    assert features('[]', '12')['years_of_experience'] == 12
+    assert features('[]', '3.5')['years_of_experience'] == 3
+    assert features('[]', '5+ years')['years_of_experience'] == 0
+    assert features('[]', -2)['years_of_experience'] == 0
+    assert features('[]', None)['years_of_experience'] == 0
+
+
+def test_recommend_scores_alumni_with_text_experience():
+    recommender = MentorRecommender()
+    recommender._alumni = {
+        1: recommender._features((1, json.dumps(['Python']), '', '', '', '10')),
+        2: recommender._features((2, json.dumps({'bad': 1}), '', '', '', 'lots')),
+        3: recommender._features((3, 'python', '', '', '', None)),
+    }
+    matches = recommender.recommend(['Python'])
+    assert [(alumni_id, score) for alumni_id, score, _ in matches] == [(1, 12.5), (3, 10)]
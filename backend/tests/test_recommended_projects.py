@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import tfidf
+from tests.conftest import add_user, auth_header
+
+
+def add_project(conn, owner_id, title, skills, status='active'):
+    cursor = conn.execute('''
+        INSERT INTO projects (title, description, category, status, skills_required, created_by)
+        VALUES (?, 'Description', 'Research', ?, ?, ?)
+    ''', (title, status, json.dumps(skills), owner_id))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def add_student(conn, skills):
+    student_id = add_user(conn, 'student')
+    conn.executemany('INSERT INTO user_skills (user_id, skill_name) VALUES (?, ?)',
+                     [(student_id, skill) for skill in skills])
+    conn.commit()
+    return student_id
+
+
+def recommended(client, student_id, **params):
+    response = client.get('/api/projects/recommended', headers=auth_header(student_id, 'student'),
+                          query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_limit_is_clamped(client, database):
+    owner_id = add_user(database, 'alumni')
+    for i in range(105):
+        add_project(database, owner_id, f'Kubernetes {i}', ['Kubernetes'])
+    add_project(database, owner_id, 'Unrelated', ['Pottery'])
+    student_id = add_student(database, ['Kubernetes'])
+
+    # 0 and negative limits still rank instead of falling back to unscored recent projects
+    for limit in (0, -5):
+        projects = recommended(client, student_id, limit=limit)
+        assert len(projects) == 1 and projects[0]['match_score'] > 0
+    assert len(recommended(client, student_id, limit=1000)) == 100
+    assert len(recommended(client, student_id)) == 50
+    assert client.get('/api/projects/recommended?limit=many',
+                      headers=auth_header(student_id, 'student')).status_code == 400
+
+
+def test_tfidf_falls_back_when_every_match_has_closed(client, database, tmp_path, monkeypatch):
+    pytest.importorskip('scipy')
+    owner_id = add_user(database, 'alumni')
+    match_id = add_project(database, owner_id, 'Kubernetes operator', ['Kubernetes'])
+    other_id = add_project(database, owner_id, 'Pottery studio', ['Pottery'])
+    student_id = add_student(database, ['Kubernetes'])
+    monkeypatch.setitem(client.application.config, 'TFIDF_INDEX_DIR', str(tmp_path / 'tfidf'))
+    tfidf.build_index(database, str(tmp_path / 'tfidf'))
+
+    assert [project['id'] for project in recommended(client, student_id, strategy='tfidf')] == [match_id]
+
+    # Closed after the index was built: recent active projects rather than an empty list
+    database.execute("UPDATE projects SET status = 'completed' WHERE id = ?", (match_id,))
+    database.commit()
+    projects = recommended(client, student_id, strategy='tfidf')
+    assert [project['id'] for project in projects] == [other_id]
+    assert projects[0]['match_score'] == 0
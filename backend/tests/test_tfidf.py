@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+import tfidf
+from tests.conftest import add_user
+
+pytest.importorskip('scipy')
+
+
+def test_json_texts_takes_lists_and_plain_text_only():
+    assert tfidf.json_texts(json.dumps(['Python', 3, None])) == ['Python', '3']
+    assert tfidf.json_texts('Python, SQL') == ['Python, SQL']
+    assert tfidf.json_texts(json.dumps('Python')) == ['Python']
+    assert tfidf.json_texts(json.dumps({'skill': 'Python'})) == []
+    assert tfidf.json_texts('42') == []
+    assert tfidf.json_texts(None) == []
+
+
+def test_student_terms_survive_non_list_tech_skills(database):
+    cursor = database.cursor()
+    for tech_skills in (json.dumps({'a': 1}), '7', 'Rust, Go', json.dumps(['Rust'])):
+        student_id = add_user(database, 'student', tech_skills=tech_skills)
+        terms = tfidf.student_terms(cursor, student_id)
+        assert ('rust' in terms) == ('Rust' in tech_skills)
+
+
+def test_build_never_removes_the_current_version(database, tmp_path):
+    index_dir = str(tmp_path / 'tfidf')
+    add_user(database, 'alumni')
+    # Versions that sort after ours, e.g. left by another host's clock or a concurrent build
+    for name in ('99990101000000-1', '99990101000000-2'):
+        os.makedirs(os.path.join(index_dir, name))
+
+    paths = [tfidf.build_index(database, index_dir) for _ in range(3)]
+
+    assert len(set(paths)) == 3
+    with open(os.path.join(index_dir, 'CURRENT')) as f:
+        current = f.read().strip()
+    assert os.path.join(index_dir, current) == paths[-1]
+    assert tfidf.get_index(index_dir) is not None
+
+
+def test_loaded_index_stays_memory_mapped(database, tmp_path):
+    alumni_id = add_user(database, 'alumni')
+    database.executemany('''
+        INSERT INTO projects (title, description, category, status, skills_required, created_by)
+        VALUES (?, 'Description', 'Research', 'active', ?, ?)
+    ''', [(f'Project {i}', json.dumps(['Python', f'Skill {i}']), alumni_id) for i in range(5)])
+    database.commit()
+
+    index = tfidf.TfidfIndex(tfidf.build_index(database, str(tmp_path / 'tfidf')))
+
+    # A converted array would be an in-memory copy that owns its data
+    arrays = (index.postings.data, index.postings.indices, index.postings.indptr)
+    assert not any(array.flags.owndata for array in arrays)
+    assert index.top_k({'python': 1})
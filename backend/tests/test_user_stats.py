@@ -0,0 +1,112 @@
+import app as app_module
+import db
+import user_stats
+from tests.conftest import add_user, auth_header
+
+
+def counters(conn):
+    return conn.execute(f"SELECT user_id, {', '.join(user_stats.COUNTERS)} FROM user_stats ORDER BY user_id").fetchall()
+
+
+def assert_counters_match_rebuild(conn):
+    stored = counters(conn)
+    user_stats.rebuild(conn.cursor())
+    conn.commit()
+    assert stored == counters(conn)
+    assert all(value >= 0 for row in stored for value in row)
+
+
+def race(monkeypatch, statement, competing):
+    """Run competing() once, right before the first `statement` the app executes.
+
+    By then the handler has already read the row's old status, so this replays
+    two requests that both acted on the same stale read.
+    """
+    responses = []
+    fired = []
+    connect = db.ConnectionPool._connect
+
+    def traced_connect(self):
+        conn = connect(self)
+
+        def trace(sql):
+            if not fired and sql.lstrip().startswith(statement):
+                fired.append(sql)
+                # Its own app context, so it checks out its own connection instead of sharing g.db
+                with app_module.app.app_context():
+                    responses.append(competing())
+        conn.set_trace_callback(trace)
+        return conn
+
+    monkeypatch.setattr(db.ConnectionPool, '_connect', traced_connect)
+    return responses
+
+
+def setup(database):
+    alumni_id = add_user(database, 'alumni')
+    student_id = add_user(database, 'student')
+    project_id = database.execute('''
+        INSERT INTO projects (title, description, category, status, created_by)
+        VALUES ('Project', 'Description', 'Research', 'active', ?)
+    ''', (alumni_id,)).lastrowid
+    application_id = database.execute('''
+        INSERT INTO project_applications (student_id, project_id, status) VALUES (?, ?, 'pending')
+    ''', (student_id, project_id)).lastrowid
+    request_id = database.execute('''
+        INSERT INTO mentorship_requests (student_id, alumni_id, status) VALUES (?, ?, 'pending')
+    ''', (student_id, alumni_id)).lastrowid
+    user_stats.rebuild(database.cursor())
+    database.commit()
+    return alumni_id, student_id, project_id, application_id, request_id
+
+
+def test_concurrent_mentorship_accepts_count_once(client, database, monkeypatch):
+    alumni_id, _, _, _, request_id = setup(database)
+    headers = auth_header(alumni_id, 'alumni')
+    accept = lambda: client.post(f'/api/mentorship/{request_id}/accept', headers=headers)  # noqa: E731
+    competing = race(monkeypatch, 'UPDATE mentorship_requests', accept)
+
+    response = accept()
+
+    assert_counters_match_rebuild(database)
+    assert competing[0].status_code == 200
+    assert response.status_code == 409
+
+
+def test_concurrent_application_accepts_count_once(client, database, monkeypatch):
+    alumni_id, _, _, application_id, _ = setup(database)
+    headers = auth_header(alumni_id, 'alumni')
+    accept = lambda: client.post(f'/api/project-applications/{application_id}/accept', headers=headers)  # noqa: E731
+    competing = race(monkeypatch, 'UPDATE project_applications', accept)
+
+    response = accept()
+
+    assert_counters_match_rebuild(database)
+    assert competing[0].status_code == 200
+    assert response.status_code == 409
+
+
+def test_withdraw_racing_an_accept_keeps_counters(client, database, monkeypatch):
+    alumni_id, student_id, project_id, application_id, _ = setup(database)
+    competing = race(monkeypatch, 'DELETE FROM project_applications', lambda: client.post(
+        f'/api/project-applications/{application_id}/accept', headers=auth_header(alumni_id, 'alumni')))
+
+    response = client.delete(f'/api/project-applications/{project_id}', headers=auth_header(student_id, 'student'))
+
+    assert_counters_match_rebuild(database)
+    assert competing[0].status_code == 200
+    assert response.status_code == 409
+
+
+def test_concurrent_project_status_changes_count_once(client, database, monkeypatch):
+    alumni_id, _, project_id, _, _ = setup(database)
+    headers = auth_header(alumni_id, 'alumni')
+    complete = lambda: client.put(f'/api/projects/{project_id}', headers=headers,  # noqa: E731
+                                  json={'status': 'completed'})
+    competing = race(monkeypatch, 'UPDATE projects', complete)
+
+    response = complete()
+
+    assert_counters_match_rebuild(database)
+    assert competing[0].status_code == 200
+    assert response.status_code == 409
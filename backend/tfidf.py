@@ -0,0 +1,320 @@
+"""
+TF-IDF project recommendations (/api/projects/recommended?strategy=tfidf).
+
+`python tfidf.py build` vectorizes every active project (title, description,
+tags, skills_required and its positions' required_skills) into sublinear,
+L2-normalized TF-IDF weights over words and word pairs. It writes the index
+as NumPy arrays to a new version directory under TFIDF_INDEX_DIR and then
+points CURRENT at it. The app memory-maps the current version and
+reloads when CURRENT changes, so a rebuild never disturbs running requests.
+
+The deploy builds the first index. After that the app's single worker
+rebuilds it on a daemon thread every TFIDF_REBUILD_INTERVAL seconds
+(schedule_rebuilds()), so projects created since are ranked within one
+interval. Until then they only show up through the default scorer;
+projects closed in the meantime are filtered out at query time.
+
+The matrix is stored term-major (one CSR row of project weights per term),
+so scoring a student only touches the rows of the terms in their profile.
+Cosine similarity is the dot product of the two normalized vectors.
+
+NumPy and SciPy are optional. Without them, or before the first build,
+get_index() returns None and the default scorer keeps working.
+"""
+
+import argparse
+import collections
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:  # optional dependency, only needed for strategy=tfidf
+    np = sp = None
+
+WORD = re.compile(r'[a-z0-9+#.]+')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'we', 'will', 'with', 'you',
+}
+
+# Repeating a field's terms is how it gets more weight than free text
+PROJECT_FIELD_WEIGHTS = {'skills': 3, 'tags': 3, 'title': 2, 'description': 1}
+STUDENT_FIELD_WEIGHTS = {'skills': 3, 'specialization': 2, 'domain': 2, 'department': 1, 'branch': 1, 'bio': 1}
+
+KEEP_VERSIONS = 2
+
+
+def tokenize(text):
+    """Words plus adjacent word pairs, so 'machine learning' also matches as a phrase."""
+    words = [word.strip('.') for word in WORD.findall((text or '').lower())]
+    words = [word for word in words if word and word not in STOPWORDS]
+    return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+
+def term_counts(fields, weights):
+    counts = collections.Counter()
+    for field, texts in fields.items():
+        for text in texts:
+            for term in tokenize(text):
+                counts[term] += weights[field]
+    return counts
+
+
+def json_texts(value):
+    """Strings from a JSON list column; plain text counts as one string, anything else as none."""
+    try:
+        items = json.loads(value) if value else []
+    except ValueError:
+        items = value  # e.g. tech_skills saved as 'Python, SQL'
+    if isinstance(items, str):
+        items = [items]
+    if not isinstance(items, list):
+        return []
+    return [str(item) for item in items if item is not None]
+
+
+def project_documents(cursor):
+    """{project_id: term counts} for every active project."""
+    cursor.execute('''
+        SELECT pp.project_id, pp.required_skills
+        FROM project_positions pp
+        JOIN projects p ON p.id = pp.project_id
+        WHERE p.status = 'active'
+    ''')
+    position_skills = collections.defaultdict(list)
+    for project_id, required_skills in cursor.fetchall():
+        position_skills[project_id].extend(json_texts(required_skills))
+
+    cursor.execute('''
+        SELECT id, title, description, tags, skills_required
+        FROM projects WHERE status = 'active'
+    ''')
+    return {
+        project_id: term_counts({
+            'skills': json_texts(skills_required) + position_skills[project_id],
+            'tags': json_texts(tags),
+            'title': [title],
+            'description': [description],
+        }, PROJECT_FIELD_WEIGHTS)
+        for project_id, title, description, tags, skills_required in cursor.fetchall()
+    }
+
+
+def student_terms(cursor, user_id):
+    """Term counts for a student's skills and profile fields."""
+    cursor.execute('''
+        SELECT skill_name FROM user_skills WHERE user_id = ?
+    ''', (user_id,))
+    skills = [row[0] for row in cursor.fetchall()]
+    cursor.execute('''
+        SELECT tech_skills, specialization, domain, department, branch, bio FROM users WHERE id = ?
+    ''', (user_id,))
+    row = cursor.fetchone() or (None,) * 6
+    skills += json_texts(row[0])
+    return term_counts({
+        'skills': skills,
+        'specialization': [row[1]],
+        'domain': [row[2]],
+        'department': [row[3]],
+        'branch': [row[4]],
+        'bio': [row[5]],
+    }, STUDENT_FIELD_WEIGHTS)
+
+
+# ----------------- Offline build -----------------
+
+def build_index(conn, index_dir):
+    """Vectorize active projects into a new version under index_dir; returns its path."""
+    documents = project_documents(conn.cursor())
+    project_ids = sorted(documents)
+
+    document_frequency = collections.Counter()
+    for counts in documents.values():
+        document_frequency.update(counts.keys())
+    vocab = {term: col for col, term in enumerate(sorted(document_frequency))}
+    total = len(project_ids)
+    idf = np.array([math.log((1 + total) / (1 + document_frequency[term])) + 1 for term in sorted(vocab, key=vocab.get)],
+                   dtype=np.float32)
+
+    term_rows, project_cols, weights = [], [], []
+    for position, project_id in enumerate(project_ids):
+        counts = documents[project_id]
+        row = {vocab[term]: (1 + math.log(count)) * idf[vocab[term]] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in row.values())) or 1.0
+        for col, weight in row.items():
+            term_rows.append(col)
+            project_cols.append(position)
+            weights.append(weight / norm)
+
+    postings = sp.csr_matrix((np.array(weights, dtype=np.float32), (term_rows, project_cols)),
+                             shape=(len(vocab), total), dtype=np.float32)
+
+    # Sortable and unique even for two builds in the same second
+    now = time.time_ns()
+    version = time.strftime('%Y%m%d%H%M%S', time.localtime(now // 10 ** 9)) + f'.{now % 10 ** 9:09d}-{os.getpid()}'
+    path = os.path.join(index_dir, version)
+    os.makedirs(path)
+    np.save(os.path.join(path, 'postings_data.npy'), postings.data.astype(np.float32))
+    # One dtype for both, and the one scipy would pick itself; otherwise csr_matrix
+    # converts an array on load and the memory mapping is lost
+    fits_int32 = max(postings.nnz, len(vocab), total) <= np.iinfo(np.int32).max
+    index_dtype = np.int32 if fits_int32 else np.int64
+    np.save(os.path.join(path, 'postings_indices.npy'), postings.indices.astype(index_dtype))
+    np.save(os.path.join(path, 'postings_indptr.npy'), postings.indptr.astype(index_dtype))
+    np.save(os.path.join(path, 'idf.npy'), idf)
+    np.save(os.path.join(path, 'project_ids.npy'), np.array(project_ids, dtype=np.int64))
+    with open(os.path.join(path, 'vocab.json'), 'w') as f:
+        json.dump(vocab, f)
+
+    # Switch readers over atomically, then drop versions nobody should still be loading
+    pointer = os.path.join(index_dir, 'CURRENT')
+    with open(pointer + f'.{os.getpid()}.tmp', 'w') as f:
+        f.write(version)
+    os.replace(pointer + f'.{os.getpid()}.tmp', pointer)
+    # A concurrent build may already have moved CURRENT on; never delete what it points at
+    with open(pointer) as f:
+        in_use = {version, f.read().strip()}
+    versions = sorted(name for name in os.listdir(index_dir) if os.path.isdir(os.path.join(index_dir, name)))
+    for old in versions[:-KEEP_VERSIONS]:
+        if old in in_use:
+            continue
+        old_path = os.path.join(index_dir, old)
+        for name in os.listdir(old_path):
+            os.remove(os.path.join(old_path, name))
+        os.rmdir(old_path)
+    return path
+
+
+# ----------------- Serving -----------------
+
+class TfidfIndex:
+    def __init__(self, path):
+        def load(name):
+            return np.load(os.path.join(path, name), mmap_mode='r')
+
+        self.idf = load('idf.npy')
+        self.project_ids = load('project_ids.npy')
+        self.postings = sp.csr_matrix(
+            (load('postings_data.npy'), load('postings_indices.npy'), load('postings_indptr.npy')),
+            shape=(len(self.idf), len(self.project_ids)), copy=False,
+        )
+        with open(os.path.join(path, 'vocab.json')) as f:
+            self.vocab = json.load(f)
+        self.position = {int(project_id): i for i, project_id in enumerate(self.project_ids)}
+
+    def top_k(self, counts, k=None, exclude=()):
+        """[(project_id, cosine similarity)] best first, for the given term counts."""
+        cols, weights = [], []
+        for term, count in counts.items():
+            col = self.vocab.get(term)
+            if col is not None:
+                cols.append(col)
+                weights.append((1 + math.log(count)) * self.idf[col])
+        if not cols:
+            return []
+        query = np.array(weights, dtype=np.float32)
+        query /= np.linalg.norm(query)
+
+        scores = np.asarray(self.postings[cols].T @ query).ravel()
+        for project_id in exclude:
+            position = self.position.get(project_id)
+            if position is not None:
+                scores[position] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if k is not None and len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(self.project_ids[i]), float(scores[i])) for i in candidates]
+
+
+_index = None
+_index_path = None
+_index_lock = threading.Lock()
+_rebuilder_pid = None
+
+
+def get_index(index_dir):
+    """The current on-disk index, loaded once per version; None if unavailable."""
+    global _index, _index_path
+    if np is None:
+        return None
+    try:
+        with open(os.path.join(index_dir, 'CURRENT')) as f:
+            path = os.path.join(index_dir, f.read().strip())
+    except FileNotFoundError:
+        return None
+    if path != _index_path:
+        with _index_lock:
+            if path != _index_path:
+                _index = TfidfIndex(path)
+                _index_path = path
+    return _index
+
+
+def schedule_rebuilds(db_path, index_dir, interval):
+    """Rebuild the index every `interval` seconds on a daemon thread, once per process.
+
+    Started on first use; 0 disables it. This relies on the single gunicorn
+    worker (gunicorn.conf.py): several workers would each rebuild and prune
+    on the same schedule, and pruning only spares CURRENT and the version
+    just built, so it could delete one a sibling is still loading.
+    """
+    global _rebuilder_pid
+    if np is None or interval <= 0 or _rebuilder_pid == os.getpid():
+        return
+    with _index_lock:
+        if _rebuilder_pid == os.getpid():
+            return
+        _rebuilder_pid = os.getpid()
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                conn = sqlite3.connect(db_path)
+                try:
+                    build_index(conn, index_dir)
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"WARNING: TF-IDF index rebuild failed: {e}")
+
+    threading.Thread(target=run, name='tfidf-rebuild', daemon=True).start()
+
+
+def default_index_dir(db_path):
+    return os.environ.get('TFIDF_INDEX_DIR') or os.path.join(os.path.dirname(db_path) or '.', 'tfidf_index')
+
+
+def main():
+    from db import get_db_path
+
+    parser = argparse.ArgumentParser(description='Build the TF-IDF project index.')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--db', default=get_db_path())
+    parser.add_argument('--out', help='index directory (default: TFIDF_INDEX_DIR or tfidf_index next to the database)')
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit('numpy and scipy are required to build the index (pip install numpy scipy)')
+    conn = sqlite3.connect(args.db)
+    try:
+        started = time.perf_counter()
+        path = build_index(conn, args.out or default_index_dir(args.db))
+    finally:
+        conn.close()
+    index = TfidfIndex(path)
+    print(f"Indexed {len(index.project_ids)} projects, {len(index.vocab)} terms "
+          f"in {time.perf_counter() - started:.2f}s -> {path}")
+
+
+if __name__ == '__main__':
+    main()
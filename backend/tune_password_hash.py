@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Pick password hash parameters for this host.
+
+Times werkzeug's generate_password_hash for increasing costs and reports the
+strongest setting whose median stays under the target latency, for pbkdf2
+(iterations) and/or scrypt (N, with r=8 and p=1). Login verifies one hash, so
+this is roughly the CPU a login costs; with PASSWORD_HASH_WORKERS processes
+the host sustains about workers * 1000 / ms logins per second.
+
+Put the suggestion in the environment, e.g.
+    PASSWORD_HASH_METHOD=scrypt:16384:8:1 gunicorn app:app
+Existing users are re-hashed with it on their next login.
+
+Usage: python tune_password_hash.py [--target-ms 250] [--method pbkdf2|scrypt|both] [--rounds 5]
+"""
+
+import argparse
+import statistics
+import time
+
+from werkzeug.security import generate_password_hash
+
+from hashing import canonical_method
+
+PBKDF2_STEP = 10000
+SCRYPT_LOG2_N = range(12, 18)  # N = 4096 .. 131072; memory is 128 * N * r bytes
+
+
+def median_ms(method, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        generate_password_hash('correct horse battery staple', method)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def tune_pbkdf2(target_ms, rounds):
+    # Cost is linear in iterations: measure once, scale, then confirm
+    probe = 100000
+    per_iteration = median_ms(f'pbkdf2:sha256:{probe}', rounds) / probe
+    iterations = max(int(target_ms / per_iteration) // PBKDF2_STEP * PBKDF2_STEP, PBKDF2_STEP)
+    method = f'pbkdf2:sha256:{iterations}'
+    return method, median_ms(method, rounds)
+
+
+def tune_scrypt(target_ms, rounds):
+    best = None
+    for log2_n in SCRYPT_LOG2_N:
+        method = f'scrypt:{2 ** log2_n}:8:1'
+        ms = median_ms(method, rounds)
+        if ms > target_ms and best is not None:
+            break
+        best = (method, ms)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--target-ms', type=float, default=250)
+    parser.add_argument('--method', choices=['pbkdf2', 'scrypt', 'both'], default='both')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=2, help='PASSWORD_HASH_WORKERS, for the throughput estimate')
+    args = parser.parse_args()
+
+    tuners = {'pbkdf2': tune_pbkdf2, 'scrypt': tune_scrypt}
+    names = list(tuners) if args.method == 'both' else [args.method]
+    print(f"Target {args.target_ms:.0f}ms per hash, median of {args.rounds}")
+    for name in names:
+        method, ms = tuners[name](args.target_ms, args.rounds)
+        print(f"{name:7} PASSWORD_HASH_METHOD={canonical_method(method):24} {ms:7.1f}ms  "
+              f"~{args.workers * 1000 / ms:.0f} logins/s with {args.workers} workers")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Materialized dashboard counters (the user_stats table).
+
+Every endpoint that creates, deletes or changes the status of a project,
+mentorship request or project application calls one of the *_changed()
+helpers below with the old and new status (blog posts just bump
+blog_posts), inside its own transaction, so the counters commit or roll
+back together with the write. The status write is conditional on the old
+status the endpoint read (WHERE ... AND status IS ?), and the helper only
+runs when it matched a row. The dashboard endpoints then read a single row.
+
+Writes that bypass the app (seed_data.py, manual SQL) leave the counters
+stale; `python user_stats.py rebuild` recomputes them from the source tables.
+
+Usage: python user_stats.py rebuild [--user-id ID]
+"""
+
+import argparse
+import sqlite3
+
+COUNTERS = (
+    # alumni
+    'active_projects', 'total_projects', 'mentees', 'blog_posts',
+    'pending_mentorship_requests', 'pending_project_applications',
+    # students
+    'applied_projects', 'accepted_projects', 'pending_applications', 'mentorship_requests',
+)
+
+REBUILD_QUERY = f'''
+    INSERT OR REPLACE INTO user_stats (user_id, {', '.join(COUNTERS)})
+    SELECT u.id,
+           (SELECT COUNT(*) FROM projects p WHERE p.created_by = u.id AND p.status = 'active'),
+           (SELECT COUNT(*) FROM projects p WHERE p.created_by = u.id),
+           (SELECT COUNT(*) FROM mentorship_requests mr
+            WHERE mr.alumni_id = u.id AND mr.status = 'accepted'),
+           (SELECT COUNT(*) FROM blog_posts b WHERE b.author_id = u.id),
+           (SELECT COUNT(*) FROM mentorship_requests mr
+            WHERE mr.alumni_id = u.id AND mr.status = 'pending'),
+           (SELECT COUNT(*) FROM project_applications pa JOIN projects p ON pa.project_id = p.id
+            WHERE p.created_by = u.id AND pa.status = 'pending'),
+           (SELECT COUNT(*) FROM project_applications pa WHERE pa.student_id = u.id),
+           (SELECT COUNT(*) FROM project_applications pa
+            WHERE pa.student_id = u.id AND pa.status = 'accepted'),
+           (SELECT COUNT(*) FROM project_applications pa
+            WHERE pa.student_id = u.id AND pa.status = 'pending'),
+           (SELECT COUNT(*) FROM mentorship_requests mr WHERE mr.student_id = u.id)
+    FROM users u
+'''
+
+
+def bump(cursor, user_id, **deltas):
+    """Add deltas (counter name -> +/-n) to one user's row, creating it if needed."""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if user_id is None or not deltas:
+        return
+    unknown = set(deltas) - set(COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown counters: {', '.join(sorted(unknown))}")
+    names = list(deltas)
+    increments = ', '.join(f'{name} = {name} + excluded.{name}' for name in names)
+    cursor.execute(f'''
+        INSERT INTO user_stats (user_id, {', '.join(names)})
+        VALUES (?, {', '.join('?' for _ in names)})
+        ON CONFLICT(user_id) DO UPDATE SET {increments}
+    ''', [user_id] + [deltas[name] for name in names])
+
+
+def _delta(old, new, value):
+    """+1 when a row enters `value` (None meaning the row is absent), -1 when it leaves."""
+    return (new == value) - (old == value)
+
+
+def _exists(old, new):
+    return (new is not None) - (old is not None)
+
+
+# Each helper takes the status before and after the write; None means the row
+# did not exist before (insert) or no longer exists (delete).
+
+def project_changed(cursor, owner_id, old_status, new_status):
+    bump(cursor, owner_id,
+         total_projects=_exists(old_status, new_status),
+         active_projects=_delta(old_status, new_status, 'active'))
+
+
+def mentorship_changed(cursor, student_id, alumni_id, old_status, new_status):
+    bump(cursor, student_id, mentorship_requests=_exists(old_status, new_status))
+    bump(cursor, alumni_id,
+         mentees=_delta(old_status, new_status, 'accepted'),
+         pending_mentorship_requests=_delta(old_status, new_status, 'pending'))
+
+
+def application_changed(cursor, student_id, owner_id, old_status, new_status):
+    bump(cursor, student_id,
+         applied_projects=_exists(old_status, new_status),
+         accepted_projects=_delta(old_status, new_status, 'accepted'),
+         pending_applications=_delta(old_status, new_status, 'pending'))
+    bump(cursor, owner_id, pending_project_applications=_delta(old_status, new_status, 'pending'))
+
+
+def rebuild(cursor, user_id=None):
+    """Recompute counters from the source tables, for everyone or one user."""
+    if user_id is None:
+        cursor.execute('DELETE FROM user_stats')
+        cursor.execute(REBUILD_QUERY)
+    else:
+        cursor.execute(REBUILD_QUERY + ' WHERE u.id = ?', (user_id,))
+    return cursor.rowcount
+
+
+def main():
+    from db import get_db_path
+
+    parser = argparse.ArgumentParser(description='Recompute the user_stats dashboard counters.')
+    parser.add_argument('command', choices=['rebuild'])
+    parser.add_argument('--db', default=get_db_path())
+    parser.add_argument('--user-id', type=int)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        rows = rebuild(conn.cursor(), args.user_id)
+        conn.commit()
+    finally:
+        conn.close()
+    print(f"Rebuilt stats for {rows} user(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -50,6 +50,11 @@ interface Message {
   is_read: boolean
 }
 
+// How long the server may hold a long-poll request before answering 204
+const LONG_POLL_SECONDS = 25
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
 export const MessagesPage: React.FC = () => {
   const { token, user, isLoading } = useAuth()
   const { id } = useParams<{ id: string }>()
@@ -66,39 +71,98 @@ export const MessagesPage: React.FC = () => {
   const [sending, setSending] = useState(false)
   const [messagesLoading, setMessagesLoading] = useState(false)
   const messagesEndRef = React.useRef<HTMLDivElement>(null)
-  const pollingIntervalRef = React.useRef<NodeJS.Timeout | null>(null)
-  const conversationsPollingRef = React.useRef<NodeJS.Timeout | null>(null)
+  const lastMessageIdRef = React.useRef(0)
+  const lastEventIdRef = React.useRef<string | null>(null)
+  const selectedConversationRef = React.useRef<Conversation | null>(null)
+  const [streamConnected, setStreamConnected] = useState(false)
   const [profileModalUserId, setProfileModalUserId] = useState<number | null>(null)
   const [isProfileModalOpen, setIsProfileModalOpen] = useState(false)
 
   useEffect(() => {
     if (token) {
       fetchData()
-      
-      // Poll conversations list every 2 seconds
-      conversationsPollingRef.current = setInterval(() => {
-        fetchConversations()
-      }, 2000)
     }
+  }, [token])
 
-    return () => {
-      if (conversationsPollingRef.current) {
-        clearInterval(conversationsPollingRef.current)
+  // Long-poll the conversations list, but only while the live stream is down
+  useEffect(() => {
+    if (!token || streamConnected) return
+
+    const controller = new AbortController()
+    const poll = async () => {
+      while (!controller.signal.aborted) {
+        if (!(await fetchConversations(LONG_POLL_SECONDS, controller.signal))) {
+          await sleep(2000)
+        }
       }
     }
+    poll()
+
+    return () => controller.abort()
+  }, [token, streamConnected])
+
+  // Live updates over Server-Sent Events; EventSource reconnects by itself
+  // and resumes from the last event id it saw
+  useEffect(() => {
+    if (!token || typeof EventSource === 'undefined') return
+
+    const source = new EventSource(`https://alumconnect-s4c7.onrender.com/api/messages/stream?jwt=${encodeURIComponent(token)}`)
+    source.onopen = () => setStreamConnected(true)
+    source.onerror = () => setStreamConnected(false)
+
+    source.addEventListener('message', (event) => {
+      const message = JSON.parse((event as MessageEvent).data)
+      if (selectedConversationRef.current?.id === message.conversation_id) {
+        // Fetch everything after the newest message we have, so nothing missed is skipped;
+        // the read-watermark effect then posts /read once it is on screen
+        fetchNewMessages(message.conversation_id)
+      }
+      fetchConversations()
+    })
+    source.addEventListener('read', (event) => {
+      const receipt = JSON.parse((event as MessageEvent).data)
+      if (selectedConversationRef.current?.id === receipt.conversation_id) {
+        setMessages(prev => prev.map(m =>
+          m.receiver_id === receipt.reader_id && m.id <= receipt.up_to_id ? { ...m, is_read: true } : m
+        ))
+      }
+    })
+    source.addEventListener('conversation', () => fetchConversations())
+    // We fell too far behind for the server to replay; catch up from scratch
+    source.addEventListener('resync', () => {
+      fetchConversations()
+      if (selectedConversationRef.current) {
+        fetchNewMessages(selectedConversationRef.current.id)
+      }
+    })
+
+    return () => {
+      source.close()
+      setStreamConnected(false)
+    }
   }, [token])
 
-  const fetchConversations = async () => {
+  // With wait > 0 the server holds the request until the inbox changes (204 if it doesn't)
+  const fetchConversations = async (wait = 0, signal?: AbortSignal) => {
     try {
-      const response = await fetch('https://alumconnect-s4c7.onrender.com/api/messages/conversations', {
+      const params = wait > 0 && lastEventIdRef.current !== null
+        ? `?wait=${wait}&after_event_id=${lastEventIdRef.current}`
+        : ''
+      const response = await fetch(`https://alumconnect-s4c7.onrender.com/api/messages/conversations${params}`, {
         headers: { Authorization: `Bearer ${token}` },
+        signal,
       })
-      if (response.ok) {
+      if (response.status === 200) {
+        lastEventIdRef.current = response.headers.get('X-Last-Event-Id')
         const conversationsData = await response.json()
         setConversations(conversationsData)
       }
+      return response.ok
     } catch (error) {
-      console.error('Error fetching conversations:', error)
+      if (!signal?.aborted) {
+        console.error('Error fetching conversations:', error)
+      }
+      return false
     }
   }
 
@@ -112,36 +176,72 @@ export const MessagesPage: React.FC = () => {
     }
   }, [id, conversations])
 
-  // Poll for new messages when a conversation is selected
+  // Newest message we have, so polls only ask for what came after it
+  useEffect(() => {
+    lastMessageIdRef.current = messages.length > 0 ? messages[messages.length - 1].id : 0
+  }, [messages])
+
+  useEffect(() => {
+    selectedConversationRef.current = selectedConversation
+  }, [selectedConversation])
+
+  // Move our read watermark up to the newest message we've been shown
   useEffect(() => {
-    if (selectedConversation) {
-      // Clear any existing interval
-      if (pollingIntervalRef.current) {
-        clearInterval(pollingIntervalRef.current)
+    if (!selectedConversation || !user) return
+    const unread = messages.filter(m => m.receiver_id === user.id && !m.is_read)
+    if (unread.length === 0) return
+
+    const upToId = unread[unread.length - 1].id
+    setMessages(prev => prev.map(m => m.receiver_id === user.id && m.id <= upToId ? { ...m, is_read: true } : m))
+    fetch(`https://alumconnect-s4c7.onrender.com/api/messages/conversations/${selectedConversation.id}/read`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${token}`,
+      },
+      body: JSON.stringify({ up_to_id: upToId })
+    })
+      .then(() => fetchConversations())
+      .catch(error => console.error('Error marking messages read:', error))
+  }, [messages, selectedConversation, user, token])
+
+  const fetchNewMessages = async (conversationId: number, wait = 0, signal?: AbortSignal) => {
+    try {
+      const response = await fetch(`https://alumconnect-s4c7.onrender.com/api/messages/conversations/${conversationId}/messages?since_id=${lastMessageIdRef.current}&wait=${wait}`, {
+        headers: { Authorization: `Bearer ${token}` },
+        signal,
+      })
+      // 204 means nothing new since the last fetch
+      if (response.status === 200) {
+        const newMessages: Message[] = await response.json()
+        setMessages(prev => [...prev, ...newMessages.filter(m => !prev.some(p => p.id === m.id))])
+      }
+      return response.ok
+    } catch (error) {
+      if (!signal?.aborted) {
+        console.error('Error polling messages:', error)
       }
+      return false
+    }
+  }
+
+  // Long-poll for new messages when a conversation is selected and the live stream is down
+  useEffect(() => {
+    if (!selectedConversation || streamConnected) return
 
-      pollingIntervalRef.current = setInterval(async () => {
-        try {
-          const response = await fetch(`https://alumconnect-s4c7.onrender.com/api/messages/conversations/${selectedConversation.id}/messages`, {
-            headers: { Authorization: `Bearer ${token}` },
-          })
-          if (response.ok) {
-            const messagesData = await response.json()
-            setMessages(messagesData)
-          }
-        } catch (error) {
-          console.error('Error polling messages:', error)
+    const controller = new AbortController()
+    const poll = async () => {
+      while (!controller.signal.aborted) {
+        if (!(await fetchNewMessages(selectedConversation.id, LONG_POLL_SECONDS, controller.signal))) {
+          await sleep(2000)
         }
-      }, 2000)
+      }
     }
+    poll()
 
     // Cleanup on unmount or when conversation changes
-    return () => {
-      if (pollingIntervalRef.current) {
-        clearInterval(pollingIntervalRef.current)
-      }
-    }
-  }, [selectedConversation, token])
+    return () => controller.abort()
+  }, [selectedConversation, token, streamConnected])
 
   const fetchData = async () => {
     try {
@@ -226,6 +326,7 @@ export const MessagesPage: React.FC = () => {
 
   const selectConversation = async (conversation: Conversation) => {
     setSelectedConversation(conversation)
+    setMessages([])
     setMessagesLoading(true)
     try {
       const response = await fetch(`https://alumconnect-s4c7.onrender.com/api/messages/conversations/${conversation.id}/messages`, {